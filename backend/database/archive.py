@@ -0,0 +1,122 @@
+# backend/database/archive.py
+
+import os
+import json
+import time
+import struct
+import numpy as np
+from backend.models.steering_path import SteeringPath
+from backend.services.mirror import atomic_write
+
+# Layout: header | float64 segment blocks | JSON offset table
+#   header = MAGIC (8 bytes) + table offset (uint64) + table length (uint64)
+#   each path is a (4, N) little-endian float64 block: lengths, yaw, pitch, roll
+MAGIC = b"PVARCH01"
+HEADER = struct.Struct("<8sQQ")
+ARCHIVE_EXTENSION = ".pva"
+# Paths deleted after the archive was written: {filename: deletion time} next to it
+TOMBSTONE_SUFFIX = ".deleted"
+
+
+def read_tombstones(archive_path):
+    try:
+        with open(archive_path + TOMBSTONE_SUFFIX, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_archive(archive_path, items):
+    """
+    Write (filename, SteeringPath or JSON dict) pairs into one archive file.
+    Returns the number of paths written.
+    """
+    table = {}
+    tmp_path = f"{archive_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, 0, 0))
+        for filename, data in items:
+            path = data if isinstance(data, SteeringPath) else SteeringPath.from_dict(data)
+            offset = f.tell()
+            f.write(path.data.astype("<f8", copy=False).tobytes())
+            table[filename] = [path.vehicle_id, offset, len(path)]
+
+        table_offset = f.tell()
+        table_bytes = json.dumps(table).encode("utf-8")
+        f.write(table_bytes)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, table_offset, len(table_bytes)))
+    os.replace(tmp_path, archive_path)
+    return len(table)
+
+
+class PathArchive:
+    """
+    Read-only view of an archive. Segment blocks are served as zero-copy
+    slices of a single memory map; nothing is parsed until a path is opened.
+    Paths deleted after the archive was written are hidden via its tombstone file.
+    """
+
+    def __init__(self, archive_path):
+        self.archive_path = archive_path
+        with open(archive_path, "rb") as f:
+            magic, table_offset, table_length = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{archive_path} is not a PathVision archive")
+            f.seek(table_offset)
+            self.table = json.loads(f.read(table_length).decode("utf-8"))
+        self.mtime = os.path.getmtime(archive_path)
+        self._mmap = np.memmap(archive_path, dtype=np.uint8, mode="r") if self.table else None
+        self._by_vehicle = {}
+        for filename, (vehicle, _, _) in self.table.items():
+            self._by_vehicle.setdefault(vehicle, filename)
+        self.deleted = set()
+        self._tombstone_stamp = None
+        self.refresh_deleted()
+
+    def refresh_deleted(self):
+        """Re-read the tombstone file if it changed; deletions older than the archive do not count."""
+        try:
+            stamp = os.stat(self.archive_path + TOMBSTONE_SUFFIX).st_mtime_ns
+        except OSError:
+            stamp = None
+        if stamp == self._tombstone_stamp:
+            return
+        self._tombstone_stamp = stamp
+        self.deleted = {filename for filename, when in read_tombstones(self.archive_path).items()
+                        if when >= self.mtime and filename in self.table}
+
+    def mark_deleted(self, filename, when=None):
+        """Record that filename was deleted so it is no longer served from the archive."""
+        if filename not in self.table:
+            return
+        tombstones = {f: t for f, t in read_tombstones(self.archive_path).items() if t >= self.mtime}
+        tombstones[filename] = time.time() if when is None else when
+        atomic_write(self.archive_path + TOMBSTONE_SUFFIX, json.dumps(tombstones).encode())
+        self._tombstone_stamp = None
+        self.refresh_deleted()
+
+    def __contains__(self, filename):
+        return filename in self.table and filename not in self.deleted
+
+    def __len__(self):
+        return len(self.table) - len(self.deleted)
+
+    def list_vehicle_paths(self):
+        return [(filename, entry[0]) for filename, entry in self.table.items() if filename not in self.deleted]
+
+    def filename_for_vehicle(self, vehicle_id):
+        return self._by_vehicle.get(vehicle_id)
+
+    def segment_block(self, filename):
+        """Return the (4, N) float64 block of a path as a read-only view into the map."""
+        _, offset, count = self.table[filename]
+        nbytes = 4 * count * 8
+        return self._mmap[offset:offset + nbytes].view("<f8").reshape(4, count)
+
+    def load_steering_path(self, filename):
+        vehicle, _, _ = self.table[filename]
+        return SteeringPath.from_array(vehicle, self.segment_block(filename))
+
+    def load_path_data(self, filename):
+        return self.load_steering_path(filename).to_dict()
@@ -0,0 +1,162 @@
+# backend/database/db.py
+
+import os
+import sys
+import json
+import glob
+import sqlite3
+import threading
+import numpy as np
+from backend.models.steering_path import SteeringPath
+
+DB_FILENAME = "pathvision.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS paths (
+    filename      TEXT PRIMARY KEY,
+    vehicle       TEXT NOT NULL,
+    brand         TEXT,
+    model         TEXT,
+    gen           TEXT,
+    attempt       INTEGER,
+    revision      INTEGER,
+    job           TEXT,
+    segment_count INTEGER NOT NULL,
+    segments      BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_paths_vehicle ON paths (brand, model, gen, attempt, revision);
+CREATE INDEX IF NOT EXISTS idx_paths_model ON paths (model);
+CREATE INDEX IF NOT EXISTS idx_paths_gen ON paths (gen);
+CREATE INDEX IF NOT EXISTS idx_paths_attempt ON paths (attempt);
+CREATE INDEX IF NOT EXISTS idx_paths_revision ON paths (revision);
+CREATE INDEX IF NOT EXISTS idx_paths_job ON paths (job);
+"""
+
+FILTER_COLUMNS = ("brand", "model", "gen", "attempt", "revision", "job")
+
+
+def pack_segments(path):
+    """Pack the (4, N) segment block of a SteeringPath into a little-endian float64 blob."""
+    return path.data.astype("<f8", copy=False).tobytes()
+
+
+def unpack_segments(blob, count):
+    return np.frombuffer(blob, dtype="<f8").reshape(4, count)
+
+
+class PathDatabase:
+    """
+    SQLite store for steering paths, keyed by the same filenames the JSON
+    directory uses so it can sit behind the file_handler API.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # Shared with GUI worker threads; every statement runs under self.lock.
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.lock = threading.RLock()
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _row(self, filename, data):
+        path = data if isinstance(data, SteeringPath) else SteeringPath.from_dict(data)
+        return (filename, path.vehicle_id, path.brand, path.model, path.gen, path.attempt,
+                path.revision, path.job, len(path), pack_segments(path))
+
+    def save_path_data(self, filename, data):
+        self.save_many([(filename, data)])
+
+    def save_many(self, items):
+        """Insert or replace many (filename, data) pairs in a single transaction."""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO paths VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._row(filename, data) for filename, data in items),
+            )
+
+    def delete_path(self, filename):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM paths WHERE filename = ?", (filename,))
+
+    def list_vehicle_paths(self, **filters):
+        """
+        Return [(filename, vehicle), ...], optionally filtered on the indexed
+        brand/model/gen/attempt/revision/job columns. attempt and revision also
+        take inclusive (lo, hi) ranges as parse_range returns them; job is
+        matched without regard to case, like the search index does.
+        """
+        clauses, params = [], []
+        for column in FILTER_COLUMNS:
+            value = filters.get(column)
+            if value is None:
+                continue
+            if isinstance(value, tuple):
+                lo, hi = value
+                if lo is not None:
+                    clauses.append(f"{column} >= ?")
+                    params.append(lo)
+                if hi is not None:
+                    clauses.append(f"{column} <= ?")
+                    params.append(hi)
+            elif column == "job":
+                clauses.append("job = ? COLLATE NOCASE")
+                params.append(value)
+            else:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        query = "SELECT filename, vehicle FROM paths"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        with self.lock:
+            return self.conn.execute(query, params).fetchall()
+
+    def catalog_entries(self):
+        """
+        {filename: [rowid, segment_count, vehicle]} in the layout of the catalog index.
+        INSERT OR REPLACE gives a saved path a new rowid, which stands in for the mtime.
+        """
+        with self.lock:
+            rows = self.conn.execute("SELECT filename, rowid, segment_count, vehicle FROM paths").fetchall()
+        return {filename: [rowid, count, vehicle] for filename, rowid, count, vehicle in rows}
+
+    def load_steering_path(self, filename):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT vehicle, segment_count, segments FROM paths WHERE filename = ?", (filename,)
+            ).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"No stored path named {filename}")
+        vehicle, count, blob = row
+        return SteeringPath.from_array(vehicle, unpack_segments(blob, count))
+
+    def load_path_data(self, filename):
+        return self.load_steering_path(filename).to_dict()
+
+    def import_json_dir(self, input_dir):
+        """Import every *.json path file in input_dir in one transaction. Returns the count."""
+        items = []
+        for filepath in glob.glob(os.path.join(input_dir, "*.json")):
+            try:
+                with open(filepath, "r") as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"[WARN] Skipping {filepath}: {e}")
+                continue
+            if "vehicle" in data:
+                items.append((os.path.basename(filepath), data))
+        self.save_many(items)
+        return len(items)
+
+
+if __name__ == "__main__":
+    # One-shot importer: python -m backend.database.db <input_dir> [db_path]
+    if len(sys.argv) < 2:
+        print("Usage: python -m backend.database.db <input_dir> [db_path]")
+        sys.exit(1)
+    source_dir = sys.argv[1]
+    target = sys.argv[2] if len(sys.argv) > 2 else os.path.join(source_dir, DB_FILENAME)
+    db = PathDatabase(target)
+    print(f"Imported {db.import_json_dir(source_dir)} paths into {target}")
+    db.close()
@@ -0,0 +1,141 @@
+# backend/models/steering_path.py
+import re
+import numpy as np
+from backend.services.kinematics import forward_kinematics, current_mode
+
+VEHICLE_ID_PATTERN = re.compile(r"^(?P<base>.+?)_attempt(?P<attempt>\d+)_rev(?P<revision>\d+)_job(?P<job>\w+?)$")
+BASE_PATTERN = re.compile(r"^(?P<brand>[A-Za-z]+)(?P<model>.*?)(?P<gen>Gen\d+)?$", re.IGNORECASE)
+
+
+def parse_vehicle_id(vehicle_id):
+    """
+    Split a vehicle ID such as 'GMC2500Gen4_attempt1_rev0_job12345633' into its fields.
+    The base is split on '|' when present, otherwise into brand letters, model and 'GenN'.
+    Missing parts are returned as None.
+    """
+    fields = {'base': vehicle_id, 'brand': None, 'model': None, 'gen': None,
+              'attempt': None, 'revision': None, 'job': None}
+    match = VEHICLE_ID_PATTERN.match(vehicle_id or "")
+    if match:
+        fields['base'] = match.group('base')
+        fields['attempt'] = int(match.group('attempt'))
+        fields['revision'] = int(match.group('revision'))
+        fields['job'] = match.group('job')
+
+    base = fields['base'] or ""
+    if "|" in base:
+        parts = (base.split("|") + [None, None])[:3]
+        fields['brand'], fields['model'], fields['gen'] = [p or None for p in parts]
+    else:
+        base_match = BASE_PATTERN.match(base)
+        if base_match:
+            fields['brand'] = base_match.group('brand')
+            fields['model'] = base_match.group('model') or None
+            fields['gen'] = base_match.group('gen')
+    return fields
+
+
+class SteeringPath:
+    """
+    Steering path stored as one contiguous (4, N) float64 block:
+    rows are shaft lengths, yaw, pitch and roll (degrees).
+    """
+    __slots__ = ('vehicle_id', 'base', 'brand', 'model', 'gen', 'attempt', 'revision', 'job',
+                 '_data', '_points', '_points_mode')
+
+    def __init__(self, vehicle_id, lengths, yaw, pitch, roll=None):
+        self.vehicle_id = vehicle_id
+        fields = parse_vehicle_id(vehicle_id)
+        self.base = fields['base']
+        self.brand = fields['brand']
+        self.model = fields['model']
+        self.gen = fields['gen']
+        self.attempt = fields['attempt']
+        self.revision = fields['revision']
+        self.job = fields['job']
+
+        n = len(lengths)
+        self._data = np.empty((4, n), dtype=np.float64)
+        self._data[0] = lengths
+        self._data[1] = yaw
+        self._data[2] = pitch
+        self._data[3] = 0.0 if roll is None else roll
+        self._points = None
+        self._points_mode = None
+
+    @classmethod
+    def from_array(cls, vehicle_id, data):
+        """
+        Wrap an existing (4, N) float64 block without copying it.
+        """
+        path = cls(vehicle_id, (), (), ())
+        path._data = np.asarray(data, dtype=np.float64)
+        return path
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a SteeringPath from the JSON schema {"vehicle": ..., "segments": [...]}.
+        """
+        segments = data.get("segments", [])
+        n = len(segments)
+        lengths = np.fromiter((seg['shaft_length'] for seg in segments), dtype=np.float64, count=n)
+        euler = np.array([seg['euler'] for seg in segments], dtype=np.float64).reshape(n, 3)
+        return cls(data.get("vehicle", ""), lengths, euler[:, 0], euler[:, 1], euler[:, 2])
+
+    def to_dict(self):
+        """
+        Convert back to the JSON schema used in the input directory.
+        """
+        segments = [
+            {"shaft_length": length, "euler": [yaw, pitch, roll]}
+            for length, yaw, pitch, roll in self._data.T.tolist()
+        ]
+        return {"vehicle": self.vehicle_id, "segments": segments}
+
+    def to_segments(self):
+        return self.to_dict()["segments"]
+
+    @property
+    def data(self):
+        return self._data
+
+    @property
+    def lengths(self):
+        return self._data[0]
+
+    @property
+    def yaw(self):
+        return self._data[1]
+
+    @property
+    def pitch(self):
+        return self._data[2]
+
+    @property
+    def roll(self):
+        return self._data[3]
+
+    @property
+    def euler(self):
+        """(N, 3) array of yaw, pitch, roll per segment."""
+        return self._data[1:].T.copy()
+
+    @property
+    def points(self):
+        """Cached (N+1)x3 point array in the configured kinematics mode."""
+        mode = current_mode()
+        if self._points is None or self._points_mode != mode:
+            self._points = forward_kinematics(self.lengths, self.yaw, self.pitch, self.roll, mode)
+            self._points_mode = mode
+        return self._points
+
+    def invalidate(self):
+        """Drop cached points after the segment arrays were modified in place."""
+        self._points = None
+
+    def __len__(self):
+        return self._data.shape[1]
+
+    def __repr__(self):
+        return f"SteeringPath({self.vehicle_id!r}, segments={len(self)})"
@@ -1,4 +1,69 @@
 # backend/services/angle_diff.py
+import numpy as np
+
+ANGLE_DIFF_DTYPE = np.dtype([
+    ('pair', np.int32),
+    ('segment', np.int32),
+    ('yaw_diff', np.float64),
+    ('pitch_diff', np.float64),
+    ('roll_diff', np.float64),
+])
+
+
+def euler_array(segments):
+    """(N, 3) float64 array of yaw, pitch, roll from segment dicts (or an existing array)."""
+    if isinstance(segments, np.ndarray):
+        return segments
+    return np.array([seg['euler'] for seg in segments], dtype=np.float64).reshape(len(segments), 3)
+
+
+def cumulative_angle_differences(euler1, euler2):
+    """
+    Array form of compute_cumulative_angle_differences for (N, 3) Euler arrays.
+
+    The sequential recurrence subtracts the running sum of previous differences
+    from each raw difference d_i = euler2_i - euler1_i. That running sum always
+    equals d_{i-1}, so the result is simply the first difference of d.
+    Returns an (min(N1, N2), 3) array of yaw, pitch, roll differences.
+    """
+    length = min(len(euler1), len(euler2))
+    raw = np.asarray(euler2[:length], dtype=np.float64) - np.asarray(euler1[:length], dtype=np.float64)
+    return np.diff(raw, axis=0, prepend=np.zeros((1, 3)))
+
+
+def batch_angle_differences(pairs):
+    """
+    Compute cumulative angle differences for many (reference, candidate) pairs.
+    Each side may be a list of segment dicts or an (N, 3) Euler array.
+    Returns one structured array (ANGLE_DIFF_DTYPE) with a row per compared segment.
+    """
+    eulers = [(euler_array(a), euler_array(b)) for a, b in pairs]
+    lengths = np.array([min(len(a), len(b)) for a, b in eulers], dtype=np.intp)
+    result = np.empty(int(lengths.sum()), dtype=ANGLE_DIFF_DTYPE)
+    if not len(result):
+        return result
+
+    raw = np.concatenate([b[:n] - a[:n] for (a, b), n in zip(eulers, lengths)])
+    diffs = np.diff(raw, axis=0, prepend=np.zeros((1, 3)))
+    # Each pair restarts the recurrence: its first difference is the raw difference.
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[lengths > 0]
+    diffs[starts] = raw[starts]
+
+    result['pair'] = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+    result['segment'] = np.arange(len(result)) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    result['yaw_diff'] = diffs[:, 0]
+    result['pitch_diff'] = diffs[:, 1]
+    result['roll_diff'] = diffs[:, 2]
+    return result
+
+
+def to_dicts(diffs):
+    """Convert an (N, 3) difference array into the per-segment dicts the GUI displays."""
+    return [
+        {'yaw_diff': yaw, 'pitch_diff': pitch, 'roll_diff': roll}
+        for yaw, pitch, roll in np.asarray(diffs).tolist()
+    ]
+
 
 def compute_cumulative_angle_differences(segments1, segments2):
     """
@@ -6,35 +71,4 @@ def compute_cumulative_angle_differences(segments1, segments2):
     Each difference is corrected by the sum of previous differences.
     Returns list of dicts: [{'yaw_diff': val, 'pitch_diff': val, 'roll_diff': val}, ...]
     """
-    length = min(len(segments1), len(segments2))
-    diffs = []
-    correction = [0.0, 0.0, 0.0]  # yaw, pitch, roll
-
-    for i in range(length):
-        seg1 = segments1[i]['euler']
-        seg2 = segments2[i]['euler']
-
-        # Apply correction to second path segment angles
-        corrected_seg2 = [
-            seg2[0] - correction[0],
-            seg2[1] - correction[1],
-            seg2[2] - correction[2],
-        ]
-
-        # Calculate signed difference
-        yaw_diff = corrected_seg2[0] - seg1[0]
-        pitch_diff = corrected_seg2[1] - seg1[1]
-        roll_diff = corrected_seg2[2] - seg1[2]
-
-        diffs.append({
-            'yaw_diff': yaw_diff,
-            'pitch_diff': pitch_diff,
-            'roll_diff': roll_diff,
-        })
-
-        # Update correction vector cumulatively
-        correction[0] += yaw_diff
-        correction[1] += pitch_diff
-        correction[2] += roll_diff
-
-    return diffs
+    return to_dicts(cumulative_angle_differences(euler_array(segments1), euler_array(segments2)))
@@ -0,0 +1,125 @@
+# backend/services/catalog.py
+
+import os
+import json
+from backend.services.stream_parser import read_vehicle
+from backend.services.mirror import atomic_write
+
+INDEX_FILENAME = ".pathvision_catalog"
+INDEX_VERSION = 1
+
+
+def get_index_path(input_dir):
+    return os.path.join(input_dir, INDEX_FILENAME)
+
+
+def load_index(input_dir):
+    """
+    Read the on-disk catalog index: {filename: [mtime_ns, size, vehicle]}.
+    A missing or unreadable index is treated as empty.
+    """
+    try:
+        with open(get_index_path(input_dir), "r") as f:
+            index = json.load(f)
+        if index.get("version") == INDEX_VERSION:
+            return index.get("entries", {})
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+
+def save_index(input_dir, entries):
+    """Write the index atomically; failures (e.g. read-only share) are ignored."""
+    data = json.dumps({"version": INDEX_VERSION, "entries": entries}).encode()
+    try:
+        atomic_write(get_index_path(input_dir), data)
+    except OSError as e:
+        print(f"[WARN] Could not write catalog index: {e}")
+
+
+def read_vehicle_id(filepath):
+    return read_vehicle(filepath)
+
+
+def scan_catalog(input_dir):
+    """
+    Bring the catalog index up to date with one scandir pass.
+    Only new or changed files (by mtime/size) are parsed; deleted files are dropped.
+    Returns the current entries dict.
+    """
+    old_entries = load_index(input_dir)
+    entries = {}
+    changed = False
+
+    with os.scandir(input_dir) as it:
+        for entry in it:
+            if not entry.name.endswith(".json") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            cached = old_entries.get(entry.name)
+            if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+                entries[entry.name] = cached
+            else:
+                entries[entry.name] = [stat.st_mtime_ns, stat.st_size, read_vehicle_id(entry.path)]
+                changed = True
+
+    if changed or len(entries) != len(old_entries):
+        save_index(input_dir, entries)
+    return entries
+
+
+def refresh_entries(input_dir, entries, filenames):
+    """
+    Update a catalog snapshot for just the given files (e.g. from the change journal)
+    without listing the directory. Returns the new entries dict.
+    """
+    entries = dict(entries)
+    for filename in filenames:
+        filepath = os.path.join(input_dir, filename)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            entries.pop(filename, None)
+            continue
+        cached = entries.get(filename)
+        if not (cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size):
+            entries[filename] = [stat.st_mtime_ns, stat.st_size, read_vehicle_id(filepath)]
+    save_index(input_dir, entries)
+    return entries
+
+
+def listed(entry):
+    """Files are listed when they have a vehicle field, even an empty one; invalid files are not."""
+    return entry[2] is not None
+
+
+def catalog_paths(entries):
+    """Convert catalog entries into [(filename, vehicle), ...] for the listed files."""
+    return [(filename, entry[2]) for filename, entry in entries.items() if listed(entry)]
+
+
+def diff_entries(old_entries, new_entries):
+    """
+    Compare two catalog snapshots.
+    Returns (added, modified, removed) lists of (filename, vehicle) pairs.
+    """
+    added, modified, removed = [], [], []
+    for filename, entry in new_entries.items():
+        old = old_entries.get(filename)
+        if old is None:
+            if listed(entry):
+                added.append((filename, entry[2]))
+        elif old[0] != entry[0] or old[1] != entry[1] or old[2] != entry[2]:
+            if listed(entry) and listed(old):
+                modified.append((filename, entry[2]))
+            elif listed(entry):
+                added.append((filename, entry[2]))
+            elif listed(old):
+                removed.append((filename, old[2]))
+    for filename, entry in old_entries.items():
+        if filename not in new_entries and listed(entry):
+            removed.append((filename, entry[2]))
+    return added, modified, removed
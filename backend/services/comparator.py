@@ -1,32 +1,35 @@
 # backend/services/comparator.py
 import numpy as np
+from backend.models.steering_path import SteeringPath
+from backend.services.kinematics import compute_segments_points
+from backend.services.resample import cumulative_lengths, sample_at
+from backend.services.tracing import traced
+
+DEFAULT_RESAMPLE_STEP = 1.0
+DEFAULT_CHUNK_SIZE = 65536
 
 def compute_path_points(segments):
     """
     Compute 3D points from shaft lengths and Euler angles (yaw, pitch).
+    Accepts segment dicts or a SteeringPath (whose cached points are reused).
+    Returns an (N+1)x3 array.
     """
-    points = [(0, 0, 0)]
-    x, y, z = 0, 0, 0
-
-    for seg in segments:
-        l = seg['shaft_length']
-        yaw_deg = seg['euler'][0]
-        pitch_deg = seg['euler'][1]
-
-        yaw_rad = np.radians(yaw_deg)
-        pitch_rad = np.radians(pitch_deg)
-
-        dx = l * np.cos(pitch_rad) * np.cos(yaw_rad)
-        dy = l * np.cos(pitch_rad) * np.sin(yaw_rad)
-        dz = l * np.sin(pitch_rad)
+    if isinstance(segments, SteeringPath):
+        return segments.points
+    return compute_segments_points(segments)
 
-        x += dx
-        y += dy
-        z += dz
-        points.append((x, y, z))
-
-    return points
+def vertex_deviation(points1, points2):
+    """
+    Vertex-by-vertex deviation of two point arrays over the shorter one.
+    Returns (avg_deviation, max_deviation, deltas).
+    """
+    length = min(len(points1), len(points2))
+    deltas = np.linalg.norm(points1[:length] - points2[:length], axis=1)
+    avg_deviation = float(deltas.mean()) if length else 0.0
+    max_deviation = float(deltas.max()) if length else 0.0
+    return avg_deviation, max_deviation, deltas
 
+@traced("comparator.compare_paths")
 def compare_paths(segments1, segments2):
     """
     Compare two paths represented as segments.
@@ -36,20 +39,102 @@ def compare_paths(segments1, segments2):
     points2 = compute_path_points(segments2)
 
     length = min(len(points1), len(points2))
-    points1 = points1[:length]
-    points2 = points2[:length]
+    avg_deviation, max_deviation, deltas = vertex_deviation(points1, points2)
 
-    deltas = [np.linalg.norm(np.subtract(points1[i], points2[i])) for i in range(length)]
+    return {
+        'points1': points1[:length],
+        'points2': points2[:length],
+        'avg_deviation': avg_deviation,
+        'max_deviation': max_deviation,
+        'deltas': deltas
+    }
 
-    avg_deviation = float(np.mean(deltas)) if deltas else 0.0
-    max_deviation = float(np.max(deltas)) if deltas else 0.0
+def streaming_deviation(point_blocks1, point_blocks2):
+    """
+    Vertex deviation of two paths given as iterables of point blocks (for example
+    from forward_kinematics_stream), in one pass with bounded memory.
+    Matches vertex_deviation over the shorter path. Returns (avg_deviation, max_deviation).
+    """
+    blocks1 = iter(point_blocks1)
+    blocks2 = iter(point_blocks2)
+    pending1 = np.empty((0, 3))
+    pending2 = np.empty((0, 3))
+    total = 0.0
+    count = 0
+    max_deviation = 0.0
+    while True:
+        if not len(pending1):
+            pending1 = next(blocks1, None)
+        if not len(pending2) and pending1 is not None:
+            pending2 = next(blocks2, None)
+        if pending1 is None or pending2 is None:
+            break
+        n = min(len(pending1), len(pending2))
+        if n:
+            deltas = np.linalg.norm(pending1[:n] - pending2[:n], axis=1)
+            total += float(deltas.sum())
+            max_deviation = max(max_deviation, float(deltas.max()))
+            count += n
+        pending1 = pending1[n:]
+        pending2 = pending2[n:]
+    return (total / count if count else 0.0), max_deviation
+
+def resampled_deviation(points1, points2, step=DEFAULT_RESAMPLE_STEP, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Deviation between two polylines sampled at the same arc-length positions,
+    every `step` units over their common length (plus the common end point).
+    Samples are generated and compared in chunks of `chunk_size`, so memory
+    does not grow with resolution.
+    Returns (avg_deviation, max_deviation, max_deviation_at, sample_count).
+    """
+    if step <= 0:
+        raise ValueError("Resample step must be positive")
+    cumulative1 = cumulative_lengths(points1)
+    cumulative2 = cumulative_lengths(points2)
+    common = min(cumulative1[-1], cumulative2[-1])
+
+    regular = int(np.floor(common / step)) + 1
+    needs_end = (regular - 1) * step < common
+    sample_count = regular + (1 if needs_end else 0)
+
+    total = 0.0
+    max_deviation = 0.0
+    max_deviation_at = 0.0
+    for start in range(0, sample_count, chunk_size):
+        stop = min(start + chunk_size, sample_count)
+        distances = np.arange(start, stop, dtype=np.float64) * step
+        if needs_end and stop == sample_count:
+            distances[-1] = common
+        deltas = np.linalg.norm(
+            sample_at(points1, cumulative1, distances) - sample_at(points2, cumulative2, distances), axis=1)
+        total += float(deltas.sum())
+        i = int(deltas.argmax())
+        if deltas[i] > max_deviation:
+            max_deviation = float(deltas[i])
+            max_deviation_at = float(distances[i])
+
+    return total / sample_count, max_deviation, max_deviation_at, sample_count
+
+@traced("comparator.compare_paths_resampled")
+def compare_paths_resampled(segments1, segments2, step=DEFAULT_RESAMPLE_STEP, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Compare two paths by arc length instead of vertex index, so attempts with
+    different segment counts are compared where they actually are.
+    Returns dict with average/max deviation, the arc length of the max, and both point arrays.
+    """
+    points1 = compute_path_points(segments1)
+    points2 = compute_path_points(segments2)
+    avg_deviation, max_deviation, max_deviation_at, sample_count = resampled_deviation(
+        points1, points2, step, chunk_size)
 
     return {
         'points1': points1,
         'points2': points2,
         'avg_deviation': avg_deviation,
         'max_deviation': max_deviation,
-        'deltas': deltas
+        'max_deviation_at': max_deviation_at,
+        'sample_count': sample_count,
+        'step': step,
     }
 
 def extract_path_points(segments):
@@ -0,0 +1,170 @@
+# backend/services/corridor.py
+import numpy as np
+from backend.services.deviation_matrix import as_points
+from backend.services.resample import cumulative_lengths, sample_at
+from backend.services.tracing import traced
+
+DEFAULT_CHUNK_SIZE = 64
+# Upper bound on samples x segments evaluated in one vectorized block
+MAX_PAIRS = 1 << 20
+# Consecutive reference segments sharing one bounding box in the coarse index
+BLOCK_SIZE = 32
+# Blocks nearest (by bounding box) to a chunk, used to bound its distances
+SEED_BLOCKS = 2
+# Relative (and absolute) slack on the box-pruning bound
+BOUND_SLACK = 1e-9
+
+
+def point_segment_distances(samples, starts, directions, inv_sq_lengths):
+    """
+    Exact (M, K) distances from M points to K segments given as start points,
+    direction vectors (end - start) and 1/|direction|^2 (0 for degenerate segments).
+    """
+    offsets = samples[:, None, :] - starts[None, :, :]
+    t = np.clip(np.einsum('mkd,kd->mk', offsets, directions) * inv_sq_lengths, 0.0, 1.0)
+    closest = offsets - t[:, :, None] * directions[None, :, :]
+    return np.sqrt(np.einsum('mkd,mkd->mk', closest, closest))
+
+
+def box_distances(lo, hi, boxes_lo, boxes_hi):
+    """Distance between the box [lo, hi] and each of K boxes (0 where they overlap)."""
+    gap = np.maximum(np.maximum(boxes_lo - hi, lo - boxes_hi), 0.0)
+    return np.sqrt((gap * gap).sum(axis=1))
+
+
+def candidate_samples(points, step=None):
+    """
+    Points to test along a candidate polyline and their arc-length positions:
+    its vertices, plus samples every `step` units when given.
+    """
+    cumulative = cumulative_lengths(points)
+    if not step or len(points) < 2:
+        return points, cumulative
+    distances = np.union1d(cumulative, np.arange(0.0, cumulative[-1], step))
+    return sample_at(points, cumulative, distances), distances
+
+
+class Corridor:
+    """
+    Tolerance corridor around a reference polyline. The segment data and
+    bounding boxes are computed once, so many candidates can be checked
+    against the same reference.
+
+    Candidate samples are processed in chunks of consecutive points. For each
+    chunk only the reference segments whose bounding boxes can hold the nearest
+    segment (or, in pass/fail mode, lie within the tolerance) are evaluated;
+    boxes over blocks of BLOCK_SIZE segments are tested first so long
+    references are not scanned segment by segment.
+    """
+
+    def __init__(self, reference, chunk_size=DEFAULT_CHUNK_SIZE):
+        points = as_points(reference)
+        if len(points) < 2:
+            points = np.vstack([points[:1], points[:1]]) if len(points) else np.zeros((2, 3))
+        self.points = points
+        self.chunk_size = chunk_size
+        self.starts = points[:-1]
+        self.directions = points[1:] - points[:-1]
+        sq_lengths = np.einsum('kd,kd->k', self.directions, self.directions)
+        self.inv_sq_lengths = np.divide(1.0, sq_lengths, out=np.zeros_like(sq_lengths), where=sq_lengths > 0)
+        self.boxes_lo = np.minimum(points[:-1], points[1:])
+        self.boxes_hi = np.maximum(points[:-1], points[1:])
+        self.block_starts = np.arange(0, len(self.starts), BLOCK_SIZE)
+        self.blocks_lo = np.minimum.reduceat(self.boxes_lo, self.block_starts)
+        self.blocks_hi = np.maximum.reduceat(self.boxes_hi, self.block_starts)
+
+    def _block_segments(self, blocks):
+        """Segment indices covered by the given block indices."""
+        if len(blocks) == 0:
+            return np.empty(0, dtype=np.intp)
+        offsets = np.arange(BLOCK_SIZE)
+        segments = (self.block_starts[blocks][:, None] + offsets).ravel()
+        return segments[segments < len(self.starts)]
+
+    def _distances(self, samples, segments):
+        """Minimum distance from each sample to the given segment indices."""
+        best = np.full(len(samples), np.inf)
+        step = max(1, MAX_PAIRS // max(1, len(samples)))
+        for start in range(0, len(segments), step):
+            idx = segments[start:start + step]
+            d = point_segment_distances(samples, self.starts[idx], self.directions[idx], self.inv_sq_lengths[idx])
+            np.minimum(best, d.min(axis=1), out=best)
+        return best
+
+    def chunk_distances(self, samples, tolerance=None):
+        """
+        Distances from a chunk of samples to the reference. With a tolerance,
+        values above it are only guaranteed to be above it, not exact.
+        """
+        lo = samples.min(axis=0)
+        hi = samples.max(axis=0)
+        block_gaps = box_distances(lo, hi, self.blocks_lo, self.blocks_hi)
+        if tolerance is not None:
+            bound = tolerance
+        else:
+            seeds = np.argpartition(block_gaps, min(SEED_BLOCKS, len(block_gaps)) - 1)[:SEED_BLOCKS]
+            bound = self._distances(samples, self._block_segments(seeds)).max()
+        # Box gaps and exact distances round differently; a box whose gap equals the
+        # bound (nearest point at a box corner) must not be dropped by an ulp
+        bound = bound * (1 + BOUND_SLACK) + BOUND_SLACK
+        segments = self._block_segments(np.flatnonzero(block_gaps <= bound))
+        gaps = box_distances(lo, hi, self.boxes_lo[segments], self.boxes_hi[segments])
+        near = segments[gaps <= bound]
+        if len(near) == 0:
+            return np.full(len(samples), np.inf)
+        return self._distances(samples, near)
+
+    def distances(self, samples):
+        """Exact minimum distance from every sample to the reference polyline."""
+        samples = np.asarray(samples, dtype=np.float64)
+        out = np.empty(len(samples), dtype=np.float64)
+        for start in range(0, len(samples), self.chunk_size):
+            out[start:start + self.chunk_size] = self.chunk_distances(samples[start:start + self.chunk_size])
+        return out
+
+    @traced("corridor.check")
+    def check(self, candidate, tolerance, step=None, fail_fast=False):
+        """
+        Check that a candidate path stays within `tolerance` of the reference.
+
+        Returns a dict with 'passed', the 'first_violation' (arc length along the
+        candidate, or None) and, unless fail_fast stopped early, 'max_distance',
+        'max_distance_at' and 'mean_distance'. With fail_fast the check stops at
+        the first chunk holding a violation (pass/fail mode).
+        """
+        samples, arc = candidate_samples(as_points(candidate), step)
+        total = 0.0
+        max_distance = 0.0
+        max_distance_at = 0.0
+        first_violation = None
+        for start in range(0, len(samples), self.chunk_size):
+            chunk = samples[start:start + self.chunk_size]
+            d = self.chunk_distances(chunk, tolerance if fail_fast else None)
+            outside = np.flatnonzero(d > tolerance)
+            if len(outside) and first_violation is None:
+                first_violation = float(arc[start + outside[0]])
+                if fail_fast:
+                    return {'passed': False, 'first_violation': first_violation, 'sample_count': start + len(chunk)}
+            total += float(d.sum())
+            i = int(d.argmax())
+            if d[i] > max_distance:
+                max_distance = float(d[i])
+                max_distance_at = float(arc[start + i])
+        return {
+            'passed': first_violation is None,
+            'first_violation': first_violation,
+            'max_distance': max_distance,
+            'max_distance_at': max_distance_at,
+            'mean_distance': total / len(samples) if len(samples) else 0.0,
+            'sample_count': len(samples),
+        }
+
+    def check_many(self, candidates, tolerance, step=None, fail_fast=False):
+        """Batch mode: check() for every (key, candidate) pair. Yields (key, result)."""
+        for key, candidate in candidates:
+            yield key, self.check(candidate, tolerance, step, fail_fast)
+
+
+def corridor_check(reference, candidate, tolerance, step=None, fail_fast=False):
+    """One-off corridor check of a candidate path (points, SteeringPath or segments)."""
+    return Corridor(reference).check(candidate, tolerance, step, fail_fast)
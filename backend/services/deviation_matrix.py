@@ -0,0 +1,172 @@
+# backend/services/deviation_matrix.py
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from backend.models.steering_path import SteeringPath
+from backend.services.kinematics import compute_segments_points, forward_kinematics, current_mode
+from backend.services.file_handler import load_steering_path
+
+DEFAULT_MEMORY_BUDGET = 64 * 1024 * 1024  # bytes per tile of broadcast differences
+
+
+def as_points(path, mode=None):
+    """
+    Accept a SteeringPath, a list of segment dicts, or an (N+1)x3 point array.
+    Points are computed in `mode` (default: the configured kinematics mode).
+    """
+    if isinstance(path, SteeringPath):
+        if mode is None or mode == current_mode():
+            return path.points
+        return forward_kinematics(path.lengths, path.yaw, path.pitch, path.roll, mode)
+    if isinstance(path, np.ndarray):
+        return path
+    return compute_segments_points(path, mode)
+
+
+def write_points(paths, out_file, dtype=np.float64):
+    """
+    Append the points of each path to a raw (total, 3) file, one path at a time.
+    Returns (offsets, counts) locating each path's rows in the file.
+    """
+    counts = []
+    for path in paths:
+        points = np.ascontiguousarray(as_points(path), dtype=dtype)
+        out_file.write(points.tobytes())
+        counts.append(len(points))
+    counts = np.array(counts, dtype=np.intp)
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp) if len(counts) else counts
+    return offsets, counts
+
+
+def gather_rows(flat, offsets, counts, index, width):
+    """Pad the points of paths[index] into a (len(index), width, 3) block (longer paths are cut)."""
+    block = np.zeros((len(index), width, 3), dtype=flat.dtype)
+    for k, i in enumerate(index):
+        n = min(counts[i], width)
+        block[k, :n] = flat[offsets[i]:offsets[i] + n]
+    return block
+
+
+def tile_size_for(max_points, itemsize, memory_budget=DEFAULT_MEMORY_BUDGET):
+    per_pair = max(1, max_points * 3 * itemsize)
+    return max(1, int(np.sqrt(memory_budget / per_pair)))
+
+
+def evaluate_block(flat, offsets, counts, rows, cols):
+    """
+    Avg and max vertex deviation for every (row, col) pair, matching compare_paths:
+    each pair is compared over the shorter of the two point lists. Only the
+    paths of this tile are padded, to the longest length any pair compares.
+    """
+    row_counts = counts[rows.start:rows.stop]
+    col_counts = counts[cols.start:cols.stop]
+    width = int(min(row_counts.max(), col_counts.max()))
+    a = gather_rows(flat, offsets, counts, range(rows.start, rows.stop), width)
+    b = gather_rows(flat, offsets, counts, range(cols.start, cols.stop), width)
+    deltas = np.linalg.norm(a[:, None, :, :] - b[None, :, :, :], axis=-1)
+
+    pair_len = np.minimum(row_counts[:, None], col_counts[None, :])
+    mask = np.arange(width) < pair_len[..., None]
+    deltas = np.where(mask, deltas, 0)
+    avg = deltas.sum(axis=-1) / np.maximum(pair_len, 1)
+    return avg, deltas.max(axis=-1)
+
+
+def _open_points(points_file, index_file, dtype):
+    index = np.load(index_file)
+    total = int(index[1].sum())
+    flat = np.memmap(points_file, dtype=dtype, mode="r", shape=(total, 3)) if total else np.zeros((0, 3), dtype)
+    return flat, index[0], index[1]
+
+
+def _tile_worker(points_file, index_file, dtype, out_file, row_start, row_stop, col_start, col_stop):
+    flat, offsets, counts = _open_points(points_file, index_file, dtype)
+    rows, cols = slice(row_start, row_stop), slice(col_start, col_stop)
+    avg, mx = evaluate_block(flat, offsets, counts, rows, cols)
+
+    out = np.load(out_file, mmap_mode="r+")
+    out[0, rows, cols] = avg
+    out[1, rows, cols] = mx
+    out[0, cols, rows] = avg.T
+    out[1, cols, rows] = mx.T
+    out.flush()
+
+
+def _tiles(counts, tile):
+    n = len(counts)
+    return [
+        (r, min(r + tile, n), c, min(c + tile, n))
+        for r in range(0, n, tile)
+        for c in range(r, n, tile)
+    ]
+
+
+def deviation_matrix(paths, out_path=None, jobs=1, float32=False, tile_size=None,
+                     memory_budget=DEFAULT_MEMORY_BUDGET):
+    """
+    Compute the N x N average and maximum deviation matrices for an iterable of paths.
+
+    Point arrays are computed once, one path at a time, and stored back to back
+    in one flat array with per-path offsets; every tile of pairs pads just its
+    own rows and is evaluated with broadcasting. Only the upper triangle of
+    tiles is computed; the matrix is symmetric. With jobs > 1 tiles are spread
+    across a process pool.
+
+    Results are a (2, N, N) array: [0] = avg deviation, [1] = max deviation.
+    When out_path is given (or jobs > 1) the points go to a temporary file and
+    the result is written to a memory-mapped .npy file, so only the tiles being
+    evaluated are resident; with out_path that file is returned.
+    """
+    dtype = np.float32 if float32 else np.float64
+
+    if jobs <= 1 and out_path is None:
+        point_arrays = [np.asarray(as_points(p), dtype=dtype) for p in paths]
+        counts = np.array([len(p) for p in point_arrays], dtype=np.intp)
+        flat = np.concatenate(point_arrays) if point_arrays else np.zeros((0, 3), dtype)
+        del point_arrays
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1])).astype(np.intp) if len(counts) else counts
+        n = len(counts)
+        tile = tile_size or tile_size_for(int(counts.max()) if n else 0, np.dtype(dtype).itemsize, memory_budget)
+        result = np.zeros((2, n, n), dtype=dtype)
+        for r0, r1, c0, c1 in _tiles(counts, tile):
+            avg, mx = evaluate_block(flat, offsets, counts, slice(r0, r1), slice(c0, c1))
+            result[0, r0:r1, c0:c1], result[1, r0:r1, c0:c1] = avg, mx
+            result[0, c0:c1, r0:r1], result[1, c0:c1, r0:r1] = avg.T, mx.T
+        return result
+
+    with tempfile.TemporaryDirectory(prefix="pathvision_matrix_") as work_dir:
+        points_file = os.path.join(work_dir, "points.bin")
+        index_file = os.path.join(work_dir, "index.npy")
+        with open(points_file, "wb") as f:
+            offsets, counts = write_points(paths, f, dtype)
+        np.save(index_file, np.stack([offsets, counts]) if len(counts) else np.zeros((2, 0), dtype=np.intp))
+        n = len(counts)
+        tile = tile_size or tile_size_for(int(counts.max()) if n else 0, np.dtype(dtype).itemsize, memory_budget)
+        tiles = _tiles(counts, tile)
+
+        target = out_path or os.path.join(work_dir, "matrix.npy")
+        out = np.lib.format.open_memmap(target, mode="w+", dtype=dtype, shape=(2, n, n))
+        out.flush()
+        del out
+
+        if jobs <= 1:
+            for t in tiles:
+                _tile_worker(points_file, index_file, dtype, target, *t)
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                futures = [pool.submit(_tile_worker, points_file, index_file, dtype, target, *t) for t in tiles]
+                for future in futures:
+                    future.result()
+
+        if out_path:
+            return np.load(out_path, mmap_mode="r+")
+        return np.array(np.load(target, mmap_mode="r"))
+
+
+def family_deviation_matrix(filenames, **kwargs):
+    """
+    Run deviation_matrix over the given path files (e.g. every attempt of one
+    vehicle family). Files are loaded one at a time as their points are needed.
+    """
+    return deviation_matrix((load_steering_path(f) for f in filenames), **kwargs)
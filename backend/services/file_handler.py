@@ -1,66 +1,314 @@
 # backend/services/file_handler.py
 
 import os
-import sys
 import json
+import threading
+from backend.models.steering_path import SteeringPath
+from backend.services.catalog import scan_catalog, catalog_paths
+from backend.database.db import PathDatabase, DB_FILENAME
+from backend.database.archive import PathArchive
+from backend.services.path_cache import path_cache
+from backend.services.tracing import traced, span
+from backend.services import stream_parser
+from backend.services.settings import settings
+from backend.services.mirror import PathMirror, atomic_write, content_hash
+from backend.services.journal import ChangeJournal, JOURNAL_DIRNAME, OP_SAVE, OP_DELETE
+
+# JSON files at least this large are read with the streaming parser
+STREAM_THRESHOLD_BYTES = 256 * 1024
+MIRROR_SYNC_INTERVAL_MS = 5000
+
+# Guards the lazily opened storage objects below, which GUI workers also reach
+_storage_lock = threading.RLock()
 
 def get_config_path():
-    if getattr(sys, 'frozen', False):
-        # Running from PyInstaller bundle
-        exe_dir = os.path.dirname(sys.executable)
-    else:
-        # Running from source
-        exe_dir = os.path.dirname(os.path.abspath(__file__))
+    return settings.config_path
+
+
+def set_config_overrides(**overrides):
+    """Override config.json values for this process, e.g. from command-line flags."""
+    settings.set_overrides(**overrides)
+
+
+def get_config_overrides():
+    return settings.overrides()
 
-    return os.path.join(exe_dir, "config.json")
+
+def read_config():
+    return settings.config()
 
 
 def get_shared_input_path():
-    config_file = get_config_path()
-    if os.path.exists(config_file):
-        try:
-            with open(config_file, "r") as f:
-                config = json.load(f)
-                return config.get("shared_input_path")
-        except Exception as e:
-            print(f"[ERROR] Failed to read config.json: {e}")
-            return None
-    else:
-        print(f"[ERROR] config.json not found at {config_file}")
-    return None
+    return settings.get("shared_input_path")
+
+
+_database = None
+
+
+def get_database():
+    """
+    Return the SQLite store when config.json sets "storage": "sqlite", else None.
+    The database lives at "database_path" or inside the shared input directory.
+    """
+    global _database
+    config = read_config() or {}
+    if config.get("storage") != "sqlite":
+        return None
+    db_path = config.get("database_path") or os.path.join(get_input_dir(), DB_FILENAME)
+    with _storage_lock:
+        if _database is None or _database.db_path != db_path:
+            _database = PathDatabase(db_path)
+        return _database
+
+
+_archive = None
+
+
+def get_archive():
+    """
+    Return the PathArchive named by "archive_path" in config.json, or None.
+    The archive is reopened when the file on disk changes, and its deletions
+    re-read when its tombstone file does.
+    """
+    global _archive
+    config = read_config() or {}
+    archive_path = config.get("archive_path")
+    if not archive_path or not os.path.exists(archive_path):
+        return None
+    with _storage_lock:
+        if (_archive is None or _archive.archive_path != archive_path
+                or _archive.mtime != os.path.getmtime(archive_path)):
+            _archive = PathArchive(archive_path)
+        else:
+            _archive.refresh_deleted()
+        return _archive
+
+
+def archive_has_current(archive, filename):
+    """
+    True if the archive holds filename and no newer JSON copy exists. Deleted
+    paths are not in the archive any more; a missing JSON file then means the
+    path only ever lived in the archive.
+    """
+    if archive is None or filename not in archive:
+        return False
+    try:
+        return os.path.getmtime(source_path(filename)) <= archive.mtime
+    except OSError:
+        return True
 
 
 def get_input_dir():
-    path = get_shared_input_path()
-    if path:
-        os.makedirs(path, exist_ok=True)
-        return path
-    raise Exception("Shared input path not found in config.json")
+    return settings.input_dir()
+
+
+_mirror = None
+
+
+def get_mirror():
+    """
+    Return the local mirror of the shared input directory when config.json sets
+    "mirror_path", else None. Files are pulled on first read; whole-share syncs
+    only run on the background thread started by start_mirror_sync().
+    """
+    global _mirror
+    mirror_path = settings.get("mirror_path")
+    if not mirror_path:
+        return None
+    shared_dir = get_input_dir()
+    with _storage_lock:
+        if _mirror is None or _mirror.shared_dir != shared_dir or _mirror.local_dir != mirror_path:
+            if _mirror is not None:
+                _mirror.stop_sync()
+            _mirror = PathMirror(shared_dir, mirror_path)
+        return _mirror
+
+
+def start_mirror_sync():
+    """Keep the mirror (if configured) in sync from a background thread, starting with a full pull."""
+    mirror = get_mirror()
+    if mirror:
+        mirror.start_sync(settings.get("mirror_sync_interval_ms", MIRROR_SYNC_INTERVAL_MS) / 1000)
+    return mirror
 
 
+def get_read_dir():
+    """
+    Directory that path files are listed from: the mirror once it holds a copy
+    of the share, else the share itself.
+    """
+    mirror = get_mirror()
+    return mirror.local_dir if mirror and mirror.ready.is_set() else get_input_dir()
+
+
+def source_path(filename):
+    """Local file to read `filename` from (pulled into the mirror first if needed)."""
+    mirror = get_mirror()
+    if mirror:
+        return mirror.local_path(filename)
+    return os.path.join(get_input_dir(), filename)
+
+
+@traced("file_handler.list_vehicle_paths")
 def list_vehicle_paths():
-    input_dir = get_input_dir()
-    paths = []
-    for filename in os.listdir(input_dir):
-        if filename.endswith(".json"):
-            filepath = os.path.join(input_dir, filename)
-            try:
-                with open(filepath, "r") as f:
-                    data = json.load(f)
-                    if "vehicle" in data:
-                        paths.append((filename, data["vehicle"]))
-            except Exception:
-                continue
+    database = get_database()
+    if database:
+        return database.list_vehicle_paths()
+    paths = catalog_paths(scan_catalog(get_read_dir()))
+    archive = get_archive()
+    if archive:
+        on_disk = {filename for filename, _ in paths}
+        paths += [p for p in archive.list_vehicle_paths() if p[0] not in on_disk]
     return paths
 
 
+@traced("file_handler.load_path_data")
 def load_path_data(filename):
-    filepath = os.path.join(get_input_dir(), filename)
-    with open(filepath, "r") as f:
+    database = get_database()
+    if database:
+        return database.load_path_data(filename)
+    archive = get_archive()
+    if archive_has_current(archive, filename):
+        return archive.load_path_data(filename)
+    with open(source_path(filename), "r") as f:
         return json.load(f)
 
 
 def save_path_data(filename, data):
-    filepath = os.path.join(get_input_dir(), filename)
-    with open(filepath, "w") as f:
-        json.dump(data, f, indent=4)
+    database = get_database()
+    if database:
+        database.save_path_data(filename, data)
+        return
+    content = json.dumps(data, indent=4).encode()
+    mirror = get_mirror()
+    if mirror:
+        mirror.write(filename, content)
+    else:
+        atomic_write(os.path.join(get_input_dir(), filename), content)
+    record_change(OP_SAVE, filename, content_hash(content))
+
+
+def delete_path_data(filename):
+    database = get_database()
+    if database:
+        database.delete_path(filename)
+        return
+    archive = get_archive()
+    archived = archive is not None and filename in archive
+    if archived:
+        archive.mark_deleted(filename)
+    mirror = get_mirror()
+    try:
+        if mirror:
+            mirror.delete(filename)
+        else:
+            os.remove(os.path.join(get_input_dir(), filename))
+    except FileNotFoundError:
+        # Paths that only live in the archive have no JSON file to remove
+        if not archived:
+            raise
+    record_change(OP_DELETE, filename)
+
+
+_journal = None
+
+
+def get_journal():
+    """
+    Change journal of the shared input directory, or None for SQLite storage
+    or when config.json sets "journal": false.
+    """
+    global _journal
+    if get_database() or not settings.get("journal", True):
+        return None
+    input_dir = get_input_dir()
+    with _storage_lock:
+        if _journal is None or _journal.directory != os.path.join(input_dir, JOURNAL_DIRNAME):
+            _journal = ChangeJournal(input_dir)
+        return _journal
+
+
+def record_change(op, filename, digest=None):
+    try:
+        journal = get_journal()
+        if journal:
+            journal.append(op, filename, digest)
+    except OSError as e:
+        print(f"[WARN] Could not record {op} of {filename} in the change journal: {e}")
+
+
+def journal_changes(since):
+    """
+    Catch up with the change journal after sequence `since`.
+    Returns (head, filenames); filenames is None when there is no journal or it
+    does not reach back to `since`, so the caller has to rescan. Changed files
+    are pulled into the mirror first when one is configured.
+    """
+    journal = get_journal()
+    if journal is None:
+        return None, None
+    head, entries = journal.changes_since(since if since is not None else -1)
+    if entries is None:
+        return head, None
+    mirror = get_mirror()
+    if mirror:
+        for entry in entries:
+            mirror.apply_change(entry["filename"], entry.get("hash"))
+    archive = get_archive()
+    if archive is not None:
+        # Deletes made on other workstations must hide archived copies here too
+        for entry in entries:
+            if entry["op"] == OP_DELETE and entry["filename"] in archive:
+                archive.mark_deleted(entry["filename"], entry.get("time"))
+    return head, list(dict.fromkeys(entry["filename"] for entry in entries))
+
+
+def path_cache_key(filename):
+    """Cache key for a stored path that changes whenever its backing storage does."""
+    database = get_database()
+    if database:
+        stat = os.stat(database.db_path)
+        return ("db", filename, stat.st_mtime_ns, stat.st_size)
+    archive = get_archive()
+    if archive_has_current(archive, filename):
+        return ("archive", archive.archive_path, filename, archive.mtime)
+    stat = os.stat(source_path(filename))
+    return ("json", filename, stat.st_mtime_ns, stat.st_size)
+
+
+def stream_source(filename):
+    """
+    Local JSON file to stream `filename` from, or None when it is small enough
+    to load with json or is stored in the database or archive.
+    """
+    if get_database() or archive_has_current(get_archive(), filename):
+        return None
+    filepath = source_path(filename)
+    return filepath if os.path.getsize(filepath) >= STREAM_THRESHOLD_BYTES else None
+
+
+def read_steering_path(filename):
+    database = get_database()
+    if database:
+        return database.load_steering_path(filename)
+    archive = get_archive()
+    if archive_has_current(archive, filename):
+        return archive.load_steering_path(filename)
+    filepath = source_path(filename)
+    if os.path.getsize(filepath) >= STREAM_THRESHOLD_BYTES:
+        # Same span name as the json route so both show up as one operation
+        with span("file_handler.load_path_data", streamed=True):
+            return stream_parser.load_steering_path(filepath)
+    return SteeringPath.from_dict(load_path_data(filename))
+
+
+def load_steering_path(filename):
+    """
+    Load a path through the process-wide cache. Its points are computed once
+    and cached with it; callers must treat the returned object as read-only.
+    """
+    def load():
+        path = read_steering_path(filename)
+        path.points
+        return path
+    return path_cache.get_or_compute(("path",) + path_cache_key(filename), load)
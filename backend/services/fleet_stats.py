@@ -0,0 +1,392 @@
+# backend/services/fleet_stats.py
+"""
+Per-family statistics over all stored paths: the mean path and the per-segment
+spread of shaft lengths, angles and positions across attempts and revisions.
+
+Paths are read one at a time and folded into Welford accumulators, so memory
+depends on the longest path of a family, not on how many files it has. The
+accumulators remember which file versions they contain: later updates only
+read new files, and a family is rebuilt only when one of its files changed or
+was deleted. Results are kept in a sidecar file next to the catalog index.
+"""
+import os
+import json
+import threading
+import numpy as np
+from backend.models.steering_path import parse_vehicle_id
+from backend.services import file_handler
+from backend.services.kinematics import forward_kinematics, current_mode
+from backend.services.mirror import atomic_write
+from backend.services.tracing import traced
+
+STATS_FILENAME = ".pathvision_stats"
+STATS_VERSION = 1
+SEGMENT_FIELDS = ("shaft_length", "yaw", "pitch", "roll")
+# Rows need this many other paths before they count towards an outlier score
+MIN_SCORE_SAMPLES = 2
+# Standard deviations are floored so rows every other path agrees on do not
+# dominate the score: per field, the larger of an absolute floor in the field's
+# units and a fraction of the compared mean (shaft length, vertex distance)
+SEGMENT_STD_FLOOR = np.array([1e-3, 0.5, 0.5, 0.5])
+SEGMENT_RELATIVE_FLOOR = np.array([0.01, 0.0, 0.0, 0.0])
+POSITION_STD_FLOOR = 1e-3
+POSITION_RELATIVE_FLOOR = 0.01
+
+
+def family_key(vehicle_id):
+    """'GMC2500Gen4_attempt1_rev0_job1' -> 'GMC|2500|Gen4' (the base when it cannot be split)."""
+    fields = parse_vehicle_id(vehicle_id)
+    parts = [fields['brand'], fields['model'], fields['gen']]
+    if not fields['brand']:
+        return fields['base'] or ""
+    return "|".join(part for part in parts if part)
+
+
+class RunningStats:
+    """
+    Welford mean and variance of (N, D) samples, kept separately for every row.
+    Samples may have different N; row i only counts the samples that reach it.
+    """
+
+    def __init__(self, dims):
+        self.count = np.zeros(0, dtype=np.int64)
+        self.mean = np.zeros((0, dims))
+        self.m2 = np.zeros((0, dims))
+
+    def __len__(self):
+        return len(self.count)
+
+    def _grow(self, n):
+        if n <= len(self.count):
+            return
+        extra = n - len(self.count)
+        self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+        self.mean = np.vstack([self.mean, np.zeros((extra, self.mean.shape[1]))])
+        self.m2 = np.vstack([self.m2, np.zeros((extra, self.m2.shape[1]))])
+
+    def add(self, values):
+        n = len(values)
+        self._grow(n)
+        self.count[:n] += 1
+        delta = values - self.mean[:n]
+        self.mean[:n] += delta / self.count[:n, None]
+        self.m2[:n] += delta * (values - self.mean[:n])
+
+    def variance(self):
+        """Sample variance per row (NaN where fewer than two samples)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count[:, None] > 1, self.m2 / (self.count[:, None] - 1), np.nan)
+
+    def without(self, values):
+        """
+        (count, mean, variance) of the first len(values) rows with one earlier
+        sample `values` taken back out, i.e. the leave-one-out statistics.
+        """
+        n = min(len(values), len(self.count))
+        values = values[:n]
+        count = self.count[:n] - 1
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count[:, None] > 0,
+                            (self.mean[:n] * self.count[:n, None] - values) / count[:, None], np.nan)
+            m2 = self.m2[:n] - (values - mean) * (values - self.mean[:n])
+            variance = np.where(count[:, None] > 1, np.maximum(m2, 0.0) / (count[:, None] - 1), np.nan)
+        return count, mean, variance
+
+    def to_dict(self):
+        return {"count": self.count.tolist(), "mean": self.mean.tolist(), "m2": self.m2.tolist()}
+
+    @classmethod
+    def from_dict(cls, data, dims):
+        stats = cls(dims)
+        if data["count"]:
+            stats.count = np.asarray(data["count"], dtype=np.int64)
+            stats.mean = np.asarray(data["mean"], dtype=np.float64).reshape(-1, dims)
+            stats.m2 = np.asarray(data["m2"], dtype=np.float64).reshape(-1, dims)
+        return stats
+
+
+def segment_std_floor(mean):
+    return np.maximum(SEGMENT_STD_FLOOR, SEGMENT_RELATIVE_FLOOR * np.abs(mean))
+
+
+def position_std_floor(mean):
+    distance = np.linalg.norm(mean, axis=-1, keepdims=True)
+    return np.maximum(POSITION_STD_FLOOR, POSITION_RELATIVE_FLOOR * distance)
+
+
+def standardized_rms(values, stats, member, std_floor):
+    """
+    RMS z-score of (N, D) values against per-row statistics, over rows with at
+    least MIN_SCORE_SAMPLES other samples; std_floor(mean) gives the smallest
+    standard deviation used for each value. Returns (score, rows compared).
+    """
+    if member:
+        count, mean, variance = stats.without(values)
+    else:
+        n = min(len(values), len(stats))
+        count, mean, variance = stats.count[:n], stats.mean[:n], stats.variance()[:n]
+    rows = count >= MIN_SCORE_SAMPLES
+    if not rows.any():
+        return None, 0
+    mean = mean[rows]
+    std = np.maximum(np.sqrt(variance[rows]), std_floor(mean))
+    z = (values[:len(rows)][rows] - mean) / std
+    return float(np.sqrt(np.mean(z * z))), int(rows.sum())
+
+
+class FamilyStats:
+    """Accumulated statistics of one vehicle family."""
+
+    def __init__(self, family):
+        self.family = family
+        # filename -> storage stamp of the version that was added
+        self.members = {}
+        self.segments = RunningStats(len(SEGMENT_FIELDS))
+        self.positions = RunningStats(3)
+
+    @property
+    def path_count(self):
+        return int(self.segments.count[0]) if len(self.segments) else 0
+
+    def add(self, data, points):
+        """Fold one path in: its (4, N) segment block and (N+1, 3) points."""
+        self.segments.add(data.T)
+        self.positions.add(points)
+
+    def mean_points(self):
+        """(N+1, 3) mean position of every vertex reached by at least one path."""
+        return self.positions.mean.copy()
+
+    def spread(self):
+        """Per-row standard deviations: (segments (N, 4), positions (N+1, 3))."""
+        return np.sqrt(self.segments.variance()), np.sqrt(self.positions.variance())
+
+    def score(self, data, points, member=False):
+        """
+        Outlier score of one path: the RMS z-score of its segment values and vertex
+        positions against the family. With member=True the path is assumed to be
+        part of the statistics and is left out of them first.
+        Returns {'score', 'segment_score', 'position_score', 'compared'}; scores are
+        None when the family has too few other paths.
+        """
+        segment_score, segment_rows = standardized_rms(data.T, self.segments, member, segment_std_floor)
+        position_score, _ = standardized_rms(points, self.positions, member, position_std_floor)
+        parts = [s for s in (segment_score, position_score) if s is not None]
+        return {
+            'score': float(np.sqrt(np.mean(np.square(parts)))) if parts else None,
+            'segment_score': segment_score,
+            'position_score': position_score,
+            'compared': segment_rows,
+        }
+
+    def summary(self):
+        segment_std, position_std = self.spread()
+        position_norm = np.sqrt(np.nansum(np.square(position_std), axis=1))
+        summary = {
+            'family': self.family,
+            'paths': self.path_count,
+            'segments': len(self.segments),
+            'segment_std': {
+                field: (float(np.nanmean(segment_std[:, i])) if np.isfinite(segment_std[:, i]).any() else None)
+                for i, field in enumerate(SEGMENT_FIELDS)
+            },
+            'max_position_std': None,
+            'max_position_std_at': None,
+        }
+        if np.isfinite(position_std).any():
+            worst = int(np.nanargmax(position_norm))
+            summary['max_position_std'] = float(position_norm[worst])
+            summary['max_position_std_at'] = worst
+        return summary
+
+    def to_dict(self):
+        return {"members": self.members, "segments": self.segments.to_dict(),
+                "positions": self.positions.to_dict()}
+
+    @classmethod
+    def from_dict(cls, family, data):
+        stats = cls(family)
+        stats.members = data["members"]
+        stats.segments = RunningStats.from_dict(data["segments"], len(SEGMENT_FIELDS))
+        stats.positions = RunningStats.from_dict(data["positions"], 3)
+        return stats
+
+
+def path_stamp(filename):
+    return list(file_handler.path_cache_key(filename))
+
+
+def read_path(filename, mode):
+    """(4, N) segment block and points of a stored path, bypassing the path cache."""
+    path = file_handler.read_steering_path(filename)
+    return path.data, forward_kinematics(path.lengths, path.yaw, path.pitch, path.roll, mode)
+
+
+class FleetStats:
+    """
+    Statistics of every family in the catalog. update() can run on a background
+    thread while the UI reads mean paths; the lock covers each fold and read.
+    """
+
+    def __init__(self, mode=None):
+        self.mode = mode or current_mode()
+        self.families = {}
+        self._lock = threading.Lock()
+
+    @traced("fleet_stats.update")
+    def update(self, items=None, should_stop=None):
+        """
+        Bring the statistics up to date with [(filename, vehicle), ...] (default:
+        every stored path). Returns the set of families that changed.
+        """
+        mode = current_mode()
+        items = file_handler.list_vehicle_paths() if items is None else items
+
+        wanted = {}
+        for filename, vehicle in items:
+            wanted.setdefault(family_key(vehicle), {})[filename] = None
+        with self._lock:
+            if self.mode != mode:
+                self.mode = mode
+                self.families = {}
+            changed = set(self.families) - set(wanted)
+            for family in changed:
+                del self.families[family]
+
+        for family, filenames in wanted.items():
+            stamps = {}
+            for filename in filenames:
+                try:
+                    stamps[filename] = path_stamp(filename)
+                except OSError:
+                    continue
+            with self._lock:
+                current = self.families.get(family)
+                members = dict(current.members) if current else {}
+            if current is None or any(stamps.get(f) != s for f, s in members.items()):
+                # A member changed or disappeared: its old contribution cannot be
+                # taken back out, so the family is rebuilt from its current files.
+                target = FamilyStats(family)
+            else:
+                target = current
+            new = [f for f in stamps if target is not current or f not in members]
+            if not new and target is current:
+                continue
+            for filename in new:
+                if should_stop and should_stop():
+                    return changed
+                try:
+                    data, points = read_path(filename, self.mode)
+                except Exception as e:
+                    print(f"[WARN] Skipping {filename} in fleet statistics: {e}")
+                    data = None
+                with self._lock:
+                    if data is not None:
+                        target.add(data, points)
+                    # Unreadable files are remembered too; they are retried once their stamp changes.
+                    target.members[filename] = stamps[filename]
+            with self._lock:
+                self.families[family] = target
+            changed.add(family)
+        return changed
+
+    def family(self, family):
+        with self._lock:
+            return self.families.get(family)
+
+    def mean_path(self, vehicle_id):
+        """(mean points, path count) of the family of vehicle_id, or (None, 0)."""
+        with self._lock:
+            stats = self.families.get(family_key(vehicle_id))
+            if stats is None or not stats.path_count:
+                return None, 0
+            return stats.mean_points(), stats.path_count
+
+    def score(self, filename, path):
+        """Outlier score of a loaded SteeringPath against its family (see FamilyStats.score)."""
+        # Stamping may stat a file on the share, so it happens before the lock is taken
+        try:
+            stamp = path_stamp(filename)
+        except OSError:
+            stamp = None
+        with self._lock:
+            stats = self.families.get(family_key(path.vehicle_id))
+            if stats is None:
+                return None
+            member = stamp is not None and stats.members.get(filename) == stamp
+            return stats.score(path.data, path.points, member)
+
+    def family_scores(self, family):
+        """Second pass over one family: yields (filename, score dict) for each of its files."""
+        with self._lock:
+            stats = self.families.get(family)
+            filenames = list(stats.members) if stats else []
+        for filename in filenames:
+            try:
+                data, points = read_path(filename, self.mode)
+            except Exception as e:
+                yield filename, {'error': str(e)}
+                continue
+            with self._lock:
+                score = stats.score(data, points, member=True)
+            yield filename, score
+
+    def summaries(self):
+        with self._lock:
+            return [stats.summary() for _, stats in sorted(self.families.items())]
+
+    def save(self, path):
+        with self._lock:
+            data = json.dumps({
+                "version": STATS_VERSION,
+                "mode": self.mode,
+                "families": {family: stats.to_dict() for family, stats in self.families.items()},
+            })
+        try:
+            atomic_write(path, data.encode())
+        except OSError as e:
+            print(f"[WARN] Could not write fleet statistics: {e}")
+
+    @classmethod
+    def load(cls, path):
+        """Saved statistics, or empty ones if the file is missing, outdated or unreadable."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == STATS_VERSION:
+                stats = cls(data["mode"])
+                stats.families = {family: FamilyStats.from_dict(family, d)
+                                  for family, d in data["families"].items()}
+                return stats
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return cls()
+
+
+def get_stats_path():
+    database = file_handler.get_database()
+    if database:
+        return database.db_path + STATS_FILENAME
+    return os.path.join(file_handler.get_read_dir(), STATS_FILENAME)
+
+
+_fleet_stats = None
+_fleet_stats_lock = threading.Lock()
+
+
+def get_fleet_stats():
+    """Process-wide statistics, loaded from the sidecar file on first use."""
+    global _fleet_stats
+    with _fleet_stats_lock:
+        if _fleet_stats is None:
+            _fleet_stats = FleetStats.load(get_stats_path())
+        return _fleet_stats
+
+
+def update_fleet_stats(items=None, should_stop=None):
+    """Fold new and changed paths into the shared statistics and save them. Returns changed families."""
+    stats = get_fleet_stats()
+    changed = stats.update(items, should_stop)
+    if changed:
+        stats.save(get_stats_path())
+    return changed
@@ -0,0 +1,205 @@
+# backend/services/journal.py
+"""
+Append-only change journal kept next to the path files in the shared input directory.
+
+Every save or delete publishes one small entry file named by its sequence number
+({"seq", "op", "filename", "hash", "time"}). Entries are written to a temp file
+and then moved into place with an operation that refuses to overwrite, so two
+workstations can never claim the same sequence number. Shares without hard
+links (many SMB mounts) create the entry file exclusively instead. Clients remember the
+last sequence they applied and read only newer entries. Old entries are folded
+into a snapshot from time to time; a client that fell behind the snapshot has
+to rescan.
+"""
+import os
+import json
+import time
+import threading
+
+JOURNAL_DIRNAME = ".pathvision_journal"
+SNAPSHOT_FILENAME = "snapshot.json"
+LOCK_FILENAME = "compact.lock"
+# A compaction lock older than this is assumed to be left over from a crash
+STALE_LOCK_SECONDS = 60
+# Compact once this many entries are newer than the snapshot...
+COMPACT_EVERY = 500
+# ...leaving this many so clients that are slightly behind can still catch up
+COMPACT_KEEP = 100
+
+OP_SAVE = "save"
+OP_DELETE = "delete"
+
+
+def _tmp_path(directory):
+    return os.path.join(directory, f".{os.getpid()}.{threading.get_ident()}.{time.monotonic_ns()}.tmp")
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ChangeJournal:
+    def __init__(self, input_dir):
+        self.directory = os.path.join(input_dir, JOURNAL_DIRNAME)
+        os.makedirs(self.directory, exist_ok=True)
+        # Cleared the first time the share refuses a hard link
+        self._hard_links = os.name != "nt"
+
+    def _publish(self, final_path, data):
+        """
+        Create final_path holding `data`, failing with FileExistsError if it exists.
+        The entry is written to a temp file first and linked (renamed on Windows)
+        into place, so readers never see it half-written. Without hard-link
+        support it is created with O_CREAT | O_EXCL and written directly.
+        """
+        if self._hard_links or os.name == "nt":
+            tmp_path = _tmp_path(self.directory)
+            try:
+                with open(tmp_path, "wb") as f:
+                    f.write(data)
+                if os.name == "nt":
+                    os.rename(tmp_path, final_path)
+                    return
+                os.link(tmp_path, final_path)
+                return
+            except FileExistsError:
+                raise
+            except OSError as e:
+                if os.name == "nt":
+                    raise
+                print(f"[WARN] Hard links not supported in {self.directory} ({e}); using exclusive create")
+                self._hard_links = False
+            finally:
+                _remove_quietly(tmp_path)
+        fd = os.open(final_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+
+    def _entry_path(self, seq):
+        return os.path.join(self.directory, f"{seq:012d}.json")
+
+    def _entry_seqs(self):
+        seqs = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                name = entry.name
+                if name.endswith(".json") and name[:-5].isdigit():
+                    seqs.append(int(name[:-5]))
+        seqs.sort()
+        return seqs
+
+    def snapshot(self):
+        """Compacted state: {"seq": last folded sequence, "files": {filename: hash}}."""
+        try:
+            with open(os.path.join(self.directory, SNAPSHOT_FILENAME), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"seq": 0, "files": {}}
+
+    def head(self, seqs=None):
+        """Latest sequence number (0 for an empty journal)."""
+        seqs = self._entry_seqs() if seqs is None else seqs
+        return seqs[-1] if seqs else self.snapshot()["seq"]
+
+    def append(self, op, filename, digest=None):
+        """Record one change and return its sequence number."""
+        seqs = self._entry_seqs()
+        seq = self.head(seqs) + 1
+        record = {"op": op, "filename": filename, "hash": digest, "time": time.time()}
+        while True:
+            try:
+                self._publish(self._entry_path(seq), json.dumps({"seq": seq, **record}).encode())
+                break
+            except FileExistsError:
+                # Another client took this number first
+                seq += 1
+        if seqs and seq - seqs[0] >= COMPACT_EVERY + COMPACT_KEEP:
+            try:
+                self.compact()
+            except OSError as e:
+                print(f"[WARN] Journal compaction failed: {e}")
+        return seq
+
+    def read_entry(self, seq):
+        with open(self._entry_path(seq), "r") as f:
+            return json.load(f)
+
+    def changes_since(self, since):
+        """
+        Entries after sequence `since`. Returns (head, entries), where entries is
+        None if the journal no longer reaches back that far (or was recreated)
+        and the caller has to rescan.
+        """
+        seqs = self._entry_seqs()
+        head = self.head(seqs)
+        if since == head:
+            return head, []
+        first = seqs[0] if seqs else head + 1
+        if since > head or since < first - 1:
+            return head, None
+        entries = []
+        for seq in seqs:
+            if seq > since:
+                try:
+                    entries.append(self.read_entry(seq))
+                except (OSError, ValueError):
+                    # Compacted away under us, or still being written (exclusive-create mode)
+                    return head, None
+        return head, entries
+
+    def compact(self, keep=COMPACT_KEEP):
+        """
+        Fold all but the newest `keep` entries into the snapshot and delete them.
+        Only one client compacts at a time; the others skip.
+        """
+        lock_path = os.path.join(self.directory, LOCK_FILENAME)
+        try:
+            if time.time() - os.path.getmtime(lock_path) > STALE_LOCK_SECONDS:
+                os.remove(lock_path)
+        except OSError:
+            pass
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            return
+        try:
+            self._compact(keep)
+        finally:
+            os.remove(lock_path)
+
+    def _compact(self, keep):
+        seqs = self._entry_seqs()
+        if len(seqs) <= keep:
+            return
+        cut = seqs[-keep - 1] if keep else seqs[-1]
+        snapshot = self.snapshot()
+        if cut <= snapshot["seq"]:
+            return
+        files = dict(snapshot["files"])
+        folded = []
+        for seq in seqs:
+            if seq > cut:
+                break
+            if seq <= snapshot["seq"]:
+                folded.append(seq)
+                continue
+            entry = self.read_entry(seq)
+            if entry["op"] == OP_DELETE:
+                files.pop(entry["filename"], None)
+            else:
+                files[entry["filename"]] = entry.get("hash")
+            folded.append(seq)
+
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILENAME)
+        tmp_path = _tmp_path(self.directory)
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"seq": cut, "files": files}, f)
+            os.replace(tmp_path, snapshot_path)
+        finally:
+            _remove_quietly(tmp_path)
+        for seq in folded:
+            _remove_quietly(self._entry_path(seq))
@@ -0,0 +1,272 @@
+# backend/services/kinematics.py
+import numpy as np
+from backend.services.tracing import traced
+
+# Absolute: every segment's yaw/pitch is in the world frame and roll is ignored.
+# Chained: every segment's yaw/pitch/roll rotates the previous segment's frame.
+MODE_ABSOLUTE = "absolute"
+MODE_CHAINED = "chained"
+KINEMATICS_MODES = (MODE_ABSOLUTE, MODE_CHAINED)
+# Segments per block in chain_quaternions
+CHAIN_BLOCK = 16
+# chain_quaternions uses the log-depth matrix scan up to this many quaternions
+SCAN_MATRIX_LIMIT = 1024
+
+_warned_modes = set()
+
+
+def segments_to_arrays(segments):
+    """
+    Convert a list of segment dicts into (lengths, yaw, pitch, roll) float64 arrays.
+    """
+    n = len(segments)
+    lengths = np.fromiter((seg['shaft_length'] for seg in segments), dtype=np.float64, count=n)
+    euler = np.array([seg['euler'] for seg in segments], dtype=np.float64).reshape(n, 3)
+    return lengths, euler[:, 0].copy(), euler[:, 1].copy(), euler[:, 2].copy()
+
+
+def segment_vectors(lengths, yaw_deg, pitch_deg):
+    """
+    Compute per-segment displacement vectors from lengths and absolute yaw/pitch (degrees).
+    Works on arrays of any shape; returns an array of shape lengths.shape + (3,).
+    """
+    lengths = np.asarray(lengths, dtype=np.float64)
+    yaw = np.radians(np.asarray(yaw_deg, dtype=np.float64))
+    pitch = np.radians(np.asarray(pitch_deg, dtype=np.float64))
+
+    cos_pitch = np.cos(pitch)
+    vectors = np.empty(lengths.shape + (3,), dtype=np.float64)
+    vectors[..., 0] = lengths * cos_pitch * np.cos(yaw)
+    vectors[..., 1] = lengths * cos_pitch * np.sin(yaw)
+    vectors[..., 2] = lengths * np.sin(pitch)
+    return vectors
+
+
+def euler_quaternions(yaw_deg, pitch_deg, roll_deg):
+    """
+    Unit quaternions (w, x, y, z) of Rz(yaw) @ Ry(-pitch) @ Rx(roll) for arrays of
+    angles (degrees) of any shape; returns a (4,) + shape array. The rotated x axis
+    is the segment direction, matching segment_vectors() for the same yaw/pitch.
+    """
+    half_yaw = np.asarray(yaw_deg, dtype=np.float64) * (np.pi / 360)
+    half_pitch = np.asarray(pitch_deg, dtype=np.float64) * (-np.pi / 360)
+    half_roll = np.asarray(roll_deg, dtype=np.float64) * (np.pi / 360)
+    cy, sy = np.cos(half_yaw), np.sin(half_yaw)
+    cp, sp = np.cos(half_pitch), np.sin(half_pitch)
+    cr, sr = np.cos(half_roll), np.sin(half_roll)
+    cycp, sysp, cysp, sycp = cy * cp, sy * sp, cy * sp, sy * cp
+
+    q = np.empty((4,) + np.broadcast(cy, cp, cr).shape, dtype=np.float64)
+    q[0] = cycp * cr + sysp * sr
+    q[1] = cycp * sr - sysp * cr
+    q[2] = cysp * cr + sycp * sr
+    q[3] = sycp * cr - cysp * sr
+    return q
+
+
+def quaternion_multiply(a, b, out=None):
+    """Hamilton product of two (4, ...) quaternion arrays; `out` may alias a or b."""
+    aw, ax, ay, az = a
+    bw, bx, by, bz = b
+    w = aw * bw - ax * bx - ay * by - az * bz
+    x = aw * bx + ax * bw + ay * bz - az * by
+    y = aw * by - ax * bz + ay * bw + az * bx
+    z = aw * bz + ax * by - ay * bx + az * bw
+    if out is None:
+        return np.stack((w, x, y, z))
+    out[0], out[1], out[2], out[3] = w, x, y, z
+    return out
+
+
+# Left-multiplication matrix of (w, x, y, z): entry [i, j] is SIGNS[i, j] * q[INDEX[i, j]]
+_MATRIX_INDEX = np.array([[0, 1, 2, 3], [1, 0, 3, 2], [2, 3, 0, 1], [3, 2, 1, 0]])
+_MATRIX_SIGNS = np.array([[1, -1, -1, -1], [1, 1, -1, 1], [1, 1, 1, -1], [1, -1, 1, 1]], dtype=np.float64)
+
+
+def quaternion_matrices(q):
+    """(..., 4, 4) left-multiplication matrices of a (4, ...) quaternion array: L(a) @ b == a b."""
+    return np.moveaxis(q, 0, -1)[..., _MATRIX_INDEX] * _MATRIX_SIGNS
+
+
+def _chain_matrices(q):
+    """
+    Log-depth (Hillis-Steele) scan: after the step with shift s every entry holds
+    the product of the 2s quaternions ending at it. Each step is one matmul over
+    the whole batch, so short scans cost a handful of numpy calls; the work is
+    O(N log N), so long scans use the blocked scan instead.
+    """
+    matrices = quaternion_matrices(q)
+    n = q.shape[-1]
+    shift = 1
+    while shift < n:
+        matrices[..., shift:, :, :] = matrices[..., :-shift, :, :] @ matrices[..., shift:, :, :]
+        shift *= 2
+    return np.moveaxis(matrices[..., 0], -1, 0)
+
+
+def chain_quaternions(q):
+    """
+    Cumulative products q_0, q_0 q_1, q_0 q_1 q_2, ... along the last axis of a
+    (4, ..., N) array, so every path of a batch is chained at once.
+
+    Up to SCAN_MATRIX_LIMIT quaternions this is the log-depth matrix scan of
+    _chain_matrices. Larger inputs use a blocked scan that does linear work:
+    running products inside blocks of CHAIN_BLOCK segments (each step one
+    vectorized product over every block of every path), then the block totals
+    are chained recursively and applied to the blocks after them. Batches with
+    at least as many paths as segments are one block, stepping over the segments.
+    """
+    q = np.asarray(q, dtype=np.float64)
+    n = q.shape[-1]
+    if n <= 1:
+        return q.copy()
+    if q[0].size <= SCAN_MATRIX_LIMIT:
+        return _chain_matrices(q)
+    if n <= CHAIN_BLOCK or q[0].size >= n * n:
+        block = n
+    else:
+        block = min(CHAIN_BLOCK, int(np.ceil(np.sqrt(n))))
+    pad = -n % block
+    if pad:
+        identity = np.zeros(q.shape[:-1] + (pad,), dtype=np.float64)
+        identity[0] = 1.0
+        q = np.concatenate((q, identity), axis=-1)
+    # (4, ..., blocks, block) -> (4, block, ..., blocks): each step reads contiguous
+    # slabs. copy() always copies, so the caller's array is never written to.
+    blocks = np.moveaxis(q.reshape(q.shape[:-1] + (-1, block)), -1, 1).copy()
+
+    for i in range(1, block):
+        quaternion_multiply(blocks[:, i - 1], blocks[:, i], out=blocks[:, i])
+    if blocks.shape[-1] > 1:
+        prefix = chain_quaternions(blocks[:, -1])[..., :-1]
+        quaternion_multiply(prefix[:, None], blocks[..., 1:], out=blocks[..., 1:])
+    return np.moveaxis(blocks, 1, -1).reshape(q.shape)[..., :n]
+
+
+def chained_segment_vectors(lengths, yaw_deg, pitch_deg, roll_deg, initial=None):
+    """
+    Displacement vectors when each segment's yaw/pitch/roll is relative to the
+    previous segment's frame. `initial` is an optional (4, ...) quaternion the chain
+    starts from. Returns (vectors, last_frame_quaternion).
+    """
+    lengths = np.asarray(lengths, dtype=np.float64)
+    frames = chain_quaternions(euler_quaternions(yaw_deg, pitch_deg, roll_deg))
+    if initial is not None:
+        frames = quaternion_multiply(np.asarray(initial)[..., None], frames)
+    w, x, y, z = frames
+    vectors = np.empty(lengths.shape + (3,), dtype=np.float64)
+    vectors[..., 0] = lengths * (1.0 - 2.0 * (y * y + z * z))
+    vectors[..., 1] = lengths * 2.0 * (x * y + w * z)
+    vectors[..., 2] = lengths * 2.0 * (x * z - w * y)
+    return vectors, frames[..., -1]
+
+
+def current_mode():
+    """Kinematics mode from config.json ("kinematics_mode"): "absolute" (default) or "chained"."""
+    from backend.services.settings import settings
+    mode = settings.get("kinematics_mode") or MODE_ABSOLUTE
+    if mode not in KINEMATICS_MODES:
+        if mode not in _warned_modes:
+            print(f"[WARN] Unknown kinematics_mode {mode!r}, using {MODE_ABSOLUTE!r}")
+            _warned_modes.add(mode)
+        return MODE_ABSOLUTE
+    return mode
+
+
+def _vectors(lengths, yaw_deg, pitch_deg, roll_deg, mode):
+    if mode == MODE_CHAINED:
+        if roll_deg is None:
+            roll_deg = np.zeros_like(np.asarray(lengths, dtype=np.float64))
+        return chained_segment_vectors(lengths, yaw_deg, pitch_deg, roll_deg)[0]
+    return segment_vectors(lengths, yaw_deg, pitch_deg)
+
+
+@traced("kinematics.forward_kinematics")
+def forward_kinematics(lengths, yaw_deg, pitch_deg, roll_deg=None, mode=MODE_ABSOLUTE):
+    """
+    Compute the (N+1)x3 point array of a single path, starting at the origin.
+    In "chained" mode each segment's angles (including roll) are relative to the
+    previous segment; in "absolute" mode roll is ignored.
+    """
+    if len(lengths) == 0:
+        return np.zeros((1, 3), dtype=np.float64)
+    vectors = _vectors(lengths, yaw_deg, pitch_deg, roll_deg, mode)
+    points = np.zeros((len(vectors) + 1, 3), dtype=np.float64)
+    np.cumsum(vectors, axis=0, out=points[1:])
+    return points
+
+
+@traced("kinematics.forward_kinematics_batch")
+def forward_kinematics_batch(lengths, yaw_deg, pitch_deg, counts=None, roll_deg=None, mode=MODE_ABSOLUTE):
+    """
+    Compute points for many paths in one call (see forward_kinematics for `mode`).
+
+    Padded input: 2D arrays of shape (P, N_max) with optional `counts` giving the
+    real segment count per path. Returns a (P, N_max+1, 3) array; points past a
+    path's count repeat its end point.
+
+    Ragged input: sequences of 1D arrays. Returns a list of (N_i+1)x3 arrays.
+    """
+    if isinstance(lengths, np.ndarray) and lengths.ndim == 2:
+        lengths = lengths.astype(np.float64, copy=True)
+        if counts is not None:
+            mask = np.arange(lengths.shape[1]) >= np.asarray(counts)[:, None]
+            lengths[mask] = 0.0
+        vectors = _vectors(lengths, yaw_deg, pitch_deg, roll_deg, mode)
+        points = np.zeros((lengths.shape[0], lengths.shape[1] + 1, 3), dtype=np.float64)
+        np.cumsum(vectors, axis=1, out=points[:, 1:])
+        return points
+
+    sizes = np.array([len(l) for l in lengths], dtype=np.intp)
+    if len(sizes) == 0:
+        return []
+    if mode == MODE_CHAINED:
+        # Chains restart per path: pad to one (P, N_max) batch; zero angles pad as identity.
+        padded = []
+        for values in (lengths, yaw_deg, pitch_deg, roll_deg if roll_deg is not None else [np.zeros(n) for n in sizes]):
+            block = np.zeros((len(sizes), sizes.max()), dtype=np.float64)
+            for i, row in enumerate(values):
+                block[i, :sizes[i]] = row
+            padded.append(block)
+        points = forward_kinematics_batch(padded[0], padded[1], padded[2], roll_deg=padded[3], mode=mode)
+        return [points[i, :sizes[i] + 1] for i in range(len(sizes))]
+    flat = segment_vectors(np.concatenate(lengths), np.concatenate(yaw_deg), np.concatenate(pitch_deg))
+
+    # One cumulative sum over the whole fleet, then rebase each path at its own start.
+    totals = np.zeros((len(flat) + 1, 3), dtype=np.float64)
+    np.cumsum(flat, axis=0, out=totals[1:])
+    starts = np.concatenate(([0], np.cumsum(sizes)))
+
+    return [totals[starts[i]:starts[i + 1] + 1] - totals[starts[i]] for i in range(len(sizes))]
+
+
+def forward_kinematics_stream(blocks, mode=MODE_ABSOLUTE):
+    """
+    One-pass forward kinematics over an iterable of (4, k) or (3, k) segment blocks
+    (lengths, yaw, pitch[, roll]). Yields point blocks: first the origin, then the
+    k end points of each block. Concatenated they equal forward_kinematics().
+    """
+    position = np.zeros(3, dtype=np.float64)
+    frame = np.array([1.0, 0.0, 0.0, 0.0])
+    yield position[None, :].copy()
+    for block in blocks:
+        if block.shape[1] == 0:
+            continue
+        if mode == MODE_CHAINED:
+            roll = block[3] if len(block) > 3 else np.zeros(block.shape[1])
+            vectors, frame = chained_segment_vectors(block[0], block[1], block[2], roll, frame)
+        else:
+            vectors = segment_vectors(block[0], block[1], block[2])
+        points = np.cumsum(vectors, axis=0)
+        points += position
+        position = points[-1]
+        yield points
+
+
+def compute_segments_points(segments, mode=None):
+    """
+    Compute the (N+1)x3 point array for a list of segment dicts
+    (in the configured kinematics mode unless `mode` is given).
+    """
+    lengths, yaw, pitch, roll = segments_to_arrays(segments)
+    return forward_kinematics(lengths, yaw, pitch, roll, mode or current_mode())
@@ -0,0 +1,235 @@
+# backend/services/mirror.py
+"""
+Local read-through mirror of the shared input directory.
+
+Reads are served from a local copy. A manifest records, per file, the share's
+(mtime_ns, size) the copy was taken from and its content hash; a local file is
+trusted only while its own size/mtime still match. sync() lists the share once
+and pulls just the files whose stamp changed; writes go to the share first and
+are then copied locally. Until the mirror has been synced at least once (in
+this or an earlier session) it is not `ready` and listings should use the share.
+"""
+import os
+import json
+import hashlib
+import threading
+
+MANIFEST_FILENAME = ".pathvision_mirror"
+MANIFEST_VERSION = 1
+
+
+def content_hash(data):
+    return hashlib.sha1(data).hexdigest()
+
+
+def atomic_write(path, data, mtime_ns=None):
+    """
+    Write bytes to a temp file next to path and rename it into place. The temp
+    name is unique per process and thread, and it is removed if the write fails.
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        if mtime_ns is not None:
+            os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class PathMirror:
+    def __init__(self, shared_dir, local_dir):
+        self.shared_dir = shared_dir
+        self.local_dir = local_dir
+        os.makedirs(local_dir, exist_ok=True)
+        self._lock = threading.RLock()
+        self._manifest = self._load_manifest()
+        self._sync_thread = None
+        self._stop = threading.Event()
+        # Set once the local directory holds a complete (if possibly stale) copy
+        self.ready = threading.Event()
+        if self._manifest:
+            self.ready.set()
+
+    # Manifest
+
+    def _manifest_path(self):
+        return os.path.join(self.local_dir, MANIFEST_FILENAME)
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path(), "r") as f:
+                manifest = json.load(f)
+            if manifest.get("version") == MANIFEST_VERSION and manifest.get("shared_dir") == self.shared_dir:
+                return manifest.get("files", {})
+        except (OSError, ValueError):
+            pass
+        return {}
+
+    def _save_manifest(self):
+        data = json.dumps({"version": MANIFEST_VERSION, "shared_dir": self.shared_dir, "files": self._manifest})
+        try:
+            atomic_write(self._manifest_path(), data.encode())
+        except OSError as e:
+            print(f"[WARN] Could not save mirror manifest: {e}")
+
+    # Reads
+
+    def local_path(self, filename):
+        """Path of a valid local copy of filename, pulling it from the share if needed."""
+        with self._lock:
+            if not self._is_current(filename):
+                self._pull(filename)
+                self._save_manifest()
+        return os.path.join(self.local_dir, filename)
+
+    def _is_current(self, filename, remote_stamp=None):
+        entry = self._manifest.get(filename)
+        if entry is None or (remote_stamp is not None and tuple(entry[:2]) != remote_stamp):
+            return False
+        return self._local_unchanged(filename, entry)
+
+    def _local_unchanged(self, filename, entry):
+        """True while the local copy still has the stamp entry recorded for it."""
+        try:
+            stat = os.stat(os.path.join(self.local_dir, filename))
+        except OSError:
+            return False
+        return stat.st_mtime_ns == entry[0] and stat.st_size == entry[1]
+
+    def _pull(self, filename):
+        source = os.path.join(self.shared_dir, filename)
+        with open(source, "rb") as f:
+            stat = os.fstat(f.fileno())
+            data = f.read()
+        digest = content_hash(data)
+        entry = self._manifest.get(filename)
+        local = os.path.join(self.local_dir, filename)
+        if entry and entry[2] == digest and self._local_unchanged(filename, entry):
+            # Touched on the share but unchanged, and the local copy is intact: only restamp it
+            os.utime(local, ns=(stat.st_mtime_ns, stat.st_mtime_ns))
+        else:
+            atomic_write(local, data, stat.st_mtime_ns)
+        self._manifest[filename] = [stat.st_mtime_ns, stat.st_size, digest]
+
+    def apply_change(self, filename, digest=None):
+        """
+        Bring one file up to date after a journal entry: skipped when the local copy
+        already has `digest`, removed locally when it is gone from the share.
+        """
+        with self._lock:
+            entry = self._manifest.get(filename)
+            if digest and entry and entry[2] == digest and self._is_current(filename):
+                return
+            try:
+                self._pull(filename)
+            except FileNotFoundError:
+                self._remove_local(filename)
+            self._save_manifest()
+
+    def sync(self):
+        """
+        Bring the mirror up to date with one listing of the share.
+        Returns (pulled, removed) lists of filenames.
+        """
+        remote = {}
+        with os.scandir(self.shared_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    remote[entry.name] = (stat.st_mtime_ns, stat.st_size)
+
+        pulled, removed = [], []
+        with self._lock:
+            for filename, stamp in remote.items():
+                if self._is_current(filename, stamp):
+                    continue
+                try:
+                    self._pull(filename)
+                    pulled.append(filename)
+                except OSError as e:
+                    print(f"[WARN] Mirror could not pull {filename}: {e}")
+            for filename in [name for name in self._manifest if name not in remote]:
+                self._remove_local(filename)
+                removed.append(filename)
+            if pulled or removed or not self.ready.is_set():
+                self._save_manifest()
+        self.ready.set()
+        return pulled, removed
+
+    def verify(self):
+        """Re-hash every local copy and re-pull the ones whose content does not match."""
+        with self._lock:
+            bad = []
+            for filename, entry in list(self._manifest.items()):
+                try:
+                    with open(os.path.join(self.local_dir, filename), "rb") as f:
+                        ok = content_hash(f.read()) == entry[2]
+                except OSError:
+                    ok = False
+                if not ok:
+                    bad.append(filename)
+                    self._manifest.pop(filename)
+            for filename in bad:
+                try:
+                    self._pull(filename)
+                except OSError as e:
+                    print(f"[WARN] Mirror could not pull {filename}: {e}")
+            if bad:
+                self._save_manifest()
+        return bad
+
+    # Writes
+
+    def write(self, filename, data):
+        """Write bytes through to the share, then update the local copy."""
+        target = os.path.join(self.shared_dir, filename)
+        atomic_write(target, data)
+        stat = os.stat(target)
+        with self._lock:
+            atomic_write(os.path.join(self.local_dir, filename), data, stat.st_mtime_ns)
+            self._manifest[filename] = [stat.st_mtime_ns, stat.st_size, content_hash(data)]
+            self._save_manifest()
+
+    def delete(self, filename):
+        os.remove(os.path.join(self.shared_dir, filename))
+        with self._lock:
+            self._remove_local(filename)
+            self._save_manifest()
+
+    def _remove_local(self, filename):
+        self._manifest.pop(filename, None)
+        try:
+            os.remove(os.path.join(self.local_dir, filename))
+        except OSError:
+            pass
+
+    # Background sync
+
+    def start_sync(self, interval):
+        """Run sync() now and then every `interval` seconds on a daemon thread."""
+        if self._sync_thread is not None:
+            return
+        self._stop.clear()
+        self._sync_thread = threading.Thread(target=self._sync_loop, args=(interval,),
+                                             name="pathvision-mirror", daemon=True)
+        self._sync_thread.start()
+
+    def stop_sync(self):
+        self._stop.set()
+        self._sync_thread = None
+
+    def _sync_loop(self, interval):
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                # Nothing else watches this thread: log the failure and try again next interval
+                print(f"[WARN] Mirror sync failed: {type(e).__name__}: {e}")
+            if self._stop.wait(interval):
+                return
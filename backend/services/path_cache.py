@@ -0,0 +1,101 @@
+# backend/services/path_cache.py
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+from backend.models.steering_path import SteeringPath
+
+DEFAULT_BUDGET_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(value):
+    """Rough memory footprint of cached values, dominated by their numpy arrays."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, SteeringPath):
+        points = value._points.nbytes if value._points is not None else 0
+        return value.data.nbytes + points + 256
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class PathCache:
+    """
+    Thread-safe LRU cache for parsed paths and derived results (points, comparisons).
+    Keys must change when the underlying file does, e.g. (filename, mtime_ns, size).
+    Entries are evicted least-recently-used first once budget_bytes is exceeded.
+    """
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.used_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self.lock:
+            if key in self.entries:
+                self.used_bytes -= self.entries.pop(key)[1]
+            if size > self.budget_bytes:
+                return value
+            self.entries[key] = (value, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.used_bytes -= evicted
+                self.evictions += 1
+        return value
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for key, computing and storing it on a miss."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = self.put(key, compute())
+        return value
+
+    def set_budget(self, budget_bytes):
+        with self.lock:
+            self.budget_bytes = budget_bytes
+            while self.used_bytes > self.budget_bytes and self.entries:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.used_bytes -= evicted
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.used_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'used_bytes': self.used_bytes,
+                'budget_bytes': self.budget_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0,
+            }
+
+
+# Process-wide cache shared by the screens and background workers.
+path_cache = PathCache()
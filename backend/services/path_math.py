@@ -1,17 +1,16 @@
-import numpy as np
+from backend.services.kinematics import forward_kinematics, forward_kinematics_batch, current_mode
 
-def compute_path(shaft_lengths, yaw_angles, pitch_angles):
-    pitch_rad = np.radians(pitch_angles)
-    yaw_rad = np.radians(yaw_angles)
-    points = [(0.0, 0.0, 0.0)]
-    for i in range(len(shaft_lengths)):
-        L = shaft_lengths[i]
-        pitch = pitch_rad[i]
-        yaw = yaw_rad[i]
-        dx = L * np.cos(pitch) * np.cos(yaw)
-        dy = L * np.cos(pitch) * np.sin(yaw)
-        dz = L * np.sin(pitch)
-        last_point = points[-1]
-        new_point = (last_point[0] + dx, last_point[1] + dy, last_point[2] + dz)
-        points.append(new_point)
-    return points
+def compute_path(shaft_lengths, yaw_angles, pitch_angles, roll_angles=None, mode=None):
+    """
+    Compute the (N+1)x3 point array of a path from shaft lengths and yaw/pitch (degrees),
+    in the configured kinematics mode unless `mode` is given.
+    With mode="chained", angles (including roll) are relative to the previous segment.
+    """
+    return forward_kinematics(shaft_lengths, yaw_angles, pitch_angles, roll_angles, mode or current_mode())
+
+def compute_paths(shaft_lengths, yaw_angles, pitch_angles, counts=None, roll_angles=None, mode=None):
+    """
+    Batched compute_path for padded 2D arrays or ragged lists of arrays.
+    """
+    return forward_kinematics_batch(shaft_lengths, yaw_angles, pitch_angles, counts, roll_angles,
+                                    mode or current_mode())
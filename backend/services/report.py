@@ -0,0 +1,161 @@
+# backend/services/report.py
+import os
+import html
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from backend.services import file_handler, tracing
+from backend.services.angle_diff import cumulative_angle_differences
+from backend.services.comparator import compare_paths
+
+REPORT_FORMATS = ("html", "pdf")
+
+
+def report_basename(file1, file2):
+    return f"{os.path.splitext(file1)[0]}__vs__{os.path.splitext(file2)[0]}"
+
+
+def build_figure(path1, path2, result):
+    """3D comparison plot on a plain Agg-backed Figure (no pyplot, no GUI backend)."""
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(7, 6))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111, projection='3d')
+    ax.plot(*result['points1'].T, label=path1.vehicle_id, color="blue", marker='o', linewidth=2)
+    ax.plot(*result['points2'].T, label=path2.vehicle_id, color="orange", marker='o', linewidth=2)
+    ax.set_title("Steering Path Comparison")
+    ax.set_xlabel("X")
+    ax.set_ylabel("Y")
+    ax.set_zlabel("Z")
+    ax.legend()
+    return figure
+
+
+def write_html(out_base, path1, path2, result, angle_diffs, figure):
+    png_path = out_base + ".png"
+    figure.savefig(png_path, dpi=100)
+    rows = "\n".join(
+        f"<tr><td>{i + 1}</td><td>{yaw:.3f}</td><td>{pitch:.3f}</td><td>{roll:.3f}</td></tr>"
+        for i, (yaw, pitch, roll) in enumerate(angle_diffs.tolist())
+    )
+    title = f"{html.escape(path1.vehicle_id)} vs {html.escape(path2.vehicle_id)}"
+    with open(out_base + ".html", "w") as f:
+        f.write(f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>body{{font-family:sans-serif}} td,th{{padding:2px 10px;text-align:right}}</style>
+</head><body>
+<h1>{title}</h1>
+<p>Average Deviation: {result['avg_deviation']:.3f} units<br>
+Maximum Deviation: {result['max_deviation']:.3f} units</p>
+<img src="{html.escape(os.path.basename(png_path))}" alt="Path comparison">
+<h2>Per-segment angle differences</h2>
+<table><tr><th>Segment</th><th>Yaw</th><th>Pitch</th><th>Roll</th></tr>
+{rows}
+</table>
+</body></html>
+""")
+    return out_base + ".html"
+
+
+def write_pdf(out_base, path1, path2, result, angle_diffs, figure):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    pdf_path = out_base + ".pdf"
+    with PdfPages(pdf_path) as pdf:
+        pdf.savefig(figure)
+        page = Figure(figsize=(8.27, 11.69))
+        lines = [
+            f"{path1.vehicle_id} vs {path2.vehicle_id}",
+            f"Average Deviation: {result['avg_deviation']:.3f} units",
+            f"Maximum Deviation: {result['max_deviation']:.3f} units",
+            "",
+            f"{'Segment':>8} {'Yaw':>10} {'Pitch':>10} {'Roll':>10}",
+        ] + [
+            f"{i + 1:>8} {yaw:>10.3f} {pitch:>10.3f} {roll:>10.3f}"
+            for i, (yaw, pitch, roll) in enumerate(angle_diffs.tolist())
+        ]
+        page.text(0.05, 0.95, "\n".join(lines), va="top", family="monospace", fontsize=9)
+        pdf.savefig(page)
+    return pdf_path
+
+
+def render_report(file1, file2, output_dir, fmt="html"):
+    """
+    Compare two stored paths and write one report (HTML+PNG or PDF).
+    Returns a summary dict with the deviation metrics and the written file.
+    """
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    path1 = file_handler.load_steering_path(file1)
+    path2 = file_handler.load_steering_path(file2)
+    result = compare_paths(path1, path2)
+    angle_diffs = cumulative_angle_differences(path1.euler, path2.euler)
+    figure = build_figure(path1, path2, result)
+
+    os.makedirs(output_dir, exist_ok=True)
+    out_base = os.path.join(output_dir, report_basename(file1, file2))
+    writer = write_html if fmt == "html" else write_pdf
+    report_path = writer(out_base, path1, path2, result, angle_diffs, figure)
+    return {
+        'file1': file1,
+        'file2': file2,
+        'avg_deviation': result['avg_deviation'],
+        'max_deviation': result['max_deviation'],
+        'report': report_path,
+    }
+
+
+def _init_worker(overrides):
+    tracing.init_worker()
+    file_handler.set_config_overrides(**overrides)
+
+
+def _render_safe(file1, file2, output_dir, fmt):
+    try:
+        return render_report(file1, file2, output_dir, fmt)
+    except Exception as e:
+        return {'file1': file1, 'file2': file2, 'error': str(e)}
+
+
+def generate_reports(pairs, output_dir, fmt="html", jobs=None, progress=None, should_stop=None):
+    """
+    Render reports for many (file1, file2) pairs in worker processes.
+
+    At most `jobs` reports are in flight at once. progress(done, total, summary)
+    is called after each report; should_stop() is polled to cancel the batch.
+    Returns the list of per-report summaries.
+    """
+    pairs = list(pairs)
+    jobs = max(1, jobs or min(4, os.cpu_count() or 1))
+    results = []
+    pending = set()
+    queue = iter(pairs)
+
+    # Spawned (not forked) workers: the GUI process has live Qt and pool threads.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=_init_worker,
+                             initargs=(file_handler.get_config_overrides(),)) as pool:
+        def top_up():
+            while len(pending) < jobs:
+                pair = next(queue, None)
+                if pair is None:
+                    return
+                pending.add(pool.submit(_render_safe, pair[0], pair[1], output_dir, fmt))
+
+        top_up()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                summary = future.result()
+                results.append(summary)
+                if progress:
+                    progress(len(results), len(pairs), summary)
+            if should_stop and should_stop():
+                for future in pending:
+                    future.cancel()
+                break
+            top_up()
+    return results
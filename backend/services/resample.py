@@ -0,0 +1,32 @@
+# backend/services/resample.py
+import numpy as np
+
+
+def cumulative_lengths(points):
+    """Arc length at every vertex of an (N, 3) polyline, starting at 0."""
+    points = np.asarray(points, dtype=np.float64)
+    lengths = np.zeros(len(points), dtype=np.float64)
+    if len(points) > 1:
+        np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1), out=lengths[1:])
+    return lengths
+
+
+def sample_at(points, cumulative, distances):
+    """
+    Interpolate polyline points at the given arc-length distances.
+    Uses one searchsorted over the cumulative lengths; no per-point loop.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    distances = np.clip(distances, 0.0, cumulative[-1])
+    idx = np.clip(np.searchsorted(cumulative, distances, side="right") - 1, 0, max(len(points) - 2, 0))
+    if len(points) < 2:
+        return np.repeat(points[:1], len(distances), axis=0)
+    seg_len = cumulative[idx + 1] - cumulative[idx]
+    t = np.divide(distances - cumulative[idx], seg_len, out=np.zeros_like(distances), where=seg_len > 0)
+    return points[idx] + t[:, None] * (points[idx + 1] - points[idx])
+
+
+def resample_count(points, count):
+    """Resample a polyline to `count` points evenly spaced along its arc length."""
+    cumulative = cumulative_lengths(points)
+    return sample_at(points, cumulative, np.linspace(0.0, cumulative[-1], count))
@@ -0,0 +1,196 @@
+# backend/services/search.py
+
+import re
+from bisect import bisect_left, bisect_right
+from backend.models.steering_path import parse_vehicle_id
+
+RANGE_PATTERN = re.compile(r"^\s*(\d*)\s*(?:-\s*(\d*))?\s*$")
+# Freed item slots are reclaimed once there are this many and they outnumber live items
+COMPACT_MIN_FREE = 64
+
+
+def normalize_base(text):
+    """Lowercase and drop '|', '_' and spaces so 'GMC|2500|Gen4' matches 'GMC2500Gen4'."""
+    return re.sub(r"[|_\s]", "", (text or "").lower())
+
+
+def parse_range(text):
+    """
+    Parse a search field into None (any), an int, or an inclusive (lo, hi) tuple.
+    Accepts '', '*', 'any', '3', '2-5', '2-' and '-5'.
+    """
+    text = (text or "").strip().lower()
+    if text in ("", "*", "any"):
+        return None
+    match = RANGE_PATTERN.match(text)
+    if not match:
+        raise ValueError(f"Invalid range: {text!r}")
+    lo, hi = match.group(1), match.group(2)
+    if "-" not in text:
+        return int(lo)
+    return (int(lo) if lo else None, int(hi) if hi else None)
+
+
+class SortedKeyIndex:
+    """Maps int keys to id sets; answers exact and range lookups with bisect."""
+
+    def __init__(self):
+        self.buckets = {}
+        self.keys = []
+
+    def add(self, key, item_id):
+        if key is None:
+            return
+        if key not in self.buckets:
+            self.buckets[key] = set()
+            self.keys.insert(bisect_left(self.keys, key), key)
+        self.buckets[key].add(item_id)
+
+    def remove(self, key, item_id):
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            return
+        bucket.discard(item_id)
+        if not bucket:
+            del self.buckets[key]
+            del self.keys[bisect_left(self.keys, key)]
+
+    def lookup(self, query):
+        if isinstance(query, tuple):
+            lo, hi = query
+            start = 0 if lo is None else bisect_left(self.keys, lo)
+            stop = len(self.keys) if hi is None else bisect_right(self.keys, hi)
+            result = set()
+            for key in self.keys[start:stop]:
+                result |= self.buckets[key]
+            return result
+        return set(self.buckets.get(query, ()))
+
+
+class PrefixTrie:
+    """Character trie over normalized vehicle bases; each node keeps the ids below it."""
+
+    def __init__(self):
+        self.root = {"ids": set(), "children": {}}
+
+    def add(self, text, item_id):
+        node = self.root
+        node["ids"].add(item_id)
+        for char in text:
+            node = node["children"].setdefault(char, {"ids": set(), "children": {}})
+            node["ids"].add(item_id)
+
+    def remove(self, text, item_id):
+        node = self.root
+        node["ids"].discard(item_id)
+        trail = []
+        for char in text:
+            child = node["children"].get(char)
+            if child is None:
+                break
+            child["ids"].discard(item_id)
+            trail.append((node, char, child))
+            node = child
+        # Drop nodes no item passes through any more, deepest first
+        for parent, char, child in reversed(trail):
+            if child["ids"] or child["children"]:
+                break
+            del parent["children"][char]
+
+    def lookup(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node["children"].get(char)
+            if node is None:
+                return set()
+        return node["ids"]
+
+
+class VehicleSearchIndex:
+    """
+    Search index over parsed vehicle IDs, shared by the path list screens.
+    Items are (key, vehicle_id) pairs; search() returns matching keys in insertion order.
+    """
+
+    def __init__(self, items=()):
+        self._reset()
+        for key, vehicle_id in items:
+            self.add(key, vehicle_id)
+
+    def _reset(self):
+        self.keys = []
+        self.ids = {}
+        self.fields = []
+        self.free = 0
+        self.base_trie = PrefixTrie()
+        self.attempts = SortedKeyIndex()
+        self.revisions = SortedKeyIndex()
+        self.jobs = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, key, vehicle_id):
+        if key in self.ids:
+            self.remove(key)
+        self._insert(key, parse_vehicle_id(vehicle_id))
+
+    def _insert(self, key, fields):
+        item_id = len(self.keys)
+        self.keys.append(key)
+        self.ids[key] = item_id
+        self.fields.append(fields)
+        self.base_trie.add(normalize_base(fields['base']), item_id)
+        self.attempts.add(fields['attempt'], item_id)
+        self.revisions.add(fields['revision'], item_id)
+        if fields['job']:
+            self.jobs.setdefault(fields['job'].lower(), set()).add(item_id)
+
+    def remove(self, key):
+        item_id = self.ids.pop(key, None)
+        if item_id is None:
+            return
+        fields = self.fields[item_id]
+        self.base_trie.remove(normalize_base(fields['base']), item_id)
+        self.attempts.remove(fields['attempt'], item_id)
+        self.revisions.remove(fields['revision'], item_id)
+        if fields['job']:
+            job = fields['job'].lower()
+            bucket = self.jobs.get(job)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self.jobs[job]
+        self.keys[item_id] = None
+        self.fields[item_id] = None
+        self.free += 1
+        if self.free >= COMPACT_MIN_FREE and self.free > len(self.ids):
+            self._compact()
+
+    def _compact(self):
+        """Renumber the live items, keeping their order, so removed slots are reclaimed."""
+        live = [(key, fields) for key, fields in zip(self.keys, self.fields) if fields is not None]
+        self._reset()
+        for key, fields in live:
+            self._insert(key, fields)
+
+    def search(self, text="", attempt=None, revision=None, job=None):
+        """
+        Match a brand/model/gen prefix plus optional attempt, revision and job.
+        attempt and revision take None (any), an int, or an inclusive (lo, hi) tuple.
+        """
+        candidates = [self.base_trie.lookup(normalize_base(text))]
+        if attempt is not None:
+            candidates.append(self.attempts.lookup(attempt))
+        if revision is not None:
+            candidates.append(self.revisions.lookup(revision))
+        if job:
+            candidates.append(self.jobs.get(job.strip().lower(), set()))
+
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for other in candidates[1:]:
+            result &= other
+            if not result:
+                break
+        return [self.keys[i] for i in sorted(result)]
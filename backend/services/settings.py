@@ -0,0 +1,104 @@
+# backend/services/settings.py
+"""
+Process-wide view of config.json. The file is parsed once and re-read only when
+its mtime or size changes (checked at most every CHECK_INTERVAL seconds), so
+hot paths can ask for settings on every call without touching the disk.
+"""
+import os
+import sys
+import json
+import time
+import threading
+
+CHECK_INTERVAL = 1.0
+
+
+def get_config_path():
+    if getattr(sys, 'frozen', False):
+        # Running from PyInstaller bundle
+        exe_dir = os.path.dirname(sys.executable)
+    else:
+        # Running from source
+        exe_dir = os.path.dirname(os.path.abspath(__file__))
+
+    return os.path.join(exe_dir, "config.json")
+
+
+class Settings:
+    def __init__(self, config_path):
+        self.config_path = config_path
+        self.version = 0
+        self._overrides = {}
+        self._file_config = None
+        self._config = None
+        self._stamp = None
+        self._checked_at = None
+        self._reported_missing = False
+        self._created_dirs = set()
+        self._lock = threading.Lock()
+
+    def set_overrides(self, **overrides):
+        """Override config.json values for this process, e.g. from command-line flags."""
+        with self._lock:
+            self._overrides.update({k: v for k, v in overrides.items() if v is not None})
+            self._rebuild()
+
+    def overrides(self):
+        return dict(self._overrides)
+
+    def config(self):
+        """Merged config dict, or None if there is no config.json and no overrides."""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= CHECK_INTERVAL:
+            with self._lock:
+                self._checked_at = now
+                self._reload_if_changed()
+        return self._config
+
+    def get(self, key, default=None):
+        return (self.config() or {}).get(key, default)
+
+    def input_dir(self):
+        """The shared input directory, created the first time it is resolved."""
+        path = self.get("shared_input_path")
+        if not path:
+            raise Exception("Shared input path not found in config.json")
+        if path not in self._created_dirs:
+            os.makedirs(path, exist_ok=True)
+            self._created_dirs.add(path)
+        return path
+
+    def reload(self):
+        """Force a re-read of config.json on the next access."""
+        self._checked_at = None
+
+    def _reload_if_changed(self):
+        try:
+            stat = os.stat(self.config_path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stamp = None
+        if stamp == self._stamp and self.version:
+            return
+        self._stamp = stamp
+        self._file_config = None
+        if stamp is not None:
+            try:
+                with open(self.config_path, "r") as f:
+                    self._file_config = json.load(f)
+            except Exception as e:
+                print(f"[ERROR] Failed to read config.json: {e}")
+        elif not self._overrides and not self._reported_missing:
+            print(f"[ERROR] config.json not found at {self.config_path}")
+            self._reported_missing = True
+        self._rebuild()
+
+    def _rebuild(self):
+        if self._overrides:
+            self._config = {**(self._file_config or {}), **self._overrides}
+        else:
+            self._config = self._file_config
+        self.version += 1
+
+
+settings = Settings(get_config_path())
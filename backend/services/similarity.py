@@ -0,0 +1,126 @@
+# backend/services/similarity.py
+import numpy as np
+from backend.services.comparator import vertex_deviation
+from backend.services.deviation_matrix import as_points
+from backend.services.kinematics import current_mode
+from backend.services.resample import resample_count
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is optional; fall back to exact brute-force search
+    cKDTree = None
+
+DEFAULT_SAMPLES = 16
+
+
+def path_features(points, samples=DEFAULT_SAMPLES):
+    """Fixed-length feature vector: `samples` arc-length resampled points, flattened."""
+    return resample_count(points, samples).ravel()
+
+
+class SimilarityIndex:
+    """
+    Top-k similar-path search. Each path becomes a resampled feature vector
+    kept in a KD-tree (scipy) or a dense matrix (fallback). Candidates are
+    re-ranked with the exact compare_paths vertex deviation.
+
+    New paths go to a small pending buffer that is searched brute force; the
+    tree is rebuilt once the buffer grows past rebuild_fraction of the index.
+    Adding a key again replaces its path: the old slot is skipped by queries
+    and dropped at the next rebuild.
+
+    Points are computed once in the kinematics mode the index was built for;
+    an index whose mode is no longer the configured one is stale and has to be
+    rebuilt by its owner.
+    """
+
+    def __init__(self, samples=DEFAULT_SAMPLES, rebuild_fraction=0.1, mode=None):
+        self.samples = samples
+        self.rebuild_fraction = rebuild_fraction
+        self.mode = mode or current_mode()
+        # Slot -> key and points; None once the key was added again
+        self.keys = []
+        self.points = []
+        self.slots = {}
+        self.replaced = 0
+        self.features = np.empty((0, samples * 3), dtype=np.float64)
+        self.tree = None
+        self.tree_size = 0
+        self.pending = []
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __contains__(self, key):
+        return key in self.slots
+
+    @property
+    def stale(self):
+        return self.mode != current_mode()
+
+    def add(self, key, path):
+        points = as_points(path, self.mode)
+        old = self.slots.get(key)
+        if old is not None:
+            self.keys[old] = None
+            self.points[old] = None
+            self.replaced += 1
+        self.slots[key] = len(self.keys)
+        self.keys.append(key)
+        self.points.append(points)
+        self.pending.append(path_features(points, self.samples))
+        if len(self.pending) + self.replaced > max(32, self.rebuild_fraction * self.tree_size):
+            self.rebuild()
+
+    def add_many(self, items):
+        for key, path in items:
+            self.add(key, path)
+
+    def rebuild(self):
+        if self.pending:
+            self.features = np.vstack([self.features, np.array(self.pending)])
+            self.pending = []
+        if self.replaced:
+            live = [i for i, key in enumerate(self.keys) if key is not None]
+            self.features = self.features[live]
+            self.keys = [self.keys[i] for i in live]
+            self.points = [self.points[i] for i in live]
+            self.slots = {key: i for i, key in enumerate(self.keys)}
+            self.replaced = 0
+        self.tree_size = len(self.features)
+        if cKDTree is not None and self.tree_size:
+            self.tree = cKDTree(self.features)
+
+    def _nearest(self, feature, count):
+        """Indices of the `count` nearest feature vectors, tree plus pending buffer."""
+        candidates = []
+        if self.tree_size:
+            if self.tree is not None:
+                _, idx = self.tree.query(feature, k=min(count, self.tree_size))
+                candidates.extend(np.atleast_1d(idx).tolist())
+            else:
+                dist = np.linalg.norm(self.features - feature, axis=1)
+                take = min(count, self.tree_size)
+                candidates.extend(np.argpartition(dist, take - 1)[:take].tolist())
+        if self.pending:
+            dist = np.linalg.norm(np.array(self.pending) - feature, axis=1)
+            take = min(count, len(self.pending))
+            candidates.extend((self.tree_size + np.argpartition(dist, take - 1)[:take]).tolist())
+        return candidates
+
+    def query(self, path, k=5, oversample=4, exclude=None):
+        """
+        Return the k most similar stored paths as [(key, avg_deviation, max_deviation)],
+        sorted by exact average deviation.
+        """
+        points = as_points(path, self.mode)
+        feature = path_features(points, self.samples)
+        ranked = []
+        count = k * oversample + self.replaced + (1 if exclude is not None else 0)
+        for i in self._nearest(feature, count):
+            if self.keys[i] is None or self.keys[i] == exclude:
+                continue
+            avg_dev, max_dev, _ = vertex_deviation(points, self.points[i])
+            ranked.append((self.keys[i], avg_dev, max_dev))
+        ranked.sort(key=lambda r: r[1])
+        return ranked[:k]
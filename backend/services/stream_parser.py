@@ -0,0 +1,254 @@
+# backend/services/stream_parser.py
+"""
+Incremental reader for path JSON files.
+
+The "segments" array is read in byte chunks and converted straight into
+float64 blocks; no per-segment dicts are built for files in the usual
+{"shaft_length": x, "euler": [yaw, pitch, roll]} layout. Every run of segments
+is checked against that layout with a full-match regex before its numbers are
+converted, and the rest of the document is validated with json once the
+array has been read. On any doubt (other keys or key order, nested values,
+NaN, a segments key that is not top-level) the file is read with json.load
+instead, so the result is always what json would have produced and invalid
+files are rejected.
+"""
+import os
+import re
+import json
+import warnings
+import numpy as np
+from backend.models.steering_path import SteeringPath
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# A segment in the usual layout is never longer than this, whitespace included;
+# an unmatched stretch this long means the file has some other layout
+MAX_SEGMENT_BYTES = 4096
+# Segments per block when falling back to json
+FALLBACK_BLOCK = 4096
+
+# JSON number and segment grammar; possessive quantifiers keep the match linear
+_NUMBER = rb'-?+(?:0|[1-9][0-9]*+)(?:\.[0-9]++)?+(?:[eE][+-]?+[0-9]++)?+'
+_SEGMENT = (rb'\{\s*+"shaft_length"\s*+:\s*+' + _NUMBER + rb'\s*+,\s*+"euler"\s*+:\s*+\[\s*+'
+            + _NUMBER + rb'\s*+,\s*+' + _NUMBER + rb'\s*+,\s*+' + _NUMBER + rb'\s*+\]\s*+\}')
+# Complete segments at the start of the array, and after one already read
+FIRST_SEGMENTS = re.compile(rb'\s*+' + _SEGMENT + rb'(?:\s*+,\s*+' + _SEGMENT + rb')*+')
+NEXT_SEGMENTS = re.compile(rb'(?:\s*+,\s*+' + _SEGMENT + rb')++')
+SEGMENTS_KEY = re.compile(rb'"segments"\s*:\s*\[')
+ARRAY_END = re.compile(rb'\s*\]')
+# Blanks out everything but number characters once the key names are removed
+NUMBER_CHARS = bytes(c if c in b"0123456789.-+eE" else 0x20 for c in range(256))
+
+
+class _NotStreamable(Exception):
+    """The file is not in the layout the fast path handles; read it with json."""
+
+
+class _SegmentsReplaced(ValueError):
+    """A later top-level "segments" key replaces the array already read (json keeps the last one)."""
+
+
+def parse_segment_text(text):
+    """
+    Convert the bytes of complete segment objects in the usual layout
+    (b'{...}, {...}', as matched by FIRST_SEGMENTS/NEXT_SEGMENTS) into a (4, k) block.
+    """
+    count = text.count(b'{')
+    numbers = text.replace(b'"shaft_length"', b'').replace(b'"euler"', b'').translate(NUMBER_CHARS)
+    with warnings.catch_warnings():
+        # Older numpy warns on trailing separators
+        warnings.simplefilter("ignore", DeprecationWarning)
+        values = np.fromstring(numbers, sep=' ')
+    if len(values) != 4 * count:
+        raise _NotStreamable()
+    return values.reshape(count, 4).T.copy()
+
+
+def segments_block(segments):
+    """(4, k) block from a list of segment dicts."""
+    block = np.empty((4, len(segments)), dtype=np.float64)
+    block[0] = [seg['shaft_length'] for seg in segments]
+    block[1:] = np.array([seg['euler'] for seg in segments], dtype=np.float64).reshape(-1, 3).T
+    return block
+
+
+def _parse(f, state, chunk_size, convert=True):
+    """
+    Yield (4, k) segment blocks (or with convert=False, segment counts) from a file
+    opened in binary mode. Once the whole file has been read and validated,
+    state['vehicle'] holds the top-level vehicle field (None if absent).
+    Raises _NotStreamable when the file has to be read with json instead.
+    """
+    buf = b""
+    pos = 0
+    eof = False
+
+    def read_more():
+        nonlocal buf, pos, eof
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    # Header: everything before the segments array. It must close into an object
+    # on its own, so the matched key is a top-level one and not nested or quoted.
+    while True:
+        match = SEGMENTS_KEY.search(buf)
+        if match:
+            header = buf[:match.start()]
+            pos = match.end()
+            break
+        if eof:
+            raise _NotStreamable()
+        read_more()
+    try:
+        document = json.loads(header + b'"segments": []}')
+    except ValueError:
+        raise _NotStreamable()
+    if not isinstance(document, dict) or document.get("segments") != []:
+        raise _NotStreamable()
+
+    # Segments: convert every run of complete segments, then read on
+    pattern = FIRST_SEGMENTS
+    while True:
+        run = pattern.match(buf, pos)
+        if run:
+            if convert:
+                yield parse_segment_text(buf[pos:run.end()])
+            else:
+                yield buf.count(b'{', pos, run.end())
+            pos = run.end()
+            pattern = NEXT_SEGMENTS
+        end = ARRAY_END.match(buf, pos)
+        if end:
+            pos = end.end()
+            break
+        if eof or len(buf) - pos > MAX_SEGMENT_BYTES:
+            raise _NotStreamable()
+        read_more()
+
+    # Trailer: the rest of the document, which may hold the vehicle field
+    trailer = [buf[pos:]]
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        trailer.append(chunk)
+    try:
+        document = json.loads(header + b'"segments": []' + b"".join(trailer))
+    except ValueError:
+        raise _NotStreamable()
+    if not isinstance(document, dict):
+        raise _NotStreamable()
+    if document.get("segments") != []:
+        raise _SegmentsReplaced(f"{f.name}: more than one top-level segments array")
+    state['vehicle'] = document.get("vehicle")
+
+
+def _blocks(filepath, state, chunk_size, convert=True, fast=True):
+    """
+    _parse with the json fallback: yields the segments not yet yielded by the fast
+    path. Raises _SegmentsReplaced when blocks of an array json would discard were
+    already yielded; callers that buffer can read again with fast=False.
+    """
+    done = 0
+    if fast:
+        try:
+            with open(filepath, "rb") as f:
+                for block in _parse(f, state, chunk_size, convert):
+                    done += block.shape[1] if convert else block
+                    yield block
+            return
+        except _NotStreamable:
+            pass
+        except _SegmentsReplaced:
+            if done:
+                raise
+    with open(filepath, "rb") as f:
+        document = json.load(f)
+    if not isinstance(document, dict):
+        raise ValueError(f"{filepath} is not a path document")
+    state['vehicle'] = document.get("vehicle")
+    if not convert:
+        return
+    segments = document.get("segments", [])
+    for start in range(done, len(segments), FALLBACK_BLOCK):
+        yield segments_block(segments[start:start + FALLBACK_BLOCK])
+
+
+def iter_segment_blocks(filepath, chunk_size=DEFAULT_CHUNK_SIZE, state=None):
+    """
+    Generator over (4, k) float64 blocks (lengths, yaw, pitch, roll) of a path file,
+    in order. Memory stays bounded by the chunk size for files in the usual layout.
+    Once the generator is exhausted, state['vehicle'] (if a dict is passed) holds
+    the vehicle field. Raises ValueError if the file is not valid JSON, or when a
+    second top-level "segments" array turns up after the first one was already yielded.
+    """
+    yield from _blocks(filepath, {} if state is None else state, chunk_size)
+
+
+def read_path_arrays(filepath, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Read a path file into one (4, N) float64 block. Returns (vehicle_id, block).
+    The block is preallocated from the segment density of the first chunk and
+    grown if that estimate was short.
+    """
+    try:
+        return _read_path_arrays(filepath, chunk_size, fast=True)
+    except _SegmentsReplaced:
+        return _read_path_arrays(filepath, chunk_size, fast=False)
+
+
+def _read_path_arrays(filepath, chunk_size, fast):
+    size = os.path.getsize(filepath)
+    data = None
+    count = 0
+    state = {}
+    for block in _blocks(filepath, state, chunk_size, fast=fast):
+        k = block.shape[1]
+        if data is None:
+            # Bytes per segment in the first chunk, plus some slack
+            estimate = size * k // max(1, min(size, chunk_size)) if k else 0
+            data = np.empty((4, max(16, estimate + estimate // 16 + 16)), dtype=np.float64)
+        if count + k > data.shape[1]:
+            grown = np.empty((4, max(data.shape[1] * 3 // 2, count + k)), dtype=np.float64)
+            grown[:, :count] = data[:, :count]
+            data = grown
+        data[:, count:count + k] = block
+        count += k
+    if data is None:
+        data = np.empty((4, 0), dtype=np.float64)
+    elif count < data.shape[1] * 3 // 4:
+        data = data[:, :count].copy()
+    else:
+        data = data[:, :count]
+    return state.get('vehicle') or "", data
+
+
+def load_steering_path(filepath, chunk_size=DEFAULT_CHUNK_SIZE):
+    vehicle_id, data = read_path_arrays(filepath, chunk_size)
+    return SteeringPath.from_array(vehicle_id, data)
+
+
+def read_vehicle(filepath, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Vehicle ID of a path file, or None if it has none or is not valid JSON.
+    The whole file is validated, but segment numbers are not converted.
+    """
+    state = {}
+    try:
+        try:
+            for _ in _blocks(filepath, state, chunk_size, convert=False):
+                pass
+        except _SegmentsReplaced:
+            for _ in _blocks(filepath, state, chunk_size, convert=False, fast=False):
+                pass
+    except (OSError, ValueError):
+        return None
+    vehicle = state.get('vehicle')
+    return vehicle if isinstance(vehicle, str) else None
+
+
+def stream_points(filepath, chunk_size=DEFAULT_CHUNK_SIZE, mode=None, state=None):
+    """One-pass point blocks of a path file (the first block is the origin); state as for iter_segment_blocks."""
+    from backend.services.kinematics import forward_kinematics_stream, current_mode
+    return forward_kinematics_stream(iter_segment_blocks(filepath, chunk_size, state), mode or current_mode())
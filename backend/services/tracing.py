@@ -0,0 +1,196 @@
+# backend/services/tracing.py
+"""
+Lightweight span tracing for hot paths.
+
+Disabled by default: span() then returns a shared no-op context manager and
+@traced functions cost one flag check per call. Enable with the
+PATHVISION_TRACE=<file> environment variable or enable(<file>); spans are then
+written as a Chrome trace (chrome://tracing, Perfetto) and a rolling latency
+summary per operation is kept in memory. Only the newest MAX_EVENTS spans are
+kept for the trace file, so long GUI sessions do not grow without bound.
+
+Pool workers call init_worker() from their initializer so each writes its
+own <file>.<pid>.json: forked workers inherit the parent's state, and pool
+workers exit through os._exit, so atexit handlers never run in them.
+"""
+import os
+import sys
+import json
+import time
+import atexit
+import threading
+import multiprocessing
+import multiprocessing.util
+from collections import deque
+from functools import wraps
+
+ROLLING_WINDOW = 200
+MAX_EVENTS = 200_000
+
+_enabled = False
+_trace_path = None
+_events = deque(maxlen=MAX_EVENTS)
+_latencies = {}
+_lock = threading.Lock()
+_pid = os.getpid()
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter(), self.args)
+        return False
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(trace_path=None):
+    """Start recording spans; they are written to trace_path on flush() and at exit."""
+    global _enabled, _trace_path
+    _trace_path = trace_path or _trace_path
+    _enabled = True
+
+
+def worker_trace_path(trace_path, pid):
+    root, ext = os.path.splitext(trace_path)
+    return f"{root}.{pid}{ext or '.json'}"
+
+
+def init_worker():
+    """
+    Set up tracing in a pool worker process when PATHVISION_TRACE is set: a
+    trace file of its own, no spans inherited from the parent, and a flush when
+    the worker shuts down.
+    """
+    global _pid
+    trace_path = os.environ.get("PATHVISION_TRACE")
+    if not trace_path:
+        return
+    _pid = os.getpid()
+    with _lock:
+        _events.clear()
+        _latencies.clear()
+    enable(worker_trace_path(trace_path, _pid))
+    multiprocessing.util.Finalize(None, flush, exitpriority=10)
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def span(name, **args):
+    """Context manager timing a block as one span named `name`."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """Decorator recording every call of the function as a span."""
+    def decorator(fn):
+        span_name = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(span_name, start, time.perf_counter(), None)
+        return wrapper
+    return decorator
+
+
+def record(name, start, end, args=None):
+    event = {
+        "name": name,
+        "ph": "X",
+        "ts": start * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": _pid,
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = {k: str(v) for k, v in args.items()}
+    with _lock:
+        if _trace_path:
+            _events.append(event)
+        _latencies.setdefault(name, deque(maxlen=ROLLING_WINDOW)).append(end - start)
+
+
+def summary():
+    """Rolling latency stats per operation over the last ROLLING_WINDOW calls (seconds)."""
+    with _lock:
+        snapshot = {name: list(values) for name, values in _latencies.items()}
+    stats = {}
+    for name, values in snapshot.items():
+        values.sort()
+        stats[name] = {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": values[len(values) // 2],
+            "p95": values[min(len(values) - 1, int(len(values) * 0.95))],
+            "max": values[-1],
+        }
+    return stats
+
+
+def format_summary():
+    lines = [f"{'operation':<40} {'n':>5} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+    for name, s in sorted(summary().items(), key=lambda item: -item[1]["mean"]):
+        lines.append(f"{name:<40} {s['count']:>5} {s['mean'] * 1e3:>9.2f} {s['p50'] * 1e3:>9.2f} "
+                     f"{s['p95'] * 1e3:>9.2f} {s['max'] * 1e3:>9.2f}")
+    return "\n".join(lines)
+
+
+def flush():
+    """Write all recorded spans to the trace file as Chrome trace JSON."""
+    if not _trace_path:
+        return
+    with _lock:
+        events = list(_events)
+    with open(_trace_path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def _at_exit():
+    if _enabled and _latencies:
+        flush()
+        print(format_summary(), file=sys.stderr)
+
+
+atexit.register(_at_exit)
+
+if os.environ.get("PATHVISION_TRACE"):
+    if multiprocessing.parent_process() is not None:
+        # Spawned worker importing the module fresh
+        init_worker()
+    else:
+        enable(os.environ["PATHVISION_TRACE"])
@@ -0,0 +1,186 @@
+"""
+Reproducible PathVision benchmarks on synthetic data.
+
+    python -m benchmarks.run                       # quick sizes
+    python -m benchmarks.run --full                # up to 1M segments / 100k files
+    python -m benchmarks.run --output new.json --baseline old.json
+
+Each result is the best of several repeats (seconds per call). With --baseline,
+any case slower than baseline * --threshold is reported as a regression and
+the exit code is 1.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+
+import numpy as np
+
+from backend.services import file_handler
+from backend.services.angle_diff import compute_cumulative_angle_differences
+from backend.services.comparator import compare_paths, compute_path_points
+from backend.services.kinematics import MODE_ABSOLUTE, MODE_CHAINED
+from backend.services.path_math import compute_path
+from benchmarks.synthetic import random_segments, perturbed_segments, write_path_directory
+
+QUICK_SEGMENTS = [5, 100, 10_000]
+FULL_SEGMENTS = [5, 100, 10_000, 100_000, 1_000_000]
+QUICK_FILES = [10, 1_000]
+FULL_FILES = [10, 1_000, 10_000, 100_000]
+DEFAULT_THRESHOLD = 1.25
+
+
+def best_time(fn, repeats=5, min_time=0.2):
+    """Best per-call time over `repeats` rounds, each looping until min_time has passed."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10
+    timings = [elapsed / number]
+    for _ in range(repeats - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+def bench_kinematics(results, sizes, repeats):
+    for n in sizes:
+        segments = random_segments(n)
+        other = perturbed_segments(segments)
+        lengths = np.array([s["shaft_length"] for s in segments])
+        yaw = np.array([s["euler"][0] for s in segments])
+        pitch = np.array([s["euler"][1] for s in segments])
+        roll = np.array([s["euler"][2] for s in segments])
+
+        results[f"compute_path/{n}"] = best_time(
+            lambda: compute_path(lengths, yaw, pitch, mode=MODE_ABSOLUTE), repeats)
+        results[f"compute_path_chained/{n}"] = best_time(
+            lambda: compute_path(lengths, yaw, pitch, roll, mode=MODE_CHAINED), repeats)
+        results[f"compute_path_points/{n}"] = best_time(lambda: compute_path_points(segments), repeats)
+        results[f"compare_paths/{n}"] = best_time(lambda: compare_paths(segments, other), repeats)
+        results[f"compute_cumulative_angle_differences/{n}"] = best_time(
+            lambda: compute_cumulative_angle_differences(segments, other), repeats)
+        print(f"[BENCH] kinematics/comparison n={n} done", file=sys.stderr)
+
+
+def bench_catalog(results, sizes, repeats, work_dir):
+    for count in sizes:
+        directory = os.path.join(work_dir, f"files_{count}")
+        write_path_directory(directory, count)
+        file_handler.set_config_overrides(shared_input_path=directory)
+
+        def cold():
+            index_path = os.path.join(directory, ".pathvision_catalog")
+            if os.path.exists(index_path):
+                os.remove(index_path)
+            file_handler.list_vehicle_paths()
+
+        results[f"list_vehicle_paths_cold/{count}"] = best_time(cold, max(1, repeats // 2), min_time=0)
+        results[f"list_vehicle_paths/{count}"] = best_time(file_handler.list_vehicle_paths, repeats)
+        shutil.rmtree(directory)
+        print(f"[BENCH] catalog files={count} done", file=sys.stderr)
+
+
+def bench_plot(results, sizes, repeats):
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    figure = Figure(figsize=(7, 6))
+    canvas = FigureCanvasAgg(figure)
+    ax = figure.add_subplot(111, projection='3d')
+    line, = ax.plot([0], [0], [0], marker='o')
+    for n in sizes:
+        points = [compute_path_points(random_segments(n, seed=s)) for s in (0, 1)]
+        markevery = max(1, (n + 1) // 200)
+        state = {"i": 0}
+
+        def update():
+            state["i"] ^= 1
+            p = points[state["i"]]
+            line.set_data_3d(p[:, 0], p[:, 1], p[:, 2])
+            line.set_markevery(markevery)
+            canvas.draw()
+
+        results[f"plot_update/{n}"] = best_time(update, repeats, min_time=0)
+        print(f"[BENCH] plot n={n} done", file=sys.stderr)
+
+
+def compare_to_baseline(results, baseline, threshold):
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        base = baseline.get(name)
+        if base:
+            ratio = seconds / base
+            flag = "REGRESSION" if ratio > threshold else "ok"
+            print(f"{name:<50} {seconds * 1e3:10.3f} ms  x{ratio:5.2f}  {flag}")
+            if ratio > threshold:
+                regressions.append(name)
+        else:
+            print(f"{name:<50} {seconds * 1e3:10.3f} ms  (new)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", help="use the full size ranges")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--only", choices=["kinematics", "catalog", "plot"], action="append")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    segment_sizes = FULL_SEGMENTS if args.full else QUICK_SEGMENTS
+    file_sizes = FULL_FILES if args.full else QUICK_FILES
+    groups = args.only or ["kinematics", "catalog", "plot"]
+    results = {}
+
+    work_dir = tempfile.mkdtemp(prefix="pathvision_bench_")
+    try:
+        if "kinematics" in groups:
+            bench_kinematics(results, segment_sizes, args.repeats)
+        if "catalog" in groups:
+            bench_catalog(results, file_sizes, args.repeats, work_dir)
+        if "plot" in groups:
+            bench_plot(results, segment_sizes, args.repeats)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "full": args.full,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=4)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            regressions = compare_to_baseline(results, json.load(f)["results"], args.threshold)
+    else:
+        for name, seconds in sorted(results.items()):
+            print(f"{name:<50} {seconds * 1e3:10.3f} ms")
+    print(f"Results written to {args.output}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+# benchmarks/synthetic.py
+import os
+import json
+import numpy as np
+
+
+def random_segments(count, seed=0):
+    """Segment dicts in the input JSON schema with plausible lengths and angles."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.uniform(5.0, 150.0, count)
+    euler = np.column_stack([
+        rng.uniform(-90.0, 90.0, count),
+        rng.uniform(-45.0, 45.0, count),
+        np.zeros(count),
+    ])
+    return [
+        {"shaft_length": length, "euler": angles}
+        for length, angles in zip(lengths.tolist(), euler.tolist())
+    ]
+
+
+def perturbed_segments(segments, scale=2.0, seed=1):
+    """A second attempt of the same path: every angle nudged by up to `scale` degrees."""
+    rng = np.random.default_rng(seed)
+    noise = rng.uniform(-scale, scale, (len(segments), 3))
+    return [
+        {"shaft_length": seg["shaft_length"], "euler": (np.array(seg["euler"]) + n).tolist()}
+        for seg, n in zip(segments, noise)
+    ]
+
+
+def vehicle_id(i):
+    return f"Synth{i % 7}Gen{i % 3 + 1}_attempt{i % 5 + 1}_rev{i % 4}_job{10000000 + i}"
+
+
+def write_path_directory(directory, file_count, segments_per_path=5):
+    """Fill `directory` with `file_count` path JSON files (same layout as data/input)."""
+    os.makedirs(directory, exist_ok=True)
+    for i in range(file_count):
+        vid = vehicle_id(i)
+        data = {"vehicle": vid, "segments": random_segments(segments_per_path, seed=i)}
+        with open(os.path.join(directory, f"{vid}.json"), "w") as f:
+            json.dump(data, f, indent=2)
@@ -0,0 +1,393 @@
+"""
+Headless PathVision command line. Never imports Qt, so it runs on render-less servers.
+
+    python cli.py list
+    python cli.py search GMC2500 --attempt 2-5 --revision any
+    python cli.py compare A.json B.json [--step 0.5]
+    python cli.py compare-all REFERENCE.json [--search GMC] --jobs 8
+    python cli.py matrix [--search GMC] [--output matrix.npy] [--float32] --jobs 8
+    python cli.py corridor REFERENCE.json --tolerance 2.5 [--step 0.5] [--fail-fast] --jobs 8
+    python cli.py report REFERENCE.json REPORT_DIR [--search GMC] [--format pdf] --jobs 4
+    python cli.py stats [--search GMC] [--scores]
+    python cli.py similar REFERENCE.json [--search GMC] [--top 10]
+    python cli.py export archive paths.pva | sqlite paths.db | json OUTPUT_DIR
+    python cli.py --trace trace.json compare-all REFERENCE.json
+
+Results are streamed as one JSON object per line on stdout; diagnostics go to stderr.
+With --trace, spans are written as a Chrome trace and a latency summary is printed on exit.
+"""
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from backend.services import file_handler, tracing
+from backend.services.search import VehicleSearchIndex, parse_range, normalize_base
+
+CHUNK_SIZE = 256
+
+_out = sys.stdout
+
+
+def emit(record):
+    _out.write(json.dumps(record) + "\n")
+    _out.flush()
+
+
+def configure(args):
+    file_handler.set_config_overrides(
+        shared_input_path=args.input_dir,
+        storage=args.storage,
+        database_path=args.database,
+        archive_path=args.archive,
+    )
+    if args.trace:
+        # Exported so spawned worker processes trace into their own files too.
+        os.environ["PATHVISION_TRACE"] = args.trace
+        tracing.enable(args.trace)
+
+
+def filtered_paths(args):
+    if not (args.text or args.attempt or args.revision or args.job):
+        return file_handler.list_vehicle_paths()
+    attempt, revision = parse_range(args.attempt), parse_range(args.revision)
+    job = args.job.strip() if args.job else None
+    database = file_handler.get_database()
+    if database:
+        # The indexed columns narrow the rows; the vehicle prefix is matched on what is left
+        paths = database.list_vehicle_paths(attempt=attempt, revision=revision, job=job)
+    else:
+        paths = file_handler.list_vehicle_paths()
+    vehicles = dict(paths)
+    index = VehicleSearchIndex(paths)
+    return [(filename, vehicles[filename]) for filename in index.search(args.text or "", attempt, revision, job)]
+
+
+def cmd_list(args):
+    for filename, vehicle in filtered_paths(args):
+        emit({"filename": filename, "vehicle": vehicle})
+
+
+def streamed_record(reference, filename, filepath):
+    """compare_paths record for a large JSON file, read in one pass without building the path."""
+    from backend.services import stream_parser
+    from backend.services.comparator import streaming_deviation
+    state = {}
+    with tracing.span("comparator.compare_paths", streamed=True):
+        blocks = stream_parser.stream_points(filepath, state=state)
+        avg_deviation, max_deviation = streaming_deviation([reference.points], blocks)
+        # Read on past the reference's length: that validates the file and reaches a trailing vehicle field
+        for _ in blocks:
+            pass
+    return {
+        "filename": filename,
+        "vehicle": state.get("vehicle") or "",
+        "avg_deviation": avg_deviation,
+        "max_deviation": max_deviation,
+    }
+
+
+def compare_record(reference, filename, step):
+    from backend.services.comparator import compare_paths, compare_paths_resampled
+    filepath = None if step else file_handler.stream_source(filename)
+    if filepath:
+        try:
+            return streamed_record(reference, filename, filepath)
+        except ValueError:
+            # Files the one-pass reader cannot take back are loaded whole; json reports real errors
+            pass
+    candidate = file_handler.load_steering_path(filename)
+    if step:
+        result = compare_paths_resampled(reference, candidate, step=step)
+        extra = {"max_deviation_at": result["max_deviation_at"], "sample_count": result["sample_count"]}
+    else:
+        result = compare_paths(reference, candidate)
+        extra = {}
+    return {
+        "filename": filename,
+        "vehicle": candidate.vehicle_id,
+        "avg_deviation": result["avg_deviation"],
+        "max_deviation": result["max_deviation"],
+        **extra,
+    }
+
+
+def cmd_compare(args):
+    reference = file_handler.load_steering_path(args.file1)
+    record = compare_record(reference, args.file2, args.step)
+    emit({"reference": args.file1, **record})
+
+
+_worker_state = {}
+
+
+def _init_worker(overrides, reference_filename, step):
+    tracing.init_worker()
+    file_handler.set_config_overrides(**overrides)
+    _worker_state["reference"] = file_handler.load_steering_path(reference_filename)
+    _worker_state["step"] = step
+
+
+def _compare_chunk(filenames):
+    records = []
+    for filename in filenames:
+        try:
+            records.append(compare_record(_worker_state["reference"], filename, _worker_state["step"]))
+        except Exception as e:
+            records.append({"filename": filename, "error": str(e)})
+    return records
+
+
+def cmd_compare_all(args):
+    filenames = [filename for filename, _ in filtered_paths(args) if filename != args.reference]
+    chunks = [filenames[i:i + CHUNK_SIZE] for i in range(0, len(filenames), CHUNK_SIZE)]
+    overrides = file_handler.get_config_overrides()
+
+    if args.jobs <= 1:
+        _init_worker(overrides, args.reference, args.step)
+        for chunk in chunks:
+            for record in _compare_chunk(chunk):
+                emit({"reference": args.reference, **record})
+        return
+
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_worker,
+                             initargs=(overrides, args.reference, args.step)) as pool:
+        futures = [pool.submit(_compare_chunk, chunk) for chunk in chunks]
+        for future in as_completed(futures):
+            for record in future.result():
+                emit({"reference": args.reference, **record})
+
+
+def cmd_matrix(args):
+    from backend.services.deviation_matrix import family_deviation_matrix
+    filenames = [filename for filename, _ in filtered_paths(args)]
+    result = family_deviation_matrix(filenames, out_path=args.output, jobs=args.jobs, float32=args.float32)
+    if args.output:
+        # The matrix stays on disk; rows and columns follow the filename order
+        emit({"output": args.output, "count": len(filenames), "filenames": filenames})
+        return
+    for i, a in enumerate(filenames):
+        for j in range(i + 1, len(filenames)):
+            emit({"a": a, "b": filenames[j],
+                  "avg_deviation": float(result[0, i, j]), "max_deviation": float(result[1, i, j])})
+
+
+def _init_corridor_worker(overrides, reference_filename):
+    from backend.services.corridor import Corridor
+    tracing.init_worker()
+    file_handler.set_config_overrides(**overrides)
+    _worker_state["corridor"] = Corridor(file_handler.load_steering_path(reference_filename))
+
+
+def _corridor_chunk(filenames, tolerance, step, fail_fast):
+    records = []
+    for filename in filenames:
+        try:
+            result = _worker_state["corridor"].check(file_handler.load_steering_path(filename),
+                                                     tolerance, step, fail_fast)
+            records.append({"filename": filename, **result})
+        except Exception as e:
+            records.append({"filename": filename, "error": str(e)})
+    return records
+
+
+def cmd_corridor(args):
+    filenames = [filename for filename, _ in filtered_paths(args) if filename != args.reference]
+    chunks = [filenames[i:i + CHUNK_SIZE] for i in range(0, len(filenames), CHUNK_SIZE)]
+    overrides = file_handler.get_config_overrides()
+    check_args = (args.tolerance, args.step, args.fail_fast)
+
+    if args.jobs <= 1:
+        _init_corridor_worker(overrides, args.reference)
+        for chunk in chunks:
+            for record in _corridor_chunk(chunk, *check_args):
+                emit({"reference": args.reference, "tolerance": args.tolerance, **record})
+        return
+
+    with ProcessPoolExecutor(max_workers=args.jobs, initializer=_init_corridor_worker,
+                             initargs=(overrides, args.reference)) as pool:
+        futures = [pool.submit(_corridor_chunk, chunk, *check_args) for chunk in chunks]
+        for future in as_completed(futures):
+            for record in future.result():
+                emit({"reference": args.reference, "tolerance": args.tolerance, **record})
+
+
+def cmd_stats(args):
+    from backend.services.fleet_stats import update_fleet_stats, get_fleet_stats
+    update_fleet_stats()
+    stats = get_fleet_stats()
+    prefix = normalize_base(args.text)
+    for summary in stats.summaries():
+        if not normalize_base(summary["family"]).startswith(prefix):
+            continue
+        if args.mean_path:
+            summary["mean_path"] = stats.family(summary["family"]).mean_points().tolist()
+        emit(summary)
+        if args.scores:
+            for filename, score in stats.family_scores(summary["family"]):
+                emit({"family": summary["family"], "filename": filename, **score})
+
+
+def cmd_similar(args):
+    from backend.services.similarity import SimilarityIndex
+    index = SimilarityIndex()
+    for filename, _ in filtered_paths(args):
+        if filename == args.reference:
+            continue
+        try:
+            index.add(filename, file_handler.load_steering_path(filename))
+        except Exception as e:
+            emit({"filename": filename, "error": str(e)})
+    reference = file_handler.load_steering_path(args.reference)
+    for rank, (filename, avg_deviation, max_deviation) in enumerate(index.query(reference, k=args.top), 1):
+        emit({"reference": args.reference, "rank": rank, "filename": filename,
+              "avg_deviation": avg_deviation, "max_deviation": max_deviation})
+
+
+def cmd_export(args):
+    items = ((filename, file_handler.load_steering_path(filename)) for filename, _ in filtered_paths(args))
+    if args.format == "archive":
+        from backend.database.archive import write_archive
+        count = write_archive(args.output, items)
+    elif args.format == "sqlite":
+        from backend.database.db import PathDatabase
+        count = 0
+
+        def counted():
+            # The output database may already hold other paths; count what goes in.
+            nonlocal count
+            for item in items:
+                count += 1
+                yield item
+
+        database = PathDatabase(args.output)
+        try:
+            database.save_many(counted())
+        finally:
+            database.close()
+    else:
+        os.makedirs(args.output, exist_ok=True)
+        count = 0
+        for filename, path in items:
+            with open(os.path.join(args.output, filename), "w") as f:
+                json.dump(path.to_dict(), f, indent=4)
+            count += 1
+    emit({"format": args.format, "output": args.output, "count": count})
+
+
+def cmd_report(args):
+    from backend.services.report import generate_reports
+    pairs = [(args.reference, filename) for filename, _ in filtered_paths(args) if filename != args.reference]
+
+    def progress(done, total, summary):
+        print(f"[REPORT] {done}/{total} {summary.get('report') or summary.get('error')}")
+        emit(summary)
+
+    generate_reports(pairs, args.output, fmt=args.format, jobs=args.jobs, progress=progress)
+
+
+def add_filter_arguments(parser, text_flag=False):
+    if text_flag:
+        parser.add_argument("--search", dest="text", default="", help="brand|model|gen prefix")
+    parser.add_argument("--attempt", default="", help="attempt number or range, e.g. 2-5")
+    parser.add_argument("--revision", default="", help="revision number or range")
+    parser.add_argument("--job", default=None, help="exact job number")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="pathvision", description="Headless PathVision batch tool")
+    parser.add_argument("--input-dir", help="path directory (overrides shared_input_path)")
+    parser.add_argument("--storage", choices=["json", "sqlite"], help="storage backend override")
+    parser.add_argument("--database", help="SQLite database path")
+    parser.add_argument("--archive", help="binary path archive to read from")
+    parser.add_argument("--trace", help="write a Chrome trace of hot-path spans to this file")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="list all stored paths")
+    p.set_defaults(func=cmd_list, text="", attempt="", revision="", job=None)
+
+    p = sub.add_parser("search", help="list paths matching vehicle fields")
+    p.add_argument("text", nargs="?", default="", help="brand|model|gen prefix")
+    add_filter_arguments(p)
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("compare", help="compare two path files")
+    p.add_argument("file1")
+    p.add_argument("file2")
+    p.add_argument("--step", type=float, default=None, help="arc-length resampling step")
+    p.set_defaults(func=cmd_compare)
+
+    p = sub.add_parser("compare-all", help="compare every (filtered) path against a reference")
+    p.add_argument("reference")
+    add_filter_arguments(p, text_flag=True)
+    p.add_argument("--step", type=float, default=None, help="arc-length resampling step")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    p.set_defaults(func=cmd_compare_all)
+
+    p = sub.add_parser("matrix", help="all-pairs deviation matrix of the (filtered) paths")
+    add_filter_arguments(p, text_flag=True)
+    p.add_argument("--output", default=None, help="write the (2, N, N) avg/max matrix to this .npy file")
+    p.add_argument("--float32", action="store_true", help="compute in float32 to halve memory")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    p.set_defaults(func=cmd_matrix)
+
+    p = sub.add_parser("corridor", help="check that (filtered) paths stay within a tolerance of a reference")
+    p.add_argument("reference")
+    p.add_argument("--tolerance", type=float, required=True, help="allowed distance from the reference")
+    add_filter_arguments(p, text_flag=True)
+    p.add_argument("--step", type=float, default=None, help="also test points every STEP units of arc length")
+    p.add_argument("--fail-fast", action="store_true", help="stop each check at the first violation")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    p.set_defaults(func=cmd_corridor)
+
+    p = sub.add_parser("report", help="render comparison reports of (filtered) paths against a reference")
+    p.add_argument("reference")
+    p.add_argument("output", help="report directory")
+    add_filter_arguments(p, text_flag=True)
+    p.add_argument("--format", choices=["html", "pdf"], default="html")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("stats", help="per-family mean path, spread and outlier scores")
+    p.add_argument("--search", dest="text", default="", help="brand|model|gen prefix")
+    p.add_argument("--scores", action="store_true", help="also emit an outlier score per path")
+    p.add_argument("--mean-path", action="store_true", help="include the family mean points")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("similar", help="find the (filtered) paths most similar to a reference")
+    p.add_argument("reference")
+    add_filter_arguments(p, text_flag=True)
+    p.add_argument("--top", type=int, default=5, help="number of paths to report")
+    p.set_defaults(func=cmd_similar)
+
+    p = sub.add_parser("export", help="export (filtered) paths to another format")
+    p.add_argument("format", choices=["archive", "sqlite", "json"])
+    p.add_argument("output")
+    add_filter_arguments(p, text_flag=True)
+    p.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv=None):
+    global _out
+    args = build_parser().parse_args(argv)
+    # Keep stdout clean for JSONL; library diagnostics are redirected to stderr.
+    _out, sys.stdout = sys.stdout, sys.stderr
+    try:
+        configure(args)
+        args.func(args)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return 2
+    except OSError as e:
+        # Missing files, unreachable shares, full disks: one line, no traceback
+        print(f"[ERROR] {e}")
+        return 1
+    finally:
+        sys.stdout = _out
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
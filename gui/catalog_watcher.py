@@ -0,0 +1,222 @@
+# gui/catalog_watcher.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from PyQt5.QtCore import QObject, QTimer, QFileSystemWatcher, pyqtSignal
+from backend.services.file_handler import (get_input_dir, get_read_dir, get_database, read_config,
+                                           start_mirror_sync, journal_changes)
+from backend.services.catalog import scan_catalog, refresh_entries, catalog_paths, diff_entries
+from backend.services.fleet_stats import update_fleet_stats
+
+DEFAULT_POLL_INTERVAL_MS = 5000
+DEBOUNCE_MS = 300
+# With a change journal, polls only read new journal entries; every n-th poll
+# still does a full scan to pick up files copied in by hand.
+FULL_SCAN_EVERY = 12
+
+
+def is_network_path(path):
+    return path.startswith("\\\\") or path.startswith("//")
+
+
+def catch_up(entries, journal_seq, full):
+    """
+    New catalog entries and journal head. Only the files named by journal entries
+    after `journal_seq` are re-read, unless a full scan is requested or needed.
+    With SQLite storage the rows of the database are listed instead of the JSON files.
+    """
+    database = get_database()
+    if database:
+        return database.catalog_entries(), None
+    # Resolved on every call: listings move to the mirror once its first sync is done.
+    input_dir = get_read_dir()
+    head, filenames = journal_changes(journal_seq)
+    if full or filenames is None:
+        return scan_catalog(input_dir), head
+    if filenames:
+        entries = refresh_entries(input_dir, entries, filenames)
+    return entries, head
+
+
+class PathCatalog(QObject):
+    """
+    In-memory catalog of the shared input directory (or of the SQLite store when
+    "storage" is "sqlite") kept up to date in the background.
+    Local folders (including the local mirror of a share) are watched with
+    QFileSystemWatcher; network shares (or "watch_mode": "poll" in config.json)
+    fall back to polling. Rescans run
+    off the UI thread and only the resulting deltas are emitted.
+    Fleet statistics are brought up to date after each change on a second
+    worker thread (disabled with "fleet_stats": false in config.json).
+    """
+    # The first snapshot, as a list of (filename, vehicle)
+    paths_reset = pyqtSignal(list)
+    # added, modified, removed: lists of (filename, vehicle), relative to the snapshot
+    paths_changed = pyqtSignal(list, list, list)
+    # families whose statistics changed
+    stats_changed = pyqtSignal(list)
+    _scan_finished = pyqtSignal(object)
+    _stats_finished = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = {}
+        self.input_dir = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._scanning = False
+        self._rescan_pending = False
+        self._primed = False
+        self._journal_seq = None
+        self._full_scan_pending = True
+        self._polls = 0
+        self._stats_enabled = True
+        self._stats_executor = ThreadPoolExecutor(max_workers=1)
+        self._stats_running = False
+        self._stats_pending = False
+        self._stopped = False
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.rescan)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.timeout.connect(self.poll)
+
+        self._watcher = None
+        self._mirror = None
+        self._scan_finished.connect(self._apply_scan)
+        self._stats_finished.connect(self._apply_stats)
+
+    def start(self):
+        """Start watching the configured input directory and take an initial snapshot."""
+        try:
+            database = get_database()
+            if database:
+                # Writes show up as journal files coming and going next to the database
+                self.input_dir = os.path.dirname(os.path.abspath(database.db_path))
+            else:
+                self._mirror = start_mirror_sync()
+                # The mirror directory is local, so it can be watched even while it is being filled.
+                self.input_dir = self._mirror.local_dir if self._mirror else get_input_dir()
+        except Exception as e:
+            print(f"[WARN] Catalog watcher disabled: {e}")
+            return
+
+        config = read_config() or {}
+        self._stats_enabled = config.get("fleet_stats", True)
+        poll_interval = config.get("poll_interval_ms", DEFAULT_POLL_INTERVAL_MS)
+        if config.get("watch_mode") == "poll" or is_network_path(self.input_dir):
+            self._poll_timer.start(poll_interval)
+        else:
+            self._watcher = QFileSystemWatcher([self.input_dir], self)
+            self._watcher.directoryChanged.connect(self.schedule_rescan)
+            # Directory events do not cover in-place rewrites, so keep a slow safety poll.
+            self._poll_timer.start(poll_interval * 6)
+        self.rescan()
+
+    def stop(self):
+        """
+        Stop watching and drop queued work. A running statistics pass sees
+        should_stop() and returns after its current path, so exit does not wait for it.
+        """
+        if self._stopped:
+            return
+        self._stopped = True
+        self._poll_timer.stop()
+        self._debounce.stop()
+        if self._watcher:
+            self._watcher.directoryChanged.disconnect(self.schedule_rescan)
+            self._watcher.removePaths(self._watcher.directories())
+            self._watcher.deleteLater()
+            self._watcher = None
+        if self._mirror:
+            self._mirror.stop_sync()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._stats_executor.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def primed(self):
+        """True once the first snapshot is in; later changes then arrive as paths_changed deltas."""
+        return self._primed
+
+    @property
+    def watching(self):
+        """False when the catalog could not start or was stopped; screens then list paths themselves."""
+        return self.input_dir is not None and not self._stopped
+
+    def paths(self):
+        return catalog_paths(self.entries)
+
+    def schedule_rescan(self, *_):
+        """Coalesce bursts of file-system events into one rescan."""
+        self._debounce.start()
+
+    def poll(self):
+        self._polls += 1
+        self.rescan(full=self._polls % FULL_SCAN_EVERY == 0)
+
+    def rescan(self, full=True):
+        if self.input_dir is None or self._stopped:
+            return
+        self._full_scan_pending = self._full_scan_pending or full
+        if self._scanning:
+            self._rescan_pending = True
+            return
+        self._scanning = True
+        full, self._full_scan_pending = self._full_scan_pending, False
+        future = self._executor.submit(catch_up, self.entries, self._journal_seq, full)
+        future.add_done_callback(self._on_scan_done)
+
+    def _on_scan_done(self, future):
+        # Runs on the executor thread; hand the result to the UI thread via a queued signal.
+        if self._stopped:
+            return
+        try:
+            self._scan_finished.emit(future.result())
+        except Exception as e:
+            print(f"[WARN] Catalog rescan failed: {e}")
+            self._scan_finished.emit(None)
+
+    def _apply_scan(self, result):
+        self._scanning = False
+        if result is not None:
+            entries, self._journal_seq = result
+            added, modified, removed = diff_entries(self.entries, entries)
+            self.entries = entries
+            if not self._primed:
+                self.paths_reset.emit(self.paths())
+            elif added or modified or removed:
+                self.paths_changed.emit(added, modified, removed)
+            if not self._primed or added or modified or removed:
+                self.update_stats()
+            self._primed = True
+        if self._rescan_pending:
+            self._rescan_pending = False
+            self.rescan(full=False)
+
+    def update_stats(self):
+        if not self._stats_enabled or self._stopped:
+            return
+        if self._stats_running:
+            self._stats_pending = True
+            return
+        self._stats_running = True
+        future = self._stats_executor.submit(update_fleet_stats, self.paths(), lambda: self._stopped)
+        future.add_done_callback(self._on_stats_done)
+
+    def _on_stats_done(self, future):
+        if self._stopped:
+            return
+        try:
+            self._stats_finished.emit(sorted(future.result()))
+        except Exception as e:
+            print(f"[WARN] Fleet statistics update failed: {e}")
+            self._stats_finished.emit(None)
+
+    def _apply_stats(self, changed):
+        self._stats_running = False
+        if changed:
+            self.stats_changed.emit(changed)
+        if self._stats_pending:
+            self._stats_pending = False
+            self.update_stats()
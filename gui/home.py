@@ -1,10 +1,10 @@
 from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import (
-    QWidget, QPushButton, QVBoxLayout, QStackedWidget, QApplication, QSizePolicy
+    QWidget, QPushButton, QVBoxLayout, QStackedWidget, QApplication, QSizePolicy,
+    QShortcut, QMessageBox
 )
-from gui.widgets.add_path_screen import AddPathScreen
-from gui.widgets.existing_paths_screen import ExistingPathsScreen
-from gui.widgets.compare_paths_screen import ComparePathsScreen
+from backend.services import tracing
 
 
 class AppWindow(QWidget):
@@ -17,20 +17,21 @@ class AppWindow(QWidget):
         self.home_widget = QWidget()
         self.stack.addWidget(self.home_widget)
 
-        # Other screens
-        self.add_path_screen = AddPathScreen(self.go_home)
-        self.existing_paths_screen = ExistingPathsScreen(self.go_home)
-        self.compare_paths_screen = ComparePathsScreen(self.go_home)
-
-        self.stack.addWidget(self.add_path_screen)
-        self.stack.addWidget(self.existing_paths_screen)
-        self.stack.addWidget(self.compare_paths_screen)
+        # Screens and the background catalog are built the first time they are
+        # needed, so matplotlib, numpy and the directory scan stay off the startup path.
+        self.catalog = None
+        self.add_path_screen = None
+        self.existing_paths_screen = None
+        self.compare_paths_screen = None
 
         self.init_home_ui()
         layout = QVBoxLayout()
         layout.addWidget(self.stack)
         self.setLayout(layout)
 
+        if tracing.is_enabled():
+            QShortcut(QKeySequence("Ctrl+Shift+T"), self, activated=self.show_trace_summary)
+
     def init_home_ui(self):
         layout = QVBoxLayout()
         layout.setSpacing(20)
@@ -64,16 +65,51 @@ class AppWindow(QWidget):
 
         self.home_widget.setLayout(layout)
 
+    def get_catalog(self):
+        if self.catalog is None:
+            from gui.catalog_watcher import PathCatalog
+            self.catalog = PathCatalog(self)
+            self.catalog.start()
+        return self.catalog
+
     def show_add_path(self):
+        if self.add_path_screen is None:
+            from gui.widgets.add_path_screen import AddPathScreen
+            self.add_path_screen = AddPathScreen(self.go_home)
+            self.stack.addWidget(self.add_path_screen)
         self.stack.setCurrentWidget(self.add_path_screen)
 
     def show_existing_paths(self):
-        self.existing_paths_screen.refresh()
+        if self.existing_paths_screen is None:
+            from gui.widgets.existing_paths_screen import ExistingPathsScreen
+            self.existing_paths_screen = ExistingPathsScreen(self.go_home, self.get_catalog())
+            self.stack.addWidget(self.existing_paths_screen)
+        elif not self.catalog.watching:
+            # A watching catalog keeps the screen up to date
+            self.existing_paths_screen.refresh()
         self.stack.setCurrentWidget(self.existing_paths_screen)
 
     def show_compare_paths(self):
-        self.compare_paths_screen.refresh()
+        if self.compare_paths_screen is None:
+            from gui.widgets.compare_paths_screen import ComparePathsScreen
+            self.compare_paths_screen = ComparePathsScreen(self.go_home, self.get_catalog())
+            self.stack.addWidget(self.compare_paths_screen)
+        elif not self.catalog.watching:
+            # A watching catalog keeps the screen up to date
+            self.compare_paths_screen.refresh()
         self.stack.setCurrentWidget(self.compare_paths_screen)
 
+    def show_trace_summary(self):
+        box = QMessageBox(self)
+        box.setWindowTitle("Trace Summary")
+        box.setText(f"<pre>{tracing.format_summary()}</pre>")
+        box.exec_()
+
     def go_home(self):
         self.stack.setCurrentWidget(self.home_widget)
+
+    def closeEvent(self, event):
+        # Background scans and statistics passes must not hold up exit
+        if self.catalog is not None:
+            self.catalog.stop()
+        super().closeEvent(event)
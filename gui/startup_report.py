@@ -0,0 +1,52 @@
+# gui/startup_report.py
+import os
+import sys
+import json
+import time
+
+# Warn when the first window takes longer than this to appear (seconds)
+DEFAULT_BUDGET_S = 1.5
+
+_start = time.perf_counter()
+_marks = []
+
+
+def mark(name):
+    """Record a startup milestone, in seconds since this module was imported."""
+    _marks.append((name, time.perf_counter() - _start))
+
+
+def report(verbose=False):
+    """
+    Print the startup timeline and flag it when time-to-first-window exceeds the budget.
+    Quiet unless `verbose` (the --startup-report flag), tracing is enabled or
+    PATHVISION_STARTUP_REPORT is set; that variable names a file to also write
+    the report to as JSON. PATHVISION_STARTUP_BUDGET overrides the budget in seconds.
+    """
+    # Imported here: this module is imported first to start the clock
+    from backend.services import tracing
+
+    mark("first_window")
+    report_path = os.environ.get("PATHVISION_STARTUP_REPORT")
+    if not (verbose or report_path or tracing.is_enabled()):
+        return
+    budget = float(os.environ.get("PATHVISION_STARTUP_BUDGET", DEFAULT_BUDGET_S))
+    total = _marks[-1][1]
+    heavy = sorted(m for m in ("numpy", "matplotlib", "scipy") if m in sys.modules)
+
+    for name, elapsed in _marks:
+        print(f"[STARTUP] {name:<20} {elapsed * 1000:8.1f} ms")
+    if heavy:
+        print(f"[STARTUP] heavy modules loaded before first window: {', '.join(heavy)}")
+    if total > budget:
+        print(f"[WARN] Time to first window {total:.2f}s exceeds budget {budget:.2f}s")
+
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump({
+                "marks": dict(_marks),
+                "time_to_first_window_s": total,
+                "budget_s": budget,
+                "heavy_modules": heavy,
+                "over_budget": total > budget,
+            }, f, indent=4)
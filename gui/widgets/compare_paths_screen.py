@@ -1,16 +1,30 @@
+import bisect
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QListWidget,
-    QPushButton, QMessageBox, QSizePolicy, QLineEdit, QSpinBox
+    QPushButton, QMessageBox, QSizePolicy, QLineEdit, QFileDialog, QProgressDialog,
+    QAbstractItemView
 )
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from backend.services.file_handler import list_vehicle_paths, load_path_data
+from PyQt5.QtCore import Qt
+from backend.services.file_handler import list_vehicle_paths, load_steering_path, path_cache_key
+from backend.services.path_cache import path_cache
 from backend.services.comparator import compare_paths
-import matplotlib.pyplot as plt
+from backend.services.kinematics import current_mode
+from backend.services.search import VehicleSearchIndex, parse_range
+from backend.services.report import generate_reports
 
 from gui.widgets.custom_toolbar import CustomNavigationToolbar
+from gui.workers import LatestTaskRunner, BackgroundJob
+from gui.widgets.path_canvas import PathCanvas
+
+def compare_files(file1, file2):
+    """Worker-side compare: load both files and return the (cached) compare_paths result."""
+    key = ("compare", current_mode(), path_cache_key(file1), path_cache_key(file2))
+    return path_cache.get_or_compute(
+        key, lambda: compare_paths(load_steering_path(file1), load_steering_path(file2)))
+
 
 class ComparePathsScreen(QWidget):
-    def __init__(self, go_home_callback):
+    def __init__(self, go_home_callback, catalog=None):
         super().__init__()
         self.go_home_callback = go_home_callback
         self.layout = QVBoxLayout()
@@ -59,10 +73,12 @@ class ComparePathsScreen(QWidget):
         viewer_layout.addLayout(top_right_layout)
 
         # Matplotlib figure and canvas
-        self.figure = plt.figure(figsize=(7, 6))
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = PathCanvas(figsize=(7, 6), name="compare_paths.canvas")
+        self.figure = self.canvas.figure
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.canvas.setMinimumHeight(460)
+        self.canvas.plot_failed.connect(
+            lambda message: QMessageBox.critical(self, "Error", f"Failed to plot paths:\n{message}"))
         viewer_layout.addWidget(self.canvas)
 
         # Navigation toolbar
@@ -77,6 +93,7 @@ class ComparePathsScreen(QWidget):
         report_btn = QPushButton("📄 Create Report")
         report_btn.setObjectName("primaryButton")
         report_btn.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        report_btn.clicked.connect(self.create_report)
 
         back_btn = QPushButton("🔙 Back to Home")
         back_btn.clicked.connect(self.go_home_callback)
@@ -91,9 +108,20 @@ class ComparePathsScreen(QWidget):
 
         self.layout.addLayout(button_layout)
 
+        # File loading and comparison run off the UI thread
+        self.comparer = LatestTaskRunner(self)
+
         # Initialize all_paths dict: key=display_name, value=filename
         self.all_paths = {}
-        self.refresh()
+        # A watching catalog supplies its snapshot, so its deltas always apply
+        # to the lists they were computed against
+        if catalog is None or not catalog.watching:
+            self.refresh()
+        else:
+            self.refresh(catalog.paths() if catalog.primed else [])
+            catalog.paths_reset.connect(self.refresh)
+        if catalog is not None:
+            catalog.paths_changed.connect(self.apply_catalog_changes)
 
     def create_searchable_path_selector(self, title):
         """Returns dict with layout and widgets for one path selector with search inputs"""
@@ -107,17 +135,13 @@ class ComparePathsScreen(QWidget):
         vehicle_input.setPlaceholderText("Brand|Model|Gen")
         vehicle_input.setFixedWidth(200)
 
-        attempt_input = QSpinBox()
-        attempt_input.setMinimum(0)
-        attempt_input.setMaximum(99)
-        attempt_input.setPrefix("Attempt ")
-        attempt_input.setFixedWidth(110)
+        attempt_input = QLineEdit()
+        attempt_input.setPlaceholderText("Attempt (any, 2-5)")
+        attempt_input.setFixedWidth(130)
 
-        revision_input = QSpinBox()
-        revision_input.setMinimum(0)
-        revision_input.setMaximum(9)
-        revision_input.setPrefix("Rev ")
-        revision_input.setFixedWidth(90)
+        revision_input = QLineEdit()
+        revision_input.setPlaceholderText("Rev (any, 0-3)")
+        revision_input.setFixedWidth(110)
 
         search_button = QPushButton("🔍 Search")
         search_button.setFixedWidth(80)
@@ -130,49 +154,97 @@ class ComparePathsScreen(QWidget):
         layout.addLayout(search_layout)
 
         list_widget = QListWidget()
+        if title == "Path B":
+            # Several Path B entries can be selected to report against one Path A
+            list_widget.setSelectionMode(QAbstractItemView.ExtendedSelection)
         layout.addWidget(list_widget)
 
-        search_button.clicked.connect(lambda: self.filter_selector_list(
-            vehicle_input.text(), attempt_input.value(), revision_input.value(), list_widget))
-
-        return {
+        selector = {
             'layout': layout,
             'vehicle_input': vehicle_input,
             'attempt_input': attempt_input,
             'revision_input': revision_input,
             'search_button': search_button,
             'list_widget': list_widget,
+            'query': ("", None, None),
         }
+        search_button.clicked.connect(lambda: self.filter_selector_list(
+            vehicle_input.text(), attempt_input.text(), revision_input.text(), selector))
 
-    def refresh(self):
-        """Reload all paths from file system and update selectors"""
-        paths = list_vehicle_paths()
+        return selector
+
+    def refresh(self, paths=None):
+        """Reload all paths (by default from storage) and update selectors"""
+        if paths is None:
+            paths = list_vehicle_paths()
         # Create dict: key = vehicle display string, value = filename
         # vehicle display string can be vehicle_id or vehicle_id + filename to ensure uniqueness if needed
         self.all_paths = {}
+        vehicles = []
         for filename, vehicle in paths:
             # If vehicle name duplicates exist, append filename for uniqueness
             display_name = vehicle
             if display_name in self.all_paths:
                 display_name = f"{vehicle} | {filename}"
             self.all_paths[display_name] = filename
+            vehicles.append((display_name, vehicle))
+        self.search_index = VehicleSearchIndex(vehicles)
 
         # Update both selectors
         self.load_paths_in_selector(self.pathA_widget)
         self.load_paths_in_selector(self.pathB_widget)
 
     def load_paths_in_selector(self, selector):
+        selector['query'] = ("", None, None)
         selector['list_widget'].clear()
         for display_name in sorted(self.all_paths.keys()):
             selector['list_widget'].addItem(display_name)
 
-    def filter_selector_list(self, vehicle_text, attempt, revision, list_widget):
-        search_key = f"{vehicle_text.strip()}_attempt{attempt}_rev{revision}".lower()
-        filtered = [name for name in self.all_paths.keys() if search_key in name.lower()]
+    def filter_selector_list(self, vehicle_text, attempt_text, revision_text, selector):
+        try:
+            attempt = parse_range(attempt_text)
+            revision = parse_range(revision_text)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Search", str(e))
+            return
+        selector['query'] = (vehicle_text, attempt, revision)
+        filtered = self.search_index.search(*selector['query'])
+        list_widget = selector['list_widget']
         list_widget.clear()
-        for name in filtered:
+        for name in sorted(filtered):
             list_widget.addItem(name)
 
+    def apply_catalog_changes(self, added, modified, removed):
+        """Apply watcher deltas to both selectors, touching only the affected rows."""
+        changed_files = {filename for filename, _ in added + modified + removed}
+        stale = [name for name, filename in self.all_paths.items() if filename in changed_files]
+        for name in stale:
+            del self.all_paths[name]
+            self.search_index.remove(name)
+
+        fresh = []
+        for filename, vehicle in added + modified:
+            display_name = vehicle
+            if display_name in self.all_paths:
+                display_name = f"{vehicle} | {filename}"
+            self.all_paths[display_name] = filename
+            self.search_index.add(display_name, vehicle)
+            fresh.append(display_name)
+
+        for selector in (self.pathA_widget, self.pathB_widget):
+            list_widget = selector['list_widget']
+            stale_names = set(stale)
+            for row in reversed(range(list_widget.count())):
+                if list_widget.item(row).text() in stale_names:
+                    list_widget.takeItem(row)
+            visible = set(self.search_index.search(*selector['query']))
+            # Both lists are kept sorted by display name
+            names = [list_widget.item(row).text() for row in range(list_widget.count())]
+            for name in sorted(n for n in fresh if n in visible):
+                row = bisect.bisect_left(names, name)
+                names.insert(row, name)
+                list_widget.insertItem(row, name)
+
     def compare_selected_paths(self):
         item1 = self.pathA_widget['list_widget'].currentItem()
         item2 = self.pathB_widget['list_widget'].currentItem()
@@ -191,15 +263,14 @@ class ComparePathsScreen(QWidget):
             QMessageBox.critical(self, "File Error", "Selected path files could not be found.")
             return
 
-        data1 = load_path_data(file1)
-        data2 = load_path_data(file2)
-
-        try:
-            result = compare_paths(data1["segments"], data2["segments"])
-        except Exception as e:
-            QMessageBox.critical(self, "Comparison Error", f"Failed to compare paths:\n{e}")
-            return
+        self.comparer.submit(
+            compare_files, file1, file2,
+            on_result=self.show_comparison,
+            on_error=lambda message: QMessageBox.critical(
+                self, "Comparison Error", f"Failed to compare paths:\n{message}"),
+        )
 
+    def show_comparison(self, result):
         self.plot_paths(result['points1'], result['points2'])
 
         metrics_msg = (
@@ -208,31 +279,53 @@ class ComparePathsScreen(QWidget):
         )
         QMessageBox.information(self, "Comparison Metrics", metrics_msg)
 
+    def create_report(self):
+        item1 = self.pathA_widget['list_widget'].currentItem()
+        items2 = self.pathB_widget['list_widget'].selectedItems()
+        if not item1 or not items2:
+            QMessageBox.warning(self, "Selection Error", "Please select Path A and at least one Path B.")
+            return
+
+        output_dir = QFileDialog.getExistingDirectory(self, "Select Report Folder")
+        if not output_dir:
+            return
+
+        file1 = self.all_paths.get(item1.text())
+        pairs = [(file1, self.all_paths.get(item.text())) for item in items2]
+
+        self.report_progress = QProgressDialog("Generating reports...", "Cancel", 0, len(pairs), self)
+        self.report_progress.setWindowModality(Qt.WindowModal)
+        self.report_progress.setMinimumDuration(0)
+
+        self.report_job = BackgroundJob(generate_reports, pairs, output_dir, "html", parent=self)
+        self.report_job.progress.connect(lambda done, total, _: self.report_progress.setValue(done))
+        self.report_job.finished.connect(self.on_reports_finished)
+        self.report_job.failed.connect(self.on_reports_failed)
+        self.report_progress.canceled.connect(self.report_job.cancel)
+        self.report_job.start()
+
+    def on_reports_finished(self, results):
+        self.report_progress.close()
+        failed = [r for r in results if 'error' in r]
+        message = f"{len(results) - len(failed)} report(s) written."
+        if failed:
+            message += "\n\nFailed:\n" + "\n".join(f"{r['file2']}: {r['error']}" for r in failed)
+        QMessageBox.information(self, "Reports", message)
+
+    def on_reports_failed(self, message):
+        self.report_progress.close()
+        QMessageBox.critical(self, "Report Error", f"Failed to generate reports:\n{message}")
+
     def plot_paths(self, points1, points2):
-        self.figure.clear()
-        self.ax = self.figure.add_subplot(111, projection='3d')
-        self.ax.plot(*zip(*points1), label="Path A", color="blue", marker='o', linewidth=2)
-        self.ax.plot(*zip(*points2), label="Path B", color="orange", marker='o', linewidth=2)
-        self.ax.set_title("Steering Path Comparison")
-        self.apply_axis_visibility(hidden=self.toggle_grid_btn.isChecked())
-        self.ax.legend()
-        self.canvas.draw()
+        self.canvas.show_paths(
+            [
+                (points1, {'label': "Path A", 'color': "blue", 'marker': 'o', 'linewidth': 2}),
+                (points2, {'label': "Path B", 'color': "orange", 'marker': 'o', 'linewidth': 2}),
+            ],
+            title="Steering Path Comparison",
+        )
 
     def toggle_grid_walls(self):
         hidden = self.toggle_grid_btn.isChecked()
         self.toggle_grid_btn.setText("Show Grid" if hidden else "Hide Grid")
-        self.apply_axis_visibility(hidden)
-        self.canvas.draw()
-
-    def apply_axis_visibility(self, hidden):
-        if not hasattr(self, 'ax'):
-            return
-        if hidden:
-            self.ax.set_axis_off()
-            self.ax.grid(False)
-        else:
-            self.ax.set_axis_on()
-            self.ax.grid(True)
-            self.ax.set_xlabel("X")
-            self.ax.set_ylabel("Y")
-            self.ax.set_zlabel("Z")
+        self.canvas.set_axes_hidden(hidden)
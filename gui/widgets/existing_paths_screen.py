@@ -1,19 +1,37 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QLineEdit, QLabel,
-    QPushButton, QSpinBox, QSizePolicy, QMessageBox, QListWidgetItem
+    QPushButton, QSizePolicy, QMessageBox, QListWidgetItem
 )
 from PyQt5.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-from backend.services.file_handler import list_vehicle_paths, load_path_data
-from backend.services.path_math import compute_path
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-import matplotlib.pyplot as plt
-import os
+from backend.services.file_handler import list_vehicle_paths, load_steering_path, delete_path_data
+from backend.services.search import VehicleSearchIndex, parse_range
+from backend.services.fleet_stats import get_fleet_stats, family_key
+from gui.workers import LatestTaskRunner
+from gui.widgets.path_canvas import PathCanvas
+
+def load_path_points(filename, with_mean=False):
+    """
+    Worker-side load: returns (vehicle_id, points, overlay) ready for plotting.
+    With with_mean, overlay is (family mean points, family path count, outlier score)
+    from the fleet statistics, else None.
+    """
+    path = load_steering_path(filename)
+    overlay = None
+    if with_mean:
+        stats = get_fleet_stats()
+        mean_points, count = stats.mean_path(path.vehicle_id)
+        if mean_points is not None:
+            overlay = (mean_points, count, stats.score(filename, path))
+    return path.vehicle_id, path.points, overlay
+
 
 class ExistingPathsScreen(QWidget):
-    def __init__(self, go_home_callback):
+    def __init__(self, go_home_callback, catalog=None):
         super().__init__()
         self.go_home_callback = go_home_callback
+        self.current_query = ("", None, None)
+        self.current_filename = None
+        self.current_vehicle = None
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
@@ -23,17 +41,13 @@ class ExistingPathsScreen(QWidget):
         self.vehicle_input.setPlaceholderText("Brand|Model|Gen")
         self.vehicle_input.setFixedWidth(250)
 
-        self.attempt_input = QSpinBox()
-        self.attempt_input.setMinimum(0)
-        self.attempt_input.setMaximum(99)
-        self.attempt_input.setPrefix("Attempt ")
-        self.attempt_input.setFixedWidth(120)
+        self.attempt_input = QLineEdit()
+        self.attempt_input.setPlaceholderText("Attempt (any, 2, 2-5)")
+        self.attempt_input.setFixedWidth(150)
 
-        self.revision_input = QSpinBox()
-        self.revision_input.setMinimum(0)
-        self.revision_input.setMaximum(9)
-        self.revision_input.setPrefix("Rev ")
-        self.revision_input.setFixedWidth(100)
+        self.revision_input = QLineEdit()
+        self.revision_input.setPlaceholderText("Rev (any, 1, 0-3)")
+        self.revision_input.setFixedWidth(130)
 
         search_button = QPushButton("🔍 Search")
         search_button.clicked.connect(self.filter_list)
@@ -76,12 +90,22 @@ class ExistingPathsScreen(QWidget):
             }
         """)
         top_right_layout.addWidget(self.toggle_grid_btn)
+
+        self.toggle_mean_btn = QPushButton("Family Mean")
+        self.toggle_mean_btn.setCheckable(True)
+        self.toggle_mean_btn.setChecked(False)
+        self.toggle_mean_btn.setToolTip("Overlay the mean path of the selected vehicle's family")
+        self.toggle_mean_btn.clicked.connect(self.reload_current_path)
+        self.toggle_mean_btn.setFixedWidth(100)
+        top_right_layout.addWidget(self.toggle_mean_btn)
         viewer_layout.addLayout(top_right_layout)
 
-        self.figure = plt.figure(figsize=(7, 6))
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = PathCanvas(figsize=(7, 6), name="existing_paths.canvas")
+        self.figure = self.canvas.figure
         self.canvas.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.canvas.setMinimumHeight(460)
+        self.canvas.plot_failed.connect(
+            lambda message: QMessageBox.critical(self, "Error", f"Failed to plot path:\n{message}"))
         viewer_layout.addWidget(self.canvas)
 
         self.layout.addWidget(viewer_container)
@@ -100,21 +124,40 @@ class ExistingPathsScreen(QWidget):
 
         self.layout.addLayout(button_layout)
 
-        # Load paths initially
-        self.refresh()
+        # Path loading and kinematics run off the UI thread
+        self.loader = LatestTaskRunner(self)
+
+        # Load paths initially. A watching catalog supplies its snapshot, so its
+        # deltas always apply to the list they were computed against.
+        self.catalog = catalog
+        if catalog is None or not catalog.watching:
+            self.refresh()
+        else:
+            self.refresh(catalog.paths() if catalog.primed else [])
+            catalog.paths_reset.connect(self.refresh)
+        if catalog is not None:
+            catalog.paths_changed.connect(self.apply_catalog_changes)
+            catalog.stats_changed.connect(self.apply_stats_changes)
 
-    def refresh(self):
-        """Reload all paths into the list."""
-        self.paths = list_vehicle_paths()
+    def refresh(self, paths=None):
+        """Reload all paths (by default from storage) into the list."""
+        self.paths = list_vehicle_paths() if paths is None else list(paths)
+        self.search_index = VehicleSearchIndex(self.paths)
+        self.current_query = ("", None, None)
         self.filtered_paths = self.paths.copy()
         self.populate_list(self.filtered_paths)
 
     def filter_list(self):
-        base = self.vehicle_input.text().strip()
-        attempt = self.attempt_input.value()
-        revision = self.revision_input.value()
-        search_key = f"{base}_attempt{attempt}_rev{revision}".lower()
-        self.filtered_paths = [p for p in self.paths if search_key in p[1].lower()]
+        try:
+            attempt = parse_range(self.attempt_input.text())
+            revision = parse_range(self.revision_input.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Search", str(e))
+            return
+        self.current_query = (self.vehicle_input.text(), attempt, revision)
+        filenames = self.search_index.search(*self.current_query)
+        vehicles = dict(self.paths)
+        self.filtered_paths = [(filename, vehicles[filename]) for filename in filenames]
         self.populate_list(self.filtered_paths)
 
     def populate_list(self, path_data_list):
@@ -125,50 +168,77 @@ class ExistingPathsScreen(QWidget):
             item.setData(Qt.UserRole, filename)  # store the filename invisibly
             self.path_list.addItem(item)
 
+    def apply_catalog_changes(self, added, modified, removed):
+        """Apply watcher deltas, touching only the affected list rows."""
+        vehicles = dict(self.paths)
+        for filename, _ in removed:
+            vehicles.pop(filename, None)
+            self.search_index.remove(filename)
+        for filename, vehicle in added + modified:
+            vehicles[filename] = vehicle
+            self.search_index.add(filename, vehicle)
+        self.paths = list(vehicles.items())
+
+        changed = {filename for filename, _ in added + modified + removed}
+        visible = set(self.search_index.search(*self.current_query)) & changed
+        rows = {}
+        for row in reversed(range(self.path_list.count())):
+            filename = self.path_list.item(row).data(Qt.UserRole)
+            if filename in changed:
+                if filename in visible:
+                    self.path_list.item(row).setText(vehicles[filename])
+                    rows[filename] = row
+                else:
+                    self.path_list.takeItem(row)
+        for filename in visible - rows.keys():
+            item = QListWidgetItem(vehicles[filename])
+            item.setData(Qt.UserRole, filename)
+            self.path_list.addItem(item)
+        self.filtered_paths = [
+            (self.path_list.item(row).data(Qt.UserRole), self.path_list.item(row).text())
+            for row in range(self.path_list.count())
+        ]
+
+    def apply_stats_changes(self, families):
+        """Redraw the family mean when the statistics of the shown family changed."""
+        if (self.toggle_mean_btn.isChecked() and self.current_vehicle
+                and family_key(self.current_vehicle) in families):
+            self.reload_current_path()
+
+    def reload_current_path(self):
+        if self.current_filename:
+            self.load_path(self.current_filename)
+
     def display_3d_path(self, item):
-        filename = item.data(Qt.UserRole)
-        data = load_path_data(filename)
-        if not data:
-            QMessageBox.warning(self, "Error", f"Cannot load file: {filename}")
-            return
-        try:
-            shaft_lengths = [seg['shaft_length'] for seg in data["segments"]]
-            yaw_angles = [seg['euler'][0] for seg in data["segments"]]
-            pitch_angles = [seg['euler'][1] for seg in data["segments"]]
-
-            path_points = compute_path(shaft_lengths, yaw_angles, pitch_angles)
-            xs = [p[0] for p in path_points]
-            ys = [p[1] for p in path_points]
-            zs = [p[2] for p in path_points]
-
-            self.figure.clear()
-            self.ax = self.figure.add_subplot(111, projection='3d')
-            self.ax.plot(xs, ys, zs, marker='o', linewidth=2, color='red')
-            self.ax.set_title(data.get("vehicle", "Steering Path"))
-
-            self.apply_axis_visibility(hidden=self.toggle_grid_btn.isChecked())
-            self.canvas.draw()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to plot path:\n{str(e)}")
+        self.load_path(item.data(Qt.UserRole))
+
+    def load_path(self, filename):
+        self.current_filename = filename
+        self.loader.submit(
+            load_path_points, filename, self.toggle_mean_btn.isChecked(),
+            on_result=self.plot_path,
+            on_error=lambda message: QMessageBox.warning(
+                self, "Error", f"Cannot load file: {filename}\n{message}"),
+        )
+
+    def plot_path(self, result):
+        vehicle, points, overlay = result
+        self.current_vehicle = vehicle
+        paths = [(points, {'color': 'red', 'linewidth': 2, 'marker': 'o'})]
+        title = vehicle or "Steering Path"
+        if overlay is not None:
+            mean_points, count, score = overlay
+            paths[0][1]['label'] = vehicle
+            paths.append((mean_points, {'color': 'gray', 'linewidth': 2, 'linestyle': '--',
+                                        'label': f"{family_key(vehicle)} mean ({count} paths)"}))
+            if score and score['score'] is not None:
+                title = f"{title}\noutlier score {score['score']:.2f}"
+        self.canvas.show_paths(paths, title=title)
 
     def toggle_grid_walls(self):
         hidden = self.toggle_grid_btn.isChecked()
         self.toggle_grid_btn.setText("Show Grid" if hidden else "Hide Grid")
-        self.apply_axis_visibility(hidden)
-        self.canvas.draw()
-
-    def apply_axis_visibility(self, hidden):
-        if not hasattr(self, 'ax'):
-            return
-        if hidden:
-            self.ax.set_axis_off()
-            self.ax.grid(False)
-        else:
-            self.ax.set_axis_on()
-            self.ax.grid(True)
-            self.ax.set_xlabel("X")
-            self.ax.set_ylabel("Y")
-            self.ax.set_zlabel("Z")
+        self.canvas.set_axes_hidden(hidden)
 
     def delete_selected_path(self):
         selected_item = self.path_list.currentItem()
@@ -176,7 +246,6 @@ class ExistingPathsScreen(QWidget):
             return
         vehicle_name = selected_item.text()
         filename = selected_item.data(Qt.UserRole)
-        filepath = os.path.join("data/input", filename)
 
         reply = QMessageBox.question(
             self, "Confirm Deletion",
@@ -186,7 +255,14 @@ class ExistingPathsScreen(QWidget):
         if reply != QMessageBox.Yes:
             return
         try:
-            os.remove(filepath)
-            self.refresh()
+            delete_path_data(filename)
+            if filename == self.current_filename:
+                self.current_filename = None
+            if self.catalog is not None and self.catalog.watching:
+                # The catalog reports the removal to the other screens too
+                self.apply_catalog_changes([], [], [(filename, vehicle_name)])
+                self.catalog.schedule_rescan()
+            else:
+                self.refresh()
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to delete file:\n{e}")
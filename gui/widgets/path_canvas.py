@@ -0,0 +1,148 @@
+from PyQt5.QtCore import QTimer, pyqtSignal
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from matplotlib import rcParams
+import numpy as np
+from backend.services import tracing
+
+# Paths with more vertices than this only get every n-th marker drawn
+MAX_MARKERS = 200
+# Delay used to coalesce bursts of selection changes into one redraw
+COALESCE_MS = 15
+
+
+def line_style(index, style, count):
+    """
+    Every property a path line can be given, with matplotlib's defaults for
+    the ones style leaves out, so a reused artist carries nothing over.
+    """
+    full = {
+        'color': f"C{index}",
+        'linestyle': rcParams['lines.linestyle'],
+        'linewidth': rcParams['lines.linewidth'],
+        'marker': 'None',
+        'markersize': rcParams['lines.markersize'],
+        'alpha': None,
+        # Leading underscore keeps unlabeled lines out of the legend
+        'label': f"_path{index}",
+    }
+    full.update({key: value for key, value in style.items() if value not in (None, "")})
+    full['markevery'] = max(1, count // MAX_MARKERS)
+    return full
+
+
+class PathCanvas(FigureCanvas):
+    """
+    3D path viewer shared by the screens. The axes are created once and line
+    artists are updated in place with set_data_3d; redraws go through draw_idle
+    and rapid successive updates are coalesced into one. `name` tags the
+    canvas' trace spans with the screen that owns it. Updates are applied
+    from a timer, so errors while applying one are reported through
+    plot_failed rather than raised to the caller of show_paths.
+    """
+    # error message of an update that could not be applied
+    plot_failed = pyqtSignal(str)
+
+    def __init__(self, figsize=(7, 6), name="canvas"):
+        self.name = name
+        self.figure = Figure(figsize=figsize)
+        super().__init__(self.figure)
+        self.ax = self.figure.add_subplot(111, projection='3d')
+        self.lines = []
+        self.axes_hidden = False
+        self.legend_entries = None
+        self._pending = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(COALESCE_MS)
+        self._timer.timeout.connect(self._apply_pending)
+        self.set_axes_hidden(False)
+
+    def show_paths(self, paths, title=""):
+        """
+        Queue a redraw with the given paths: a list of (points, style) where
+        points is an (N, 3) array and style holds label/color/linewidth/marker.
+        """
+        self._pending = (paths, title)
+        self._timer.start()
+
+    def flush(self):
+        """Apply any queued update immediately."""
+        if self._timer.isActive():
+            self._timer.stop()
+            self._apply_pending()
+
+    def _apply_pending(self):
+        if self._pending is None:
+            return
+        paths, title = self._pending
+        self._pending = None
+        try:
+            with tracing.span(f"{self.name}.update", paths=len(paths)):
+                self._update_artists(paths, title)
+        except Exception as e:
+            print(f"[ERROR] {self.name}: failed to plot paths: {e}")
+            self.plot_failed.emit(str(e))
+        self.draw_idle()
+
+    def draw(self):
+        with tracing.span(f"{self.name}.draw"):
+            super().draw()
+
+    def _update_artists(self, paths, title):
+        styles = []
+        for i, (points, style) in enumerate(paths):
+            points = np.asarray(points)
+            style = line_style(i, style, len(points))
+            styles.append(style)
+            if i < len(self.lines):
+                line = self.lines[i]
+                line.set_data_3d(points[:, 0], points[:, 1], points[:, 2])
+                line.set(visible=True, **style)
+            else:
+                line, = self.ax.plot(points[:, 0], points[:, 1], points[:, 2], **style)
+                self.lines.append(line)
+        for line in self.lines[len(paths):]:
+            line.set_visible(False)
+
+        self._update_limits([np.asarray(points) for points, _ in paths])
+        self._update_legend(styles)
+        self.ax.set_title(title)
+
+    def _update_limits(self, point_arrays):
+        point_arrays = [p for p in point_arrays if len(p)]
+        if not point_arrays:
+            return
+        lo = np.min([p.min(axis=0) for p in point_arrays], axis=0)
+        hi = np.max([p.max(axis=0) for p in point_arrays], axis=0)
+        margin = np.maximum((hi - lo) * 0.05, 1e-6)
+        self.ax.set_xlim(lo[0] - margin[0], hi[0] + margin[0])
+        self.ax.set_ylim(lo[1] - margin[1], hi[1] + margin[1])
+        self.ax.set_zlim(lo[2] - margin[2], hi[2] + margin[2])
+
+    def _update_legend(self, styles):
+        # The legend copies line styles when it is built, so restyled lines need a new one
+        entries = [tuple((key, style[key]) for key in sorted(style) if key != 'markevery')
+                   for style in styles if not style['label'].startswith("_")]
+        if entries == self.legend_entries:
+            return
+        self.legend_entries = entries
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        if entries:
+            self.ax.legend(handles=[l for l in self.lines[:len(styles)] if not l.get_label().startswith("_")])
+
+    def set_axes_hidden(self, hidden):
+        self.axes_hidden = hidden
+        if hidden:
+            self.ax.set_axis_off()
+            self.ax.grid(False)
+        else:
+            self.ax.set_axis_on()
+            self.ax.grid(True)
+            self.ax.set_xlabel("X")
+            self.ax.set_ylabel("Y")
+            self.ax.set_zlabel("Z")
+        self.draw_idle()
@@ -0,0 +1,115 @@
+# gui/workers.py
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class TaskSignals(QObject):
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+
+class Task(QRunnable):
+    """Runs fn(*args) on a pool thread and reports back through queued signals."""
+
+    def __init__(self, request_id, fn, args):
+        super().__init__()
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.signals = TaskSignals()
+        # Lifetime is managed by LatestTaskRunner, not the pool.
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.request_id, str(e))
+            return
+        self.signals.finished.emit(self.request_id, result)
+
+
+class LatestTaskRunner(QObject):
+    """
+    Submits load/compute work to the global QThreadPool and only delivers the
+    result of the most recent request. Older requests that have not started are
+    taken back out of the pool; ones already running finish but are ignored.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        self.current_id = 0
+        self.pending = None
+        self.callbacks = None
+        # Keep every started task alive until its signal arrives.
+        self.in_flight = {}
+
+    def submit(self, fn, *args, on_result, on_error=None):
+        self.cancel()
+        self.current_id += 1
+        task = Task(self.current_id, fn, args)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        self.pending = task
+        self.callbacks = (on_result, on_error)
+        self.in_flight[self.current_id] = task
+        self.pool.start(task)
+        return self.current_id
+
+    def cancel(self):
+        if self.pending is not None and self.pool.tryTake(self.pending):
+            self.in_flight.pop(self.pending.request_id, None)
+        self.pending = None
+        self.callbacks = None
+
+    def is_busy(self):
+        return self.pending is not None
+
+    def _on_finished(self, request_id, result):
+        self.in_flight.pop(request_id, None)
+        if request_id != self.current_id or self.callbacks is None:
+            return
+        on_result, _ = self.callbacks
+        self.pending = None
+        self.callbacks = None
+        on_result(result)
+
+    def _on_failed(self, request_id, message):
+        self.in_flight.pop(request_id, None)
+        if request_id != self.current_id or self.callbacks is None:
+            return
+        _, on_error = self.callbacks
+        self.pending = None
+        self.callbacks = None
+        if on_error:
+            on_error(message)
+
+
+class BackgroundJob(QObject):
+    """
+    Runs a long batch function on the thread pool. The function is called as
+    fn(*args, progress=..., should_stop=...) and its progress is re-emitted
+    on the UI thread; cancel() makes should_stop() return True.
+    """
+    progress = pyqtSignal(int, int, object)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, fn, *args, parent=None):
+        super().__init__(parent)
+        self.fn = fn
+        self.args = args
+        self.cancelled = False
+        self.task = None
+
+    def start(self):
+        self.task = Task(0, self._run, ())
+        self.task.signals.finished.connect(lambda _, result: self.finished.emit(result))
+        self.task.signals.failed.connect(lambda _, message: self.failed.emit(message))
+        QThreadPool.globalInstance().start(self.task)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _run(self):
+        return self.fn(*self.args, progress=self.progress.emit, should_stop=lambda: self.cancelled)
@@ -1,9 +1,21 @@
+from gui import startup_report
 from PyQt5.QtWidgets import QApplication
+from PyQt5.QtCore import QTimer
 from gui.home import AppWindow
+import multiprocessing
 import sys
 
 if __name__ == "__main__":
+    # Report and batch workers run in child processes, also from the frozen build
+    multiprocessing.freeze_support()
+    startup_report.mark("imports")
+    verbose_startup = "--startup-report" in sys.argv
+    if verbose_startup:
+        sys.argv.remove("--startup-report")
     app = QApplication(sys.argv)
     window = AppWindow()
+    startup_report.mark("window_built")
     window.show()
+    # Runs once the event loop has painted the first window
+    QTimer.singleShot(0, lambda: startup_report.report(verbose_startup))
     sys.exit(app.exec_())
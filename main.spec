@@ -10,7 +10,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['tkinter', 'matplotlib.backends.backend_tkagg', 'matplotlib.backends._backend_tk'],
     noarchive=False,
     optimize=0,
 )
@@ -0,0 +1,138 @@
+# tests/baseline.py
+"""
+Scalar implementations the vectorized code replaced, kept as references.
+compute_path, compute_path_points, compare_paths and
+compute_cumulative_angle_differences are the original loops; the chained
+references follow the same per-segment style with rotation matrices.
+list_vehicle_paths is the original directory listing.
+"""
+import os
+import json
+import numpy as np
+
+
+def compute_path(shaft_lengths, yaw_angles, pitch_angles):
+    pitch_rad = np.radians(pitch_angles)
+    yaw_rad = np.radians(yaw_angles)
+    points = [(0.0, 0.0, 0.0)]
+    for i in range(len(shaft_lengths)):
+        L = shaft_lengths[i]
+        pitch = pitch_rad[i]
+        yaw = yaw_rad[i]
+        dx = L * np.cos(pitch) * np.cos(yaw)
+        dy = L * np.cos(pitch) * np.sin(yaw)
+        dz = L * np.sin(pitch)
+        last_point = points[-1]
+        new_point = (last_point[0] + dx, last_point[1] + dy, last_point[2] + dz)
+        points.append(new_point)
+    return points
+
+
+def compute_path_points(segments):
+    points = [(0, 0, 0)]
+    x, y, z = 0, 0, 0
+
+    for seg in segments:
+        l = seg['shaft_length']
+        yaw_rad = np.radians(seg['euler'][0])
+        pitch_rad = np.radians(seg['euler'][1])
+
+        x += l * np.cos(pitch_rad) * np.cos(yaw_rad)
+        y += l * np.cos(pitch_rad) * np.sin(yaw_rad)
+        z += l * np.sin(pitch_rad)
+        points.append((x, y, z))
+
+    return points
+
+
+def compare_paths(segments1, segments2):
+    points1 = compute_path_points(segments1)
+    points2 = compute_path_points(segments2)
+
+    length = min(len(points1), len(points2))
+    deltas = [np.linalg.norm(np.subtract(points1[i], points2[i])) for i in range(length)]
+
+    return {
+        'avg_deviation': float(np.mean(deltas)) if deltas else 0.0,
+        'max_deviation': float(np.max(deltas)) if deltas else 0.0,
+        'deltas': deltas,
+    }
+
+
+def compute_cumulative_angle_differences(segments1, segments2):
+    length = min(len(segments1), len(segments2))
+    diffs = []
+    correction = [0.0, 0.0, 0.0]  # yaw, pitch, roll
+
+    for i in range(length):
+        seg1 = segments1[i]['euler']
+        seg2 = segments2[i]['euler']
+        corrected_seg2 = [seg2[0] - correction[0], seg2[1] - correction[1], seg2[2] - correction[2]]
+
+        yaw_diff = corrected_seg2[0] - seg1[0]
+        pitch_diff = corrected_seg2[1] - seg1[1]
+        roll_diff = corrected_seg2[2] - seg1[2]
+        diffs.append({'yaw_diff': yaw_diff, 'pitch_diff': pitch_diff, 'roll_diff': roll_diff})
+
+        correction[0] += yaw_diff
+        correction[1] += pitch_diff
+        correction[2] += roll_diff
+
+    return diffs
+
+
+def rotation(yaw_deg, pitch_deg, roll_deg):
+    """Rz(yaw) @ Ry(-pitch) @ Rx(roll): the x axis ends up along the segment direction."""
+    yaw, pitch, roll = np.radians([yaw_deg, -pitch_deg, roll_deg])
+    rz = np.array([[np.cos(yaw), -np.sin(yaw), 0], [np.sin(yaw), np.cos(yaw), 0], [0, 0, 1]])
+    ry = np.array([[np.cos(pitch), 0, np.sin(pitch)], [0, 1, 0], [-np.sin(pitch), 0, np.cos(pitch)]])
+    rx = np.array([[1, 0, 0], [0, np.cos(roll), -np.sin(roll)], [0, np.sin(roll), np.cos(roll)]])
+    return rz @ ry @ rx
+
+
+def compute_chained_path(shaft_lengths, yaw_angles, pitch_angles, roll_angles):
+    """Each segment's angles rotate the frame of the segment before it."""
+    frame = np.eye(3)
+    points = [np.zeros(3)]
+    for L, yaw, pitch, roll in zip(shaft_lengths, yaw_angles, pitch_angles, roll_angles):
+        frame = frame @ rotation(yaw, pitch, roll)
+        points.append(points[-1] + L * frame[:, 0])
+    return np.array(points)
+
+
+def quaternion_product(a, b):
+    aw, ax, ay, az = a
+    bw, bx, by, bz = b
+    return (
+        aw * bw - ax * bx - ay * by - az * bz,
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+    )
+
+
+def chain_quaternions(q):
+    """Running products along the last axis of a (4, ..., N) array, one quaternion at a time."""
+    q = np.asarray(q, dtype=np.float64)
+    out = np.empty_like(q)
+    for index in np.ndindex(q.shape[1:-1]):
+        running = (1.0, 0.0, 0.0, 0.0)
+        for i in range(q.shape[-1]):
+            running = quaternion_product(running, tuple(q[(slice(None),) + index + (i,)]))
+            out[(slice(None),) + index + (i,)] = running
+    return out
+
+
+def list_vehicle_paths(input_dir):
+    paths = []
+    for filename in os.listdir(input_dir):
+        if filename.endswith(".json"):
+            filepath = os.path.join(input_dir, filename)
+            try:
+                with open(filepath, "r") as f:
+                    data = json.load(f)
+                    if "vehicle" in data:
+                        paths.append((filename, data["vehicle"]))
+            except Exception:
+                continue
+    return paths
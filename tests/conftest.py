@@ -0,0 +1,74 @@
+# tests/conftest.py
+import os
+import sys
+import glob
+import json
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from backend.services.settings import settings
+from benchmarks.synthetic import random_segments
+
+SAMPLE_DIR = os.path.join(ROOT, "data", "input")
+
+
+@pytest.fixture(autouse=True, scope="session")
+def absolute_mode():
+    # Results must not depend on a developer's config.json
+    settings.set_overrides(kinematics_mode="absolute")
+
+
+def sample_files():
+    return sorted(glob.glob(os.path.join(SAMPLE_DIR, "*.json")))
+
+
+@pytest.fixture(scope="session")
+def sample_segments():
+    """{filename: segment dicts} of the sample paths in data/input."""
+    segments = {}
+    for filepath in sample_files():
+        with open(filepath) as f:
+            segments[os.path.basename(filepath)] = json.load(f)["segments"]
+    return segments
+
+
+@pytest.fixture(scope="session")
+def ragged_fleet():
+    """Synthetic fleet of paths with very different segment counts, including empty and single-segment paths."""
+    rng = np.random.default_rng(18)
+    counts = [0, 1, 2, 5, 17, 64, 300] + rng.integers(1, 1500, 9).tolist()
+    return [random_segments(n, seed=i) for i, n in enumerate(counts)]
+
+
+@pytest.fixture
+def input_dir(tmp_path, monkeypatch):
+    """Empty shared input directory with JSON storage, for one test."""
+    from backend.services.path_cache import path_cache
+    directory = tmp_path / "input"
+    directory.mkdir()
+    monkeypatch.setattr(settings, "_overrides", {
+        **settings.overrides(), "shared_input_path": str(directory),
+        "storage": "json", "archive_path": "", "mirror_path": "",
+    })
+    settings._rebuild()
+    path_cache.clear()
+    yield directory
+    monkeypatch.undo()
+    settings._rebuild()
+    path_cache.clear()
+
+
+def write_path(directory, filename, segments, vehicle="GMC2500Gen4_attempt1_rev0_job12345672", indent=4):
+    with open(os.path.join(directory, filename), "w") as f:
+        json.dump({"vehicle": vehicle, "segments": segments}, f, indent=indent)
+    return filename
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
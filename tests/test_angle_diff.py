@@ -0,0 +1,60 @@
+# tests/test_angle_diff.py
+import numpy as np
+import pytest
+
+import baseline
+from benchmarks.synthetic import random_segments
+from backend.services.angle_diff import (
+    cumulative_angle_differences, batch_angle_differences, compute_cumulative_angle_differences, euler_array,
+)
+
+
+def as_array(dicts):
+    return np.array([[d['yaw_diff'], d['pitch_diff'], d['roll_diff']] for d in dicts]).reshape(-1, 3)
+
+
+def pairs(sample_segments, ragged_fleet):
+    paths = list(sample_segments.values()) + ragged_fleet
+    return [(a, b) for a in paths[::3] for b in paths[1::4]]
+
+
+def test_recurrence_matches_scalar_loop(sample_segments, ragged_fleet):
+    for a, b in pairs(sample_segments, ragged_fleet):
+        expected = as_array(baseline.compute_cumulative_angle_differences(a, b))
+        got = cumulative_angle_differences(euler_array(a), euler_array(b))
+        assert got.shape == (min(len(a), len(b)), 3)
+        # The loop accumulates its correction, so allow for its rounding drift
+        np.testing.assert_allclose(got, expected, atol=1e-9)
+
+
+def test_dict_output_matches_scalar_loop(sample_segments):
+    paths = list(sample_segments.values())
+    for a, b in zip(paths, paths[::-1]):
+        got = compute_cumulative_angle_differences(a, b)
+        expected = baseline.compute_cumulative_angle_differences(a, b)
+        assert [d.keys() for d in got] == [d.keys() for d in expected]
+        np.testing.assert_allclose(as_array(got), as_array(expected), atol=1e-9)
+
+
+def test_empty_paths():
+    segments = random_segments(4)
+    assert compute_cumulative_angle_differences([], segments) == []
+    assert cumulative_angle_differences(np.zeros((0, 3)), euler_array(segments)).shape == (0, 3)
+
+
+def test_batch_restarts_the_recurrence_per_pair(sample_segments, ragged_fleet):
+    batch = pairs(sample_segments, ragged_fleet)
+    result = batch_angle_differences(batch)
+    assert len(result) == sum(min(len(a), len(b)) for a, b in batch)
+    for i, (a, b) in enumerate(batch):
+        rows = result[result['pair'] == i]
+        expected = as_array(baseline.compute_cumulative_angle_differences(a, b))
+        np.testing.assert_array_equal(rows['segment'], np.arange(len(expected)))
+        got = np.column_stack([rows['yaw_diff'], rows['pitch_diff'], rows['roll_diff']]).reshape(-1, 3)
+        np.testing.assert_allclose(got, expected, atol=1e-9)
+        np.testing.assert_array_equal(got, cumulative_angle_differences(euler_array(a), euler_array(b)))
+
+
+@pytest.mark.parametrize("batch", [[], [([], [])]])
+def test_batch_of_empty_pairs(batch):
+    assert len(batch_angle_differences(batch)) == 0
@@ -0,0 +1,112 @@
+# tests/test_archive.py
+import os
+import time
+import numpy as np
+import pytest
+
+from conftest import write_path
+from benchmarks.synthetic import random_segments
+from backend.database.archive import PathArchive, write_archive, read_tombstones, TOMBSTONE_SUFFIX
+from backend.models.steering_path import SteeringPath
+from backend.services import file_handler
+from backend.services.settings import settings
+
+
+def paths(count=4):
+    return [(f"P{i}.json", {"vehicle": f"GMC2500Gen4_attempt{i}_rev0_job1", "segments": random_segments(3 + i, seed=i)})
+            for i in range(count)]
+
+
+def test_round_trip(tmp_path):
+    archive_path = str(tmp_path / "paths.pva")
+    items = paths()
+    assert write_archive(archive_path, items) == len(items)
+    archive = PathArchive(archive_path)
+    assert len(archive) == len(items)
+    assert archive.list_vehicle_paths() == [(filename, data["vehicle"]) for filename, data in items]
+    for filename, data in items:
+        path = archive.load_steering_path(filename)
+        np.testing.assert_array_equal(path.data, SteeringPath.from_dict(data).data)
+        # Served straight from the map, read-only
+        assert not path.data.flags.writeable
+        assert archive.load_path_data(filename) == SteeringPath.from_dict(data).to_dict()
+    assert archive.filename_for_vehicle("GMC2500Gen4_attempt2_rev0_job1") == "P2.json"
+
+
+def test_empty_and_foreign_files(tmp_path):
+    empty = str(tmp_path / "empty.pva")
+    assert write_archive(empty, []) == 0
+    assert len(PathArchive(empty)) == 0
+    foreign = tmp_path / "foreign.pva"
+    foreign.write_bytes(b"NOTANARCHIVE" + bytes(20))
+    with pytest.raises(ValueError):
+        PathArchive(str(foreign))
+
+
+def test_tombstones_hide_paths_across_instances(tmp_path):
+    archive_path = str(tmp_path / "paths.pva")
+    write_archive(archive_path, paths())
+    archive = PathArchive(archive_path)
+    archive.mark_deleted("P1.json")
+    archive.mark_deleted("unknown.json")
+    assert "P1.json" not in archive and "P0.json" in archive
+    assert len(archive) == 3
+    assert "P1.json" not in dict(archive.list_vehicle_paths())
+    assert set(read_tombstones(archive_path)) == {"P1.json"}
+
+    other = PathArchive(archive_path)
+    assert "P1.json" not in other
+    # Another process deleting a path is picked up on refresh
+    PathArchive(archive_path).mark_deleted("P2.json")
+    other.refresh_deleted()
+    assert "P2.json" not in other
+
+
+def test_tombstones_older_than_the_archive_do_not_count(tmp_path):
+    archive_path = str(tmp_path / "paths.pva")
+    write_archive(archive_path, paths())
+    PathArchive(archive_path).mark_deleted("P1.json", when=time.time() - 3600)
+    assert "P1.json" in PathArchive(archive_path)
+
+    PathArchive(archive_path).mark_deleted("P1.json")
+    # Rewriting the archive later brings the path back
+    time.sleep(0.01)
+    write_archive(archive_path, paths())
+    rewritten = PathArchive(archive_path)
+    assert "P1.json" in rewritten
+    # and stale tombstones are dropped with the next deletion
+    rewritten.mark_deleted("P3.json")
+    assert "P3.json" not in rewritten
+    assert set(read_tombstones(archive_path)) == {"P3.json"}
+
+
+@pytest.fixture
+def archived(input_dir, tmp_path):
+    archive_path = str(tmp_path / "paths.pva")
+    write_archive(archive_path, paths())
+    old = time.time() - 60
+    os.utime(archive_path, (old, old))
+    settings.set_overrides(archive_path=archive_path)
+    return archive_path
+
+
+def test_file_handler_reads_through_the_archive(archived, input_dir):
+    write_path(input_dir, "P0.json", random_segments(9), "Ford350_attempt1_rev0_job1")
+    write_path(input_dir, "new.json", random_segments(2), "Ford350_attempt2_rev0_job1")
+    listed = dict(file_handler.list_vehicle_paths())
+    assert set(listed) == {"P0.json", "P1.json", "P2.json", "P3.json", "new.json"}
+    # The JSON copy is newer than the archive, so it wins
+    assert listed["P0.json"] == "Ford350_attempt1_rev0_job1"
+    assert len(file_handler.read_steering_path("P0.json")) == 9
+    assert len(file_handler.read_steering_path("P2.json")) == 5
+
+
+def test_deleting_an_archived_path(archived, input_dir):
+    write_path(input_dir, "P0.json", random_segments(9), "Ford350_attempt1_rev0_job1")
+    file_handler.delete_path_data("P1.json")
+    file_handler.delete_path_data("P0.json")
+    listed = dict(file_handler.list_vehicle_paths())
+    assert set(listed) == {"P2.json", "P3.json"}
+    assert os.path.exists(archived + TOMBSTONE_SUFFIX)
+    with pytest.raises(FileNotFoundError):
+        file_handler.delete_path_data("missing.json")
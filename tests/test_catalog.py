@@ -0,0 +1,113 @@
+# tests/test_catalog.py
+import os
+import json
+import shutil
+import pytest
+
+import baseline
+from conftest import SAMPLE_DIR, write_path
+from benchmarks.synthetic import random_segments
+from backend.services import catalog, file_handler
+from backend.services.catalog import (
+    INDEX_FILENAME, scan_catalog, refresh_entries, catalog_paths, diff_entries, load_index,
+)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Filenames read_vehicle_id was called for."""
+    calls = []
+    real = catalog.read_vehicle_id
+    monkeypatch.setattr(catalog, "read_vehicle_id", lambda filepath: calls.append(os.path.basename(filepath))
+                        or real(filepath))
+    return calls
+
+
+def test_listing_matches_original(input_dir):
+    for filename in os.listdir(SAMPLE_DIR):
+        shutil.copy(os.path.join(SAMPLE_DIR, filename), input_dir)
+    write_path(input_dir, "empty_vehicle.json", random_segments(3), vehicle="")
+    (input_dir / "no_vehicle.json").write_text(json.dumps({"segments": []}))
+    (input_dir / "broken.json").write_text('{"vehicle": "V", "segments": [')
+    (input_dir / "notes.txt").write_text("not a path")
+    (input_dir / "folder.json").mkdir()
+
+    expected = sorted(baseline.list_vehicle_paths(input_dir))
+    assert ("empty_vehicle.json", "") in expected
+    assert sorted(file_handler.list_vehicle_paths()) == expected
+    # Second call is served from the index and lists the same
+    assert sorted(file_handler.list_vehicle_paths()) == expected
+
+
+def test_scan_parses_only_new_or_changed_files(input_dir, parses):
+    for i in range(3):
+        write_path(input_dir, f"P{i}.json", random_segments(4, seed=i), f"V{i}")
+    entries = scan_catalog(str(input_dir))
+    assert sorted(parses) == ["P0.json", "P1.json", "P2.json"]
+    assert load_index(str(input_dir)) == entries
+
+    parses.clear()
+    write_path(input_dir, "P1.json", random_segments(9, seed=1), "V1b")
+    os.remove(input_dir / "P2.json")
+    entries = scan_catalog(str(input_dir))
+    assert parses == ["P1.json"]
+    assert sorted(catalog_paths(entries)) == [("P0.json", "V0"), ("P1.json", "V1b")]
+
+    parses.clear()
+    assert scan_catalog(str(input_dir)) == entries
+    assert parses == []
+
+
+def test_unreadable_index_is_rebuilt(input_dir, parses):
+    write_path(input_dir, "P0.json", random_segments(4), "V0")
+    (input_dir / INDEX_FILENAME).write_text("{not json")
+    assert catalog_paths(scan_catalog(str(input_dir))) == [("P0.json", "V0")]
+    assert parses == ["P0.json"]
+    assert load_index(str(input_dir))["P0.json"][2] == "V0"
+
+
+def test_refresh_entries_touches_only_named_files(input_dir, parses):
+    for i in range(3):
+        write_path(input_dir, f"P{i}.json", random_segments(4, seed=i), f"V{i}")
+    entries = scan_catalog(str(input_dir))
+    parses.clear()
+
+    write_path(input_dir, "P0.json", random_segments(5), "V0b")
+    write_path(input_dir, "P3.json", random_segments(5), "V3")
+    write_path(input_dir, "P1.json", random_segments(6), "V1b")
+    os.remove(input_dir / "P2.json")
+    refreshed = refresh_entries(str(input_dir), entries, ["P0.json", "P2.json", "P3.json"])
+    assert sorted(parses) == ["P0.json", "P3.json"]
+    # P1 was not named, so its old entry stays until the next full scan
+    assert sorted(catalog_paths(refreshed)) == [("P0.json", "V0b"), ("P1.json", "V1"), ("P3.json", "V3")]
+    assert entries["P2.json"][2] == "V2"
+    assert load_index(str(input_dir)) == refreshed
+
+
+def test_diff_entries():
+    old = {
+        "same.json": [1, 10, "A"],
+        "changed.json": [1, 10, "B"],
+        "renamed.json": [1, 10, "C"],
+        "gone.json": [1, 10, "D"],
+        "broken_now.json": [1, 10, "E"],
+        "fixed.json": [1, 10, None],
+        "still_broken.json": [1, 10, None],
+        "emptied.json": [1, 10, "F"],
+    }
+    new = {
+        "same.json": [1, 10, "A"],
+        "changed.json": [2, 10, "B"],
+        "renamed.json": [1, 10, "C2"],
+        "broken_now.json": [2, 11, None],
+        "fixed.json": [2, 11, "G"],
+        "still_broken.json": [2, 12, None],
+        "emptied.json": [2, 10, ""],
+        "new.json": [3, 10, "H"],
+        "new_broken.json": [3, 10, None],
+    }
+    added, modified, removed = diff_entries(old, new)
+    assert sorted(added) == [("fixed.json", "G"), ("new.json", "H")]
+    assert sorted(modified) == [("changed.json", "B"), ("emptied.json", ""), ("renamed.json", "C2")]
+    assert sorted(removed) == [("broken_now.json", "E"), ("gone.json", "D")]
+    assert diff_entries(new, new) == ([], [], [])
@@ -0,0 +1,109 @@
+# tests/test_catalog_watcher.py
+import os
+import time
+import threading
+import pytest
+
+from conftest import write_path
+from benchmarks.synthetic import random_segments
+from backend.services.settings import settings
+from gui import catalog_watcher
+from gui.catalog_watcher import PathCatalog
+
+
+def test_stop_ends_a_running_stats_pass(qapp, monkeypatch):
+    started = threading.Event()
+
+    def slow_update(items, should_stop):
+        started.set()
+        deadline = time.monotonic() + 10
+        while not should_stop():
+            assert time.monotonic() < deadline, "should_stop never fired"
+            time.sleep(0.01)
+        return set()
+
+    monkeypatch.setattr(catalog_watcher, "update_fleet_stats", slow_update)
+    catalog = PathCatalog()
+    catalog.update_stats()
+    assert started.wait(5)
+
+    began = time.monotonic()
+    catalog.stop()
+    catalog._stats_executor.shutdown(wait=True)
+    assert time.monotonic() - began < 2
+    # Nothing is scheduled on the shut-down executors any more
+    catalog.update_stats()
+    catalog.rescan()
+
+
+def wait_for(qapp, condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        qapp.processEvents()
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def catalog(qapp, input_dir):
+    settings.set_overrides(fleet_stats=False)
+    for i in range(3):
+        write_path(input_dir, f"P{i}.json", random_segments(5, seed=i), f"GMC2500Gen4_attempt{i}_rev0_job1")
+    catalog = PathCatalog()
+    yield catalog
+    catalog.stop()
+
+
+def existing_rows(screen):
+    return sorted(screen.path_list.item(row).text() for row in range(screen.path_list.count()))
+
+
+def test_screens_are_primed_from_the_snapshot(qapp, catalog, input_dir):
+    from gui.widgets.existing_paths_screen import ExistingPathsScreen
+    from gui.widgets.compare_paths_screen import ComparePathsScreen
+    catalog.start()
+    existing = ExistingPathsScreen(lambda: None, catalog)
+    # Nothing is listed from storage while the snapshot is on its way
+    assert not catalog.primed and existing.path_list.count() == 0
+    wait_for(qapp, lambda: catalog.primed)
+    assert existing_rows(existing) == [f"GMC2500Gen4_attempt{i}_rev0_job1" for i in range(3)]
+
+    # A screen built later starts from the catalog's current entries
+    write_path(input_dir, "P3.json", random_segments(5, seed=3), "Ford350_attempt1_rev0_job1")
+    wait_for(qapp, lambda: len(catalog.entries) == 4)
+    compare = ComparePathsScreen(lambda: None, catalog)
+    assert compare.pathA_widget['list_widget'].count() == 4
+    assert len(existing_rows(existing)) == 4
+
+
+def test_deltas_follow_the_directory(qapp, catalog, input_dir):
+    from gui.widgets.compare_paths_screen import ComparePathsScreen
+    changes = []
+    catalog.paths_changed.connect(lambda *delta: changes.append(delta))
+    catalog.start()
+    wait_for(qapp, lambda: catalog.primed)
+    compare = ComparePathsScreen(lambda: None, catalog)
+    names = compare.pathB_widget['list_widget']
+
+    write_path(input_dir, "P0.json", random_segments(5, seed=0), "GMC2500Gen4_attempt9_rev0_job1")
+    os.remove(input_dir / "P1.json")
+    wait_for(qapp, lambda: ("P1.json" not in catalog.entries
+                            and dict(catalog.paths()).get("P0.json") == "GMC2500Gen4_attempt9_rev0_job1"))
+    assert sorted(names.item(row).text() for row in range(names.count())) == [
+        "GMC2500Gen4_attempt2_rev0_job1", "GMC2500Gen4_attempt9_rev0_job1"]
+    added, modified, removed = ({f for delta in changes for f, _ in delta[i]} for i in range(3))
+    assert (added, modified, removed) == (set(), {"P0.json"}, {"P1.json"})
+
+
+def test_stop_tears_down_the_watcher(qapp, catalog, input_dir):
+    catalog.start()
+    wait_for(qapp, lambda: catalog.primed)
+    assert catalog.watching and catalog._watcher is not None
+    catalog.stop()
+    assert not catalog.watching and catalog._watcher is None
+    write_path(input_dir, "P9.json", random_segments(5, seed=9))
+    deadline = time.monotonic() + 1.0
+    while time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.01)
+    assert "P9.json" not in catalog.entries
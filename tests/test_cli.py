@@ -0,0 +1,152 @@
+# tests/test_cli.py
+import os
+import json
+import shutil
+import numpy as np
+import pytest
+
+import cli
+from conftest import sample_files, write_path
+from backend.database.archive import PathArchive
+from backend.database.db import PathDatabase
+from backend.services import fleet_stats
+from backend.services.comparator import compare_paths, compare_paths_resampled
+from backend.services.corridor import corridor_check
+from backend.services.file_handler import load_steering_path
+
+REFERENCE = "GMC2500Gen4_attempt1_rev0_job12345672.json"
+
+
+@pytest.fixture
+def samples(input_dir):
+    for filepath in sample_files():
+        shutil.copy(filepath, input_dir)
+    return sorted(os.path.basename(f) for f in sample_files())
+
+
+def run(capsys, *argv):
+    capsys.readouterr()
+    assert cli.main(list(argv)) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def segments_of(directory, filename):
+    with open(os.path.join(directory, filename)) as f:
+        return json.load(f)["segments"]
+
+
+def test_list_and_search(samples, input_dir, capsys):
+    records = run(capsys, "list")
+    assert sorted(r["filename"] for r in records) == samples
+    for record in records:
+        with open(os.path.join(input_dir, record["filename"])) as f:
+            assert record["vehicle"] == json.load(f)["vehicle"]
+
+    records = run(capsys, "search", "gmc|2500", "--revision", "1")
+    assert sorted(r["filename"] for r in records) == [
+        "GMC2500Gen4_attempt1_rev1_job12345686.json", "GMC2500Gen4_attempt1_rev1_job12345687.json"]
+    records = run(capsys, "search", "--job", "12345678")
+    assert sorted(r["filename"] for r in records) == [f for f in samples if f.startswith("Ford")]
+    assert run(capsys, "search", "ford", "--attempt", "2-") == []
+
+
+def test_search_rejects_bad_ranges(samples, capsys):
+    capsys.readouterr()
+    assert cli.main(["search", "--attempt", "two"]) == 2
+    captured = capsys.readouterr()
+    assert captured.out == "" and "[ERROR] Invalid range" in captured.err
+
+
+def test_compare(samples, input_dir, capsys):
+    other = "Ford350_attempt1_rev0_job12345678.json"
+    [record] = run(capsys, "compare", REFERENCE, other)
+    expected = compare_paths(segments_of(input_dir, REFERENCE), segments_of(input_dir, other))
+    assert record["reference"] == REFERENCE and record["filename"] == other
+    assert record["vehicle"] == other[:-5]
+    assert record["avg_deviation"] == pytest.approx(expected["avg_deviation"], abs=1e-9)
+    assert record["max_deviation"] == pytest.approx(expected["max_deviation"], abs=1e-9)
+
+    [record] = run(capsys, "compare", REFERENCE, other, "--step", "0.5")
+    expected = compare_paths_resampled(segments_of(input_dir, REFERENCE), segments_of(input_dir, other), step=0.5)
+    assert record["avg_deviation"] == pytest.approx(expected["avg_deviation"], abs=1e-9)
+    assert record["sample_count"] == expected["sample_count"]
+    assert record["max_deviation_at"] == pytest.approx(expected["max_deviation_at"])
+
+
+def test_compare_missing_file_exits_with_one(samples, capsys):
+    capsys.readouterr()
+    assert cli.main(["compare", REFERENCE, "nope.json"]) == 1
+    captured = capsys.readouterr()
+    assert captured.out == "" and "[ERROR]" in captured.err
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_compare_all(samples, input_dir, capsys, jobs):
+    write_path(input_dir, "broken.json", [{"shaft_length": 1.0}], vehicle="GMC2500Gen4_attempt9_rev0_job1")
+    records = run(capsys, "compare-all", REFERENCE, "--search", "GMC", "--jobs", jobs)
+    by_file = {r["filename"]: r for r in records}
+    expected_files = [f for f in samples if f.startswith("GMC") and f != REFERENCE] + ["broken.json"]
+    assert sorted(by_file) == sorted(expected_files)
+    assert "error" in by_file.pop("broken.json")
+    for filename, record in by_file.items():
+        expected = compare_paths(segments_of(input_dir, REFERENCE), segments_of(input_dir, filename))
+        assert record["reference"] == REFERENCE
+        assert record["avg_deviation"] == pytest.approx(expected["avg_deviation"], abs=1e-9)
+        assert record["max_deviation"] == pytest.approx(expected["max_deviation"], abs=1e-9)
+
+
+@pytest.mark.parametrize("jobs", ["1", "2"])
+def test_corridor(samples, capsys, jobs):
+    records = run(capsys, "corridor", REFERENCE, "--tolerance", "5", "--step", "1", "--jobs", jobs)
+    assert sorted(r["filename"] for r in records) == [f for f in samples if f != REFERENCE]
+    reference = load_steering_path(REFERENCE)
+    for record in records:
+        expected = corridor_check(reference, load_steering_path(record["filename"]), 5.0, 1.0)
+        assert record["tolerance"] == 5.0
+        assert record["passed"] == expected["passed"]
+        assert record["max_distance"] == pytest.approx(expected["max_distance"])
+
+
+def test_stats(samples, capsys, monkeypatch):
+    monkeypatch.setattr(fleet_stats, "_fleet_stats", None)
+    records = run(capsys, "stats", "--search", "gmc", "--scores")
+    summaries = [r for r in records if "paths" in r]
+    scores = [r for r in records if "score" in r]
+    assert [s["family"] for s in summaries] == ["GMC|2500|Gen4"]
+    assert summaries[0]["paths"] == 6
+    assert sorted(s["filename"] for s in scores) == [f for f in samples if f.startswith("GMC")]
+
+
+def test_similar(samples, input_dir, capsys):
+    records = run(capsys, "similar", REFERENCE, "--top", "3")
+    assert [r["rank"] for r in records] == [1, 2, 3]
+    reference = segments_of(input_dir, REFERENCE)
+    deviations = sorted(compare_paths(reference, segments_of(input_dir, f))["avg_deviation"]
+                        for f in samples if f != REFERENCE)
+    np.testing.assert_allclose([r["avg_deviation"] for r in records], deviations[:3], atol=1e-9)
+    assert REFERENCE not in [r["filename"] for r in records]
+
+
+@pytest.mark.parametrize("fmt", ["archive", "sqlite", "json"])
+def test_export_round_trips(samples, tmp_path, capsys, fmt):
+    output = str(tmp_path / f"export.{fmt}")
+    [summary] = run(capsys, "export", fmt, output, "--search", "Ford")
+    ford = [f for f in samples if f.startswith("Ford")]
+    assert summary == {"format": fmt, "output": output, "count": len(ford)}
+
+    if fmt == "archive":
+        store = PathArchive(output)
+        loaded = {f: store.load_steering_path(f) for f in ford}
+        listed = store.list_vehicle_paths()
+    elif fmt == "sqlite":
+        store = PathDatabase(output)
+        loaded = {f: store.load_steering_path(f) for f in ford}
+        listed = store.list_vehicle_paths()
+        store.close()
+    else:
+        assert sorted(os.listdir(output)) == ford
+        loaded = {f: load_steering_path(f) for f in ford}
+        listed = [(f, json.load(open(os.path.join(output, f)))["vehicle"]) for f in ford]
+    assert sorted(listed) == [(f, f[:-5]) for f in ford]
+    for filename, path in loaded.items():
+        np.testing.assert_array_equal(path.data, load_steering_path(filename).data)
@@ -0,0 +1,114 @@
+# tests/test_corridor.py
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import random_segments
+from backend.models.steering_path import SteeringPath
+from backend.services import corridor as corridor_module
+from backend.services.corridor import Corridor, corridor_check
+from backend.services.kinematics import compute_segments_points
+
+
+def point_to_polyline(point, polyline):
+    """Distance from one point to a polyline, one segment at a time."""
+    if len(polyline) == 1:
+        return float(np.linalg.norm(point - polyline[0]))
+    best = np.inf
+    for a, b in zip(polyline[:-1], polyline[1:]):
+        direction = b - a
+        sq = float(direction @ direction)
+        t = 0.0 if sq == 0 else min(1.0, max(0.0, float((point - a) @ direction) / sq))
+        best = min(best, float(np.linalg.norm(point - (a + t * direction))))
+    return best
+
+
+def walk(rng, n, scale=1.0):
+    return np.vstack([np.zeros((1, 3)), np.cumsum(rng.normal(scale=scale, size=(n, 3)), axis=0)])
+
+
+@pytest.mark.parametrize("reference_size", [0, 1, 2, 31, 32, 33, 400])
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+def test_distances_match_brute_force(reference_size, chunk_size):
+    rng = np.random.default_rng(reference_size * 7 + chunk_size)
+    reference = walk(rng, reference_size)
+    samples = rng.normal(scale=4.0, size=(150, 3))
+    expected = [point_to_polyline(p, reference) for p in samples]
+    np.testing.assert_allclose(Corridor(reference, chunk_size).distances(samples), expected, atol=1e-9)
+
+
+def test_degenerate_reference_segments():
+    rng = np.random.default_rng(2)
+    reference = np.repeat(walk(rng, 40), 3, axis=0)
+    samples = rng.normal(scale=3.0, size=(80, 3))
+    expected = [point_to_polyline(p, reference) for p in samples]
+    np.testing.assert_allclose(Corridor(reference).distances(samples), expected, atol=1e-9)
+
+
+@pytest.mark.parametrize("chunk_size", [3, 64])
+def test_check_matches_brute_force(chunk_size):
+    rng = np.random.default_rng(chunk_size)
+    reference = walk(rng, 300)
+    candidate = reference + rng.normal(scale=0.3, size=reference.shape)
+    distances = np.array([point_to_polyline(p, reference) for p in candidate])
+    arc = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(candidate, axis=0), axis=1))))
+    tolerance = float(np.quantile(distances, 0.9))
+
+    result = Corridor(reference, chunk_size).check(candidate, tolerance)
+    assert result['passed'] is False
+    assert result['first_violation'] == pytest.approx(arc[np.argmax(distances > tolerance)])
+    assert result['max_distance'] == pytest.approx(distances.max())
+    assert result['max_distance_at'] == pytest.approx(arc[distances.argmax()])
+    assert result['mean_distance'] == pytest.approx(distances.mean())
+    assert result['sample_count'] == len(candidate)
+
+    fast = Corridor(reference, chunk_size).check(candidate, tolerance, fail_fast=True)
+    assert fast['passed'] is False
+    assert fast['first_violation'] == pytest.approx(result['first_violation'])
+    assert 'max_distance' not in fast
+
+
+def test_tolerance_is_inclusive():
+    reference = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+    candidate = np.array([[0.0, 1.0, 0.0], [5.0, 2.0, 0.0], [10.0, 1.0, 0.0]])
+    assert corridor_check(reference, candidate, 2.0)['passed']
+    assert corridor_check(reference, candidate, 2.0, fail_fast=True)['passed']
+    result = corridor_check(reference, candidate, 1.5)
+    assert not result['passed']
+    assert result['first_violation'] == pytest.approx(np.hypot(5.0, 1.0))
+
+
+def test_step_samples_between_vertices():
+    # Vertices stay inside; only the middle of the long candidate segment leaves the corridor
+    reference = np.array([[0.0, 0.0, 0.0], [5.0, 3.0, 0.0], [10.0, 0.0, 0.0]])
+    candidate = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+    assert corridor_check(reference, candidate, 1.0)['passed']
+    result = corridor_check(reference, candidate, 1.0, step=0.5)
+    assert not result['passed']
+    assert result['sample_count'] == 21
+    assert result['max_distance'] == pytest.approx(point_to_polyline(np.array([5.0, 0.0, 0.0]), reference))
+
+
+def test_single_point_candidate():
+    reference = np.array([[0.0, 0.0, 0.0], [10.0, 0.0, 0.0]])
+    result = corridor_check(reference, np.array([[3.0, 4.0, 0.0]]), 5.0, step=1.0)
+    assert result['passed'] and result['sample_count'] == 1
+    assert result['max_distance'] == pytest.approx(4.0)
+
+
+def test_accepts_paths_and_segments():
+    reference_segments = random_segments(50, seed=1)
+    candidate_segments = random_segments(40, seed=2)
+    reference = SteeringPath.from_dict({"vehicle": "V", "segments": reference_segments})
+    expected = corridor_check(compute_segments_points(reference_segments),
+                              compute_segments_points(candidate_segments), 25.0)
+    assert corridor_check(reference, candidate_segments, 25.0) == expected
+
+
+def test_long_reference_uses_block_index(monkeypatch):
+    # A small pair budget forces _distances to split the work as well
+    monkeypatch.setattr(corridor_module, "MAX_PAIRS", 50)
+    rng = np.random.default_rng(9)
+    reference = walk(rng, 2000, scale=0.5)
+    samples = reference[::37] + rng.normal(scale=1.0, size=reference[::37].shape)
+    expected = [point_to_polyline(p, reference) for p in samples]
+    np.testing.assert_allclose(Corridor(reference).distances(samples), expected, atol=1e-9)
@@ -0,0 +1,122 @@
+# tests/test_db.py
+import json
+import argparse
+import numpy as np
+import pytest
+
+import cli
+from conftest import write_path
+from benchmarks.synthetic import random_segments
+from backend.database.db import PathDatabase
+from backend.models.steering_path import SteeringPath
+from backend.services import file_handler
+from backend.services.search import VehicleSearchIndex, parse_range
+from backend.services.settings import settings
+
+BASES = ["GMC2500Gen4", "GMC3500Gen4", "Ford350", "Ford250Gen05", "Ram1500Gen2"]
+
+
+def fleet(count=60, seed=0):
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(count):
+        base = BASES[rng.integers(len(BASES))]
+        job = rng.choice(["12345678", "1234ab", "1234AB"])
+        vehicle = f"{base}_attempt{rng.integers(1, 6)}_rev{rng.integers(0, 4)}_job{job}"
+        paths.append((f"path{i}.json", SteeringPath.from_dict({"vehicle": vehicle,
+                                                               "segments": random_segments(5, seed=i)})))
+    return paths
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = PathDatabase(str(tmp_path / "paths.db"))
+    database.save_many(fleet())
+    yield database
+    database.close()
+
+
+def test_round_trip(tmp_path):
+    database = PathDatabase(str(tmp_path / "paths.db"))
+    paths = fleet(5)
+    database.save_many(paths)
+    for filename, path in paths:
+        loaded = database.load_steering_path(filename)
+        assert loaded.vehicle_id == path.vehicle_id
+        np.testing.assert_array_equal(loaded.data, path.data)
+    database.delete_path("path0.json")
+    with pytest.raises(FileNotFoundError):
+        database.load_steering_path("path0.json")
+    assert len(database.list_vehicle_paths()) == 4
+
+
+def test_filter_columns_are_indexed(database):
+    for column, value in [("attempt", 2), ("revision", (1, 2)), ("job", "1234ab"), ("model", "2500")]:
+        query = "SELECT filename FROM paths WHERE " + (
+            f"{column} BETWEEN ? AND ?" if isinstance(value, tuple) else f"{column} = ?")
+        plan = " ".join(row[-1] for row in database.conn.execute(
+            "EXPLAIN QUERY PLAN " + query, value if isinstance(value, tuple) else (value,)))
+        assert "USING INDEX" in plan or "USING COVERING INDEX" in plan, plan
+
+
+@pytest.mark.parametrize("attempt, revision, job", [
+    (None, None, None), ("2", None, None), ("2-4", None, None), ("3-", "1", None), ("-2", "0-1", None),
+    (None, None, "1234AB"), (None, None, "1234ab"), ("1-5", "any", "12345678"), ("9", None, None),
+])
+def test_filters_match_the_search_index(database, attempt, revision, job):
+    all_paths = database.list_vehicle_paths()
+    index = VehicleSearchIndex(all_paths)
+    expected = sorted(index.search("", parse_range(attempt), parse_range(revision), job))
+    filtered = database.list_vehicle_paths(attempt=parse_range(attempt), revision=parse_range(revision), job=job)
+    assert sorted(filename for filename, _ in filtered) == expected
+
+
+def test_exact_column_filters(database):
+    for filename, vehicle in database.list_vehicle_paths(brand="Ford", gen="Gen05"):
+        assert vehicle.startswith("Ford250Gen05_")
+    assert len(database.list_vehicle_paths(brand="Ford", gen="Gen05")) == sum(
+        vehicle.startswith("Ford250Gen05_") for _, vehicle in database.list_vehicle_paths())
+
+
+def test_catalog_entries_change_when_a_path_is_saved(database):
+    before = database.catalog_entries()
+    assert set(before) == {filename for filename, _ in database.list_vehicle_paths()}
+    database.save_path_data("path3.json", {"vehicle": "Ford350_attempt1_rev0_job1", "segments": random_segments(7)})
+    after = database.catalog_entries()
+    assert after["path3.json"][1:] == [7, "Ford350_attempt1_rev0_job1"]
+    assert after["path3.json"][0] != before["path3.json"][0]
+    assert {f: e for f, e in after.items() if f != "path3.json"} == {
+        f: e for f, e in before.items() if f != "path3.json"}
+
+
+def test_import_json_dir_skips_files_without_a_vehicle(tmp_path):
+    source = tmp_path / "src"
+    source.mkdir()
+    write_path(source, "a.json", random_segments(3))
+    (source / "b.json").write_text(json.dumps({"segments": []}))
+    (source / "c.json").write_text("{broken")
+    database = PathDatabase(str(tmp_path / "paths.db"))
+    assert database.import_json_dir(str(source)) == 1
+    assert [f for f, _ in database.list_vehicle_paths()] == ["a.json"]
+
+
+def filter_args(text="", attempt="", revision="", job=None):
+    return argparse.Namespace(text=text, attempt=attempt, revision=revision, job=job)
+
+
+@pytest.mark.parametrize("args", [
+    filter_args(), filter_args("gmc"), filter_args("GMC|2500", attempt="1-"), filter_args(revision="1"),
+    filter_args("ford", job="12345678"), filter_args(attempt="7"),
+])
+def test_cli_filters_agree_across_storage(input_dir, tmp_path, monkeypatch, args):
+    for filename, path in fleet(40, seed=3):
+        with open(input_dir / filename, "w") as f:
+            json.dump(path.to_dict(), f)
+    from_json = sorted(cli.filtered_paths(args))
+
+    settings.set_overrides(storage="sqlite", database_path=str(tmp_path / "paths.db"))
+    file_handler.get_database().import_json_dir(str(input_dir))
+    if args.text or args.attempt or args.revision or args.job:
+        # Filtered listings go through the indexed query, not the full listing
+        monkeypatch.setattr(file_handler, "list_vehicle_paths", lambda: pytest.fail("listed every row"))
+    assert sorted(cli.filtered_paths(args)) == from_json
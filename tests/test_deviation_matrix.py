@@ -0,0 +1,94 @@
+# tests/test_deviation_matrix.py
+import json
+import numpy as np
+import pytest
+
+import cli
+from conftest import write_path
+from benchmarks.synthetic import random_segments
+from backend.models.steering_path import SteeringPath
+from backend.services.comparator import compare_paths
+from backend.services.deviation_matrix import deviation_matrix, family_deviation_matrix
+
+
+def expected_matrix(paths):
+    n = len(paths)
+    expected = np.zeros((2, n, n))
+    for i in range(n):
+        for j in range(n):
+            result = compare_paths(paths[i], paths[j])
+            expected[:, i, j] = result['avg_deviation'], result['max_deviation']
+    return expected
+
+
+@pytest.fixture(scope="module")
+def fleet(ragged_fleet):
+    # Ragged lengths, an empty path and a few near-identical attempts
+    paths = ragged_fleet[:10] + [random_segments(40, seed=100 + i) for i in range(3)]
+    return paths, expected_matrix(paths)
+
+
+@pytest.mark.parametrize("kwargs", [
+    {}, {"tile_size": 3}, {"jobs": 2, "tile_size": 4}, {"jobs": 1, "tile_size": 5, "out_path": True},
+])
+def test_matrix_matches_compare_paths(fleet, tmp_path, kwargs):
+    paths, expected = fleet
+    if kwargs.get("out_path"):
+        kwargs = {**kwargs, "out_path": str(tmp_path / "matrix.npy")}
+    result = deviation_matrix(paths, **kwargs)
+    assert result.shape == expected.shape and result.dtype == np.float64
+    np.testing.assert_allclose(result, expected, rtol=1e-9, atol=1e-9)
+    if kwargs.get("out_path"):
+        np.testing.assert_array_equal(np.load(kwargs["out_path"]), result)
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_float32_matrix_matches_compare_paths(fleet, jobs):
+    paths, expected = fleet
+    result = deviation_matrix(paths, jobs=jobs, float32=True, tile_size=4)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, expected, rtol=1e-4, atol=1e-3)
+
+
+def test_matrix_accepts_paths_and_point_arrays(fleet):
+    paths, expected = fleet
+    mixed = [SteeringPath.from_dict({"vehicle": "X", "segments": p}) if i % 2 else p for i, p in enumerate(paths)]
+    mixed[3] = compare_paths(paths[3], paths[3])['points1']
+    np.testing.assert_allclose(deviation_matrix(iter(mixed)), expected, atol=1e-9)
+
+
+def test_empty_fleet():
+    assert deviation_matrix([]).shape == (2, 0, 0)
+    assert deviation_matrix([], jobs=2).shape == (2, 0, 0)
+
+
+def test_family_matrix_loads_files(input_dir, fleet):
+    paths, expected = fleet
+    names = [write_path(input_dir, f"p{i}.json", p) for i, p in enumerate(paths[:5])]
+    np.testing.assert_allclose(family_deviation_matrix(names, jobs=2, tile_size=2), expected[:, :5, :5], atol=1e-9)
+
+
+def run_cli(capsys, *argv):
+    capsys.readouterr()
+    assert cli.main(list(argv)) == 0
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_cli_matrix_emits_each_pair(input_dir, fleet, capsys, tmp_path):
+    paths, expected = fleet
+    for i, p in enumerate(paths[:4]):
+        write_path(input_dir, f"p{i}.json", p, vehicle=f"Ram1500_attempt{i}_rev0_job1")
+    write_path(input_dir, "other.json", paths[5], vehicle="Ford350_attempt1_rev0_job1")
+
+    records = run_cli(capsys, "matrix", "--search", "ram", "--jobs", "1")
+    assert len(records) == 6
+    for record in records:
+        i, j = int(record["a"][1]), int(record["b"][1])
+        assert record["avg_deviation"] == pytest.approx(expected[0, i, j], abs=1e-9)
+        assert record["max_deviation"] == pytest.approx(expected[1, i, j], abs=1e-9)
+
+    target = str(tmp_path / "fleet.npy")
+    [summary] = run_cli(capsys, "matrix", "--output", target, "--jobs", "2")
+    assert summary["count"] == 5 and summary["output"] == target
+    order = [int(name[1]) if name.startswith("p") else 5 for name in summary["filenames"]]
+    np.testing.assert_allclose(np.load(target), expected[:, order][:, :, order], atol=1e-9)
@@ -0,0 +1,164 @@
+# tests/test_fleet_stats.py
+import numpy as np
+import pytest
+
+from conftest import write_path
+from benchmarks.synthetic import random_segments
+from backend.services.fleet_stats import RunningStats, FamilyStats, FleetStats, family_key, SEGMENT_FIELDS
+
+
+def ragged_samples(seed=0, count=12, dims=3):
+    rng = np.random.default_rng(seed)
+    return [rng.normal(loc=5.0, scale=2.0, size=(int(n), dims)) for n in rng.integers(1, 40, count)]
+
+
+def row_stats(samples, n_rows, dims):
+    """Mean and sample variance of every row over the samples that reach it, with numpy."""
+    mean = np.full((n_rows, dims), np.nan)
+    variance = np.full((n_rows, dims), np.nan)
+    count = np.zeros(n_rows, dtype=int)
+    for row in range(n_rows):
+        values = np.array([s[row] for s in samples if len(s) > row]).reshape(-1, dims)
+        count[row] = len(values)
+        if len(values):
+            mean[row] = values.mean(axis=0)
+        if len(values) > 1:
+            variance[row] = values.var(axis=0, ddof=1)
+    return count, mean, variance
+
+
+def accumulate(samples, dims=3):
+    stats = RunningStats(dims)
+    for values in samples:
+        stats.add(values)
+    return stats
+
+
+def test_welford_matches_numpy_on_ragged_samples():
+    samples = ragged_samples()
+    stats = accumulate(samples)
+    count, mean, variance = row_stats(samples, len(stats), 3)
+    np.testing.assert_array_equal(stats.count, count)
+    np.testing.assert_allclose(stats.mean, mean, atol=1e-12)
+    np.testing.assert_allclose(stats.variance(), variance, atol=1e-10)
+
+
+@pytest.mark.parametrize("leave_out", range(6))
+def test_without_matches_stats_of_the_others(leave_out):
+    samples = ragged_samples(seed=leave_out, count=6)
+    stats = accumulate(samples)
+    others = samples[:leave_out] + samples[leave_out + 1:]
+    values = samples[leave_out]
+
+    count, mean, variance = stats.without(values)
+    expected_count, expected_mean, expected_variance = row_stats(others, len(values), 3)
+    np.testing.assert_array_equal(count, expected_count)
+    np.testing.assert_allclose(mean, expected_mean, atol=1e-9)
+    np.testing.assert_allclose(variance, expected_variance, atol=1e-8)
+
+
+def test_without_edge_cases():
+    stats = accumulate([np.array([[1.0], [2.0]]), np.array([[3.0]])], dims=1)
+    count, mean, variance = stats.without(np.array([[1.0], [2.0]]))
+    # Row 0 keeps one sample: a mean but no variance; row 1 is left empty
+    np.testing.assert_array_equal(count, [1, 0])
+    assert mean[0, 0] == pytest.approx(3.0) and np.isnan(mean[1, 0])
+    assert np.isnan(variance).all()
+
+
+def test_without_identical_samples_is_not_negative():
+    row = np.array([[0.1, 0.2, 0.3]])
+    stats = accumulate([row.copy() for _ in range(5)])
+    _, _, variance = stats.without(row)
+    assert (variance >= 0).all()
+
+
+def test_without_longer_values_than_rows():
+    stats = accumulate(ragged_samples(count=3))
+    count, mean, variance = stats.without(np.zeros((len(stats) + 10, 3)))
+    assert len(count) == len(mean) == len(variance) == len(stats)
+
+
+def test_single_sample_has_no_variance():
+    stats = accumulate([np.ones((4, 2))], dims=2)
+    assert np.isnan(stats.variance()).all()
+    np.testing.assert_array_equal(stats.mean, np.ones((4, 2)))
+
+
+def test_round_trip():
+    stats = accumulate(ragged_samples())
+    restored = RunningStats.from_dict(stats.to_dict(), 3)
+    np.testing.assert_array_equal(restored.count, stats.count)
+    np.testing.assert_array_equal(restored.mean, stats.mean)
+    np.testing.assert_array_equal(restored.m2, stats.m2)
+    assert len(RunningStats.from_dict(RunningStats(3).to_dict(), 3)) == 0
+
+
+def family_paths(seed, count=8, n=20):
+    rng = np.random.default_rng(seed)
+    base = np.vstack([rng.uniform(5, 50, n), rng.uniform(-60, 60, (3, n))])
+    paths = []
+    for _ in range(count):
+        data = base + rng.normal(scale=[[0.5], [2.0], [2.0], [0.0]], size=base.shape)
+        points = np.vstack([np.zeros((1, 3)), np.cumsum(rng.normal(size=(n, 3)), axis=0)])
+        paths.append((data, points))
+    return paths
+
+
+def test_member_score_equals_score_against_the_others():
+    paths = family_paths(1)
+    family = FamilyStats("F")
+    for data, points in paths:
+        family.add(data, points)
+    others = FamilyStats("F")
+    for data, points in paths[1:]:
+        others.add(data, points)
+
+    member = family.score(*paths[0], member=True)
+    outside = others.score(*paths[0])
+    for key in ('score', 'segment_score', 'position_score'):
+        assert member[key] == pytest.approx(outside[key], rel=1e-6)
+    assert member['compared'] == len(paths[0][0].T)
+
+
+def test_agreeing_family_does_not_blow_up_small_differences():
+    # Every other path has exactly the same angles; a 2 degree difference on
+    # one segment must not dominate the score
+    data, points = family_paths(2, count=1)[0]
+    family = FamilyStats("F")
+    for _ in range(5):
+        family.add(data, points)
+    odd = data.copy()
+    odd[2, 4] += 2.0
+    family.add(odd, points)
+    score = family.score(odd, points, member=True)
+    assert score['segment_score'] < 3.0
+
+
+def test_too_few_paths_have_no_score():
+    data, points = family_paths(3, count=1)[0]
+    family = FamilyStats("F")
+    family.add(data, points)
+    assert family.score(data, points, member=True)['score'] is None
+    assert len(SEGMENT_FIELDS) == data.shape[0]
+
+
+@pytest.mark.parametrize("vehicle, family", [
+    ("GMC2500Gen4_attempt1_rev0_job12345672", "GMC|2500|Gen4"),
+    ("Ford350_attempt1_rev0_job12345678", "Ford|350"),
+])
+def test_family_key(vehicle, family):
+    assert family_key(vehicle) == family
+
+
+def test_update_stops_early_and_resumes(input_dir):
+    items = [(write_path(input_dir, f"P{i}.json", random_segments(30, seed=i), f"GMC2500Gen4_attempt{i}_rev0_job1"),
+              f"GMC2500Gen4_attempt{i}_rev0_job1") for i in range(6)]
+    stats = FleetStats()
+    calls = []
+    assert stats.update(items, should_stop=lambda: calls.append(1) or len(calls) > 2) == set()
+    assert stats.family("GMC|2500|Gen4") is None
+
+    assert stats.update(items) == {"GMC|2500|Gen4"}
+    assert stats.family("GMC|2500|Gen4").path_count == 6
+    assert stats.update(items) == set()
@@ -0,0 +1,138 @@
+# tests/test_journal.py
+import os
+import json
+import threading
+import pytest
+
+from backend.services import file_handler, journal as journal_module
+from backend.services.journal import (
+    COMPACT_EVERY, COMPACT_KEEP, ChangeJournal, JOURNAL_DIRNAME, LOCK_FILENAME, OP_DELETE, OP_SAVE,
+    STALE_LOCK_SECONDS,
+)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return ChangeJournal(str(tmp_path))
+
+
+def entry_files(journal):
+    return sorted(name for name in os.listdir(journal.directory) if name[:-5].isdigit())
+
+
+def test_append_and_changes_since(journal):
+    assert journal.head() == 0
+    assert journal.changes_since(0) == (0, [])
+    assert journal.append(OP_SAVE, "a.json", "h1") == 1
+    assert journal.append(OP_SAVE, "b.json", "h2") == 2
+    assert journal.append(OP_DELETE, "a.json") == 3
+
+    head, entries = journal.changes_since(1)
+    assert head == 3
+    assert [(e["seq"], e["op"], e["filename"], e["hash"]) for e in entries] == [
+        (2, OP_SAVE, "b.json", "h2"), (3, OP_DELETE, "a.json", None)]
+    assert journal.changes_since(3) == (3, [])
+    assert len(journal.changes_since(0)[1]) == 3
+    # Ahead of the journal: it was recreated, so rescan
+    assert journal.changes_since(7) == (3, None)
+
+
+def test_concurrent_clients_never_share_a_sequence(tmp_path):
+    clients = [ChangeJournal(str(tmp_path)) for _ in range(4)]
+    seqs = []
+    lock = threading.Lock()
+
+    def writer(client, k):
+        for i in range(25):
+            seq = client.append(OP_SAVE, f"{k}_{i}.json")
+            with lock:
+                seqs.append(seq)
+
+    threads = [threading.Thread(target=writer, args=(c, k)) for k, c in enumerate(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(seqs) == list(range(1, 101))
+    _, entries = clients[0].changes_since(0)
+    assert sorted(e["filename"] for e in entries) == sorted(f"{k}_{i}.json" for k in range(4) for i in range(25))
+
+
+def test_falls_back_to_exclusive_create_without_hard_links(journal, monkeypatch, capsys):
+    def no_links(src, dst):
+        raise PermissionError("operation not permitted")
+
+    monkeypatch.setattr(journal_module.os, "link", no_links)
+    assert journal.append(OP_SAVE, "a.json") == 1
+    assert journal.append(OP_SAVE, "b.json") == 2
+    assert "[WARN] Hard links not supported" in capsys.readouterr().out
+    assert not journal._hard_links
+    assert [e["filename"] for e in journal.changes_since(0)[1]] == ["a.json", "b.json"]
+    assert not [name for name in os.listdir(journal.directory) if name.endswith(".tmp")]
+
+
+def test_compact_folds_old_entries_into_the_snapshot(journal):
+    journal.append(OP_SAVE, "a.json", "h1")
+    journal.append(OP_SAVE, "b.json", "h2")
+    journal.append(OP_DELETE, "a.json")
+    journal.append(OP_SAVE, "b.json", "h3")
+    journal.append(OP_SAVE, "c.json", "h4")
+    journal.compact(keep=2)
+
+    assert journal.snapshot() == {"seq": 3, "files": {"b.json": "h2"}}
+    assert entry_files(journal) == ["000000000004.json", "000000000005.json"]
+    assert journal.head() == 5
+    assert [e["seq"] for e in journal.changes_since(3)[1]] == [4, 5]
+    # Clients behind the snapshot have to rescan
+    assert journal.changes_since(2) == (5, None)
+
+    journal.compact(keep=0)
+    assert journal.snapshot() == {"seq": 5, "files": {"b.json": "h3", "c.json": "h4"}}
+    assert entry_files(journal) == []
+    assert journal.head() == 5 and journal.changes_since(5) == (5, [])
+    assert journal.append(OP_SAVE, "d.json") == 6
+
+
+def test_append_compacts_automatically(journal):
+    total = COMPACT_EVERY + COMPACT_KEEP + 40
+    for i in range(total):
+        journal.append(OP_SAVE, f"{i % 5}.json", str(i))
+    assert COMPACT_KEEP <= len(entry_files(journal)) < COMPACT_EVERY + COMPACT_KEEP
+    snapshot = journal.snapshot()
+    assert snapshot["seq"] > 0
+    _, entries = journal.changes_since(snapshot["seq"])
+    files = dict(snapshot["files"])
+    files.update({e["filename"]: e["hash"] for e in entries})
+    assert files == {f"{i}.json": str(total - 5 + (i - total) % 5) for i in range(5)}
+
+
+def test_compaction_respects_a_fresh_lock_and_clears_a_stale_one(journal):
+    for i in range(4):
+        journal.append(OP_SAVE, f"{i}.json")
+    lock_path = os.path.join(journal.directory, LOCK_FILENAME)
+    open(lock_path, "w").close()
+    journal.compact(keep=1)
+    assert len(entry_files(journal)) == 4
+
+    old = os.path.getmtime(lock_path) - STALE_LOCK_SECONDS - 5
+    os.utime(lock_path, (old, old))
+    journal.compact(keep=1)
+    assert entry_files(journal) == ["000000000004.json"]
+    assert not os.path.exists(lock_path)
+
+
+def test_file_handler_records_saves_and_deletes(input_dir):
+    head, filenames = file_handler.journal_changes(None)
+    assert filenames is None
+    data = {"vehicle": "Ford350_attempt1_rev0_job1", "segments": []}
+    file_handler.save_path_data("a.json", data)
+    file_handler.save_path_data("b.json", data)
+    file_handler.save_path_data("a.json", data)
+    file_handler.delete_path_data("b.json")
+
+    head2, filenames = file_handler.journal_changes(head)
+    assert head2 == head + 4
+    assert filenames == ["a.json", "b.json"]
+    with open(os.path.join(input_dir, JOURNAL_DIRNAME, f"{head2:012d}.json")) as f:
+        assert json.load(f)["op"] == OP_DELETE
+    assert file_handler.journal_changes(head2) == (head2, [])
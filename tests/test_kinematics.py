@@ -0,0 +1,141 @@
+# tests/test_kinematics.py
+import numpy as np
+import pytest
+
+import baseline
+from backend.services import kinematics
+from backend.services.kinematics import (
+    MODE_ABSOLUTE, MODE_CHAINED, forward_kinematics, forward_kinematics_batch,
+    forward_kinematics_stream, segments_to_arrays, euler_quaternions, chain_quaternions,
+)
+from backend.services.comparator import compute_path_points, compare_paths
+from backend.services.settings import settings
+
+ATOL = 1e-9
+
+
+def reference_points(segments, mode):
+    lengths, yaw, pitch, roll = segments_to_arrays(segments)
+    if mode == MODE_CHAINED:
+        return baseline.compute_chained_path(lengths, yaw, pitch, roll)
+    return np.array(baseline.compute_path(lengths, yaw, pitch)).reshape(-1, 3)
+
+
+def split_blocks(segments, rng):
+    """(4, k) blocks of random sizes (empty ones included) covering all segments."""
+    data = np.vstack(segments_to_arrays(segments)) if segments else np.zeros((4, 0))
+    cuts = np.sort(rng.integers(0, data.shape[1] + 1, 4))
+    return np.split(data, cuts, axis=1)
+
+
+def test_forward_kinematics_matches_scalar_loop_on_samples(sample_segments):
+    for segments in sample_segments.values():
+        lengths, yaw, pitch, roll = segments_to_arrays(segments)
+        expected = np.array(baseline.compute_path(lengths, yaw, pitch))
+        np.testing.assert_allclose(forward_kinematics(lengths, yaw, pitch, roll), expected, atol=ATOL)
+
+
+@pytest.mark.parametrize("mode", [MODE_ABSOLUTE, MODE_CHAINED])
+def test_forward_kinematics_matches_scalar_loop_on_ragged_fleet(ragged_fleet, mode):
+    for segments in ragged_fleet:
+        points = forward_kinematics(*segments_to_arrays(segments), mode=mode)
+        assert points.shape == (len(segments) + 1, 3)
+        np.testing.assert_allclose(points, reference_points(segments, mode), atol=ATOL)
+
+
+def test_compute_path_points_matches_original(sample_segments, ragged_fleet):
+    for segments in list(sample_segments.values()) + ragged_fleet:
+        expected = np.array(baseline.compute_path_points(segments), dtype=np.float64).reshape(-1, 3)
+        np.testing.assert_allclose(compute_path_points(segments), expected, atol=ATOL)
+
+
+def test_compare_paths_matches_original(sample_segments):
+    paths = list(sample_segments.values())
+    for a, b in zip(paths, paths[1:] + paths[:1]):
+        result = compare_paths(a, b)
+        expected = baseline.compare_paths(a, b)
+        assert result['avg_deviation'] == pytest.approx(expected['avg_deviation'], abs=ATOL)
+        assert result['max_deviation'] == pytest.approx(expected['max_deviation'], abs=ATOL)
+
+
+@pytest.mark.parametrize("mode", [MODE_ABSOLUTE, MODE_CHAINED])
+def test_batch_ragged_matches_scalar_loop(ragged_fleet, mode):
+    arrays = [segments_to_arrays(segments) for segments in ragged_fleet]
+    points = forward_kinematics_batch([a[0] for a in arrays], [a[1] for a in arrays], [a[2] for a in arrays],
+                                      roll_deg=[a[3] for a in arrays], mode=mode)
+    assert len(points) == len(ragged_fleet)
+    for got, segments in zip(points, ragged_fleet):
+        np.testing.assert_allclose(got, reference_points(segments, mode), atol=ATOL)
+
+
+@pytest.mark.parametrize("mode", [MODE_ABSOLUTE, MODE_CHAINED])
+def test_batch_padded_matches_scalar_loop(ragged_fleet, mode):
+    counts = np.array([len(segments) for segments in ragged_fleet])
+    padded = np.zeros((4, len(counts), counts.max()))
+    for i, segments in enumerate(ragged_fleet):
+        if segments:
+            padded[:, i, :counts[i]] = np.vstack(segments_to_arrays(segments))
+    # Values past a path's count are garbage that must be ignored
+    padded[0][np.arange(counts.max()) >= counts[:, None]] = 99.0
+
+    points = forward_kinematics_batch(padded[0], padded[1], padded[2], counts, padded[3], mode)
+    assert points.shape == (len(counts), counts.max() + 1, 3)
+    for i, segments in enumerate(ragged_fleet):
+        expected = reference_points(segments, mode)
+        np.testing.assert_allclose(points[i, :counts[i] + 1], expected, atol=ATOL)
+        np.testing.assert_allclose(points[i, counts[i]:], np.broadcast_to(expected[-1], points[i, counts[i]:].shape),
+                                   atol=ATOL)
+
+
+@pytest.mark.parametrize("mode", [MODE_ABSOLUTE, MODE_CHAINED])
+def test_stream_matches_scalar_loop(ragged_fleet, mode):
+    rng = np.random.default_rng(7)
+    for segments in ragged_fleet:
+        blocks = list(forward_kinematics_stream(split_blocks(segments, rng), mode))
+        np.testing.assert_allclose(np.concatenate(blocks), reference_points(segments, mode), atol=ATOL)
+
+
+def test_stream_without_roll_is_zero_roll():
+    segments = [{"shaft_length": 2.0, "euler": [30.0, 10.0, 0.0]}, {"shaft_length": 1.0, "euler": [-15.0, 5.0, 0.0]}]
+    data = np.vstack(segments_to_arrays(segments))
+    points = np.concatenate(list(forward_kinematics_stream([data[:3]], MODE_CHAINED)))
+    np.testing.assert_allclose(points, reference_points(segments, MODE_CHAINED), atol=ATOL)
+
+
+@pytest.mark.parametrize("shape", [
+    (0,), (1,), (2,), (5,), (16,), (17,), (100,), (1023,), (1024,), (1025,), (5000,),
+    (3, 400), (40, 30), (2000, 3), (2, 3, 700),
+])
+def test_chain_quaternions_matches_plain_loop(shape):
+    rng = np.random.default_rng(sum(shape))
+    q = euler_quaternions(*rng.uniform(-90.0, 90.0, (3,) + shape))
+    original = q.copy()
+    result = chain_quaternions(q)
+    assert result.shape == q.shape
+    np.testing.assert_allclose(result, baseline.chain_quaternions(q), atol=1e-12)
+    np.testing.assert_array_equal(q, original)
+
+
+def test_chain_quaternions_at_every_block_boundary(monkeypatch):
+    # Force the blocked scan on small inputs so padding and recursion are exercised
+    monkeypatch.setattr(kinematics, "SCAN_MATRIX_LIMIT", 0)
+    rng = np.random.default_rng(3)
+    for n in range(2, 80):
+        q = euler_quaternions(*rng.uniform(-90.0, 90.0, (3, n)))
+        np.testing.assert_allclose(chain_quaternions(q), baseline.chain_quaternions(q), atol=1e-12)
+
+
+def test_path_math_follows_configured_mode(ragged_fleet):
+    from backend.services.path_math import compute_path
+    segments = ragged_fleet[5]
+    lengths, yaw, pitch, roll = segments_to_arrays(segments)
+    settings.set_overrides(kinematics_mode=MODE_CHAINED)
+    try:
+        np.testing.assert_allclose(compute_path(lengths, yaw, pitch, roll),
+                                   reference_points(segments, MODE_CHAINED), atol=ATOL)
+        np.testing.assert_allclose(compute_path_points(segments), reference_points(segments, MODE_CHAINED),
+                                   atol=ATOL)
+    finally:
+        settings.set_overrides(kinematics_mode=MODE_ABSOLUTE)
+    np.testing.assert_allclose(compute_path(lengths, yaw, pitch, roll),
+                               reference_points(segments, MODE_ABSOLUTE), atol=ATOL)
@@ -0,0 +1,171 @@
+# tests/test_mirror.py
+import os
+import json
+import time
+import pytest
+
+from conftest import write_path
+from benchmarks.synthetic import random_segments
+from backend.services import file_handler
+from backend.services.mirror import MANIFEST_FILENAME, PathMirror, content_hash
+from backend.services.settings import settings
+
+
+@pytest.fixture
+def share(tmp_path):
+    directory = tmp_path / "share"
+    directory.mkdir()
+    for i in range(3):
+        write_path(directory, f"p{i}.json", random_segments(3 + i, seed=i))
+    (directory / "notes.txt").write_text("not a path")
+    return directory
+
+
+def read(directory, filename):
+    with open(os.path.join(directory, filename), "rb") as f:
+        return f.read()
+
+
+def test_sync_pulls_changes_and_removals(share, tmp_path):
+    local = tmp_path / "local"
+    mirror = PathMirror(str(share), str(local))
+    assert not mirror.ready.is_set()
+
+    pulled, removed = mirror.sync()
+    assert sorted(pulled) == ["p0.json", "p1.json", "p2.json"] and removed == []
+    assert mirror.ready.is_set()
+    for filename in pulled:
+        assert read(local, filename) == read(share, filename)
+    assert not os.path.exists(local / "notes.txt")
+    assert mirror.sync() == ([], [])
+
+    write_path(share, "p1.json", random_segments(9, seed=9))
+    os.remove(share / "p2.json")
+    write_path(share, "p3.json", random_segments(2))
+    pulled, removed = mirror.sync()
+    assert sorted(pulled) == ["p1.json", "p3.json"] and removed == ["p2.json"]
+    assert read(local, "p1.json") == read(share, "p1.json")
+    assert not os.path.exists(local / "p2.json")
+
+
+def test_touched_files_are_restamped_not_copied(share, tmp_path):
+    mirror = PathMirror(str(share), str(tmp_path / "local"))
+    mirror.sync()
+    local_file = tmp_path / "local" / "p0.json"
+    inode = os.stat(local_file).st_ino
+    stamp = os.stat(share / "p0.json").st_mtime_ns + 10**9
+    os.utime(share / "p0.json", ns=(stamp, stamp))
+    assert mirror.sync() == (["p0.json"], [])
+    assert os.stat(local_file).st_ino == inode
+    assert os.stat(local_file).st_mtime_ns == stamp
+
+
+def test_manifest_survives_restarts(share, tmp_path):
+    PathMirror(str(share), str(tmp_path / "local")).sync()
+    with open(tmp_path / "local" / MANIFEST_FILENAME) as f:
+        manifest = json.load(f)
+    assert manifest["files"]["p1.json"][2] == content_hash(read(share, "p1.json"))
+
+    again = PathMirror(str(share), str(tmp_path / "local"))
+    assert again.ready.is_set()
+    assert again.sync() == ([], [])
+    # A manifest taken from another share is not trusted
+    assert not PathMirror(str(tmp_path), str(tmp_path / "local")).ready.is_set()
+
+
+def test_reads_pull_lazily_and_local_edits_are_replaced(share, tmp_path):
+    local = tmp_path / "local"
+    mirror = PathMirror(str(share), str(local))
+    assert mirror.local_path("p1.json") == str(local / "p1.json")
+    assert not os.path.exists(local / "p0.json")
+
+    with open(local / "p1.json", "a") as f:
+        f.write(" ")
+    mirror.local_path("p1.json")
+    assert read(local, "p1.json") == read(share, "p1.json")
+
+
+def test_verify_repulls_corrupted_copies(share, tmp_path):
+    local = tmp_path / "local"
+    mirror = PathMirror(str(share), str(local))
+    mirror.sync()
+    stat = os.stat(local / "p2.json")
+    data = bytearray(read(local, "p2.json"))
+    data[10] ^= 1
+    with open(local / "p2.json", "wb") as f:
+        f.write(data)
+    os.utime(local / "p2.json", ns=(stat.st_mtime_ns, stat.st_mtime_ns))
+    assert mirror.verify() == ["p2.json"]
+    assert read(local, "p2.json") == read(share, "p2.json")
+    assert mirror.verify() == []
+
+
+def test_writes_and_deletes_go_through_to_the_share(share, tmp_path):
+    local = tmp_path / "local"
+    mirror = PathMirror(str(share), str(local))
+    mirror.write("new.json", b'{"vehicle": "X", "segments": []}')
+    assert read(share, "new.json") == read(local, "new.json")
+    assert "new.json" not in mirror.sync()[0]
+    mirror.delete("new.json")
+    assert not os.path.exists(share / "new.json") and not os.path.exists(local / "new.json")
+
+
+def test_apply_change_skips_known_content_and_drops_deleted_files(share, tmp_path):
+    local = tmp_path / "local"
+    mirror = PathMirror(str(share), str(local))
+    mirror.sync()
+    inode = os.stat(local / "p0.json").st_ino
+    mirror.apply_change("p0.json", content_hash(read(share, "p0.json")))
+    assert os.stat(local / "p0.json").st_ino == inode
+
+    write_path(share, "p0.json", random_segments(8, seed=5))
+    mirror.apply_change("p0.json", content_hash(read(share, "p0.json")))
+    assert read(local, "p0.json") == read(share, "p0.json")
+
+    os.remove(share / "p1.json")
+    mirror.apply_change("p1.json")
+    assert not os.path.exists(local / "p1.json")
+
+
+def test_sync_loop_survives_any_error(share, tmp_path, monkeypatch, capsys):
+    mirror = PathMirror(str(share), str(tmp_path / "local"))
+    failures = [OSError("share offline"), ValueError("bad stamp"), json.JSONDecodeError("bad manifest", "", 0)]
+    calls = []
+
+    def flaky_sync():
+        calls.append(1)
+        if failures:
+            raise failures.pop(0)
+        return [], []
+
+    monkeypatch.setattr(mirror, "sync", flaky_sync)
+    mirror.start_sync(0.001)
+    deadline = time.monotonic() + 5
+    while len(calls) < 5:
+        assert time.monotonic() < deadline, "sync loop died"
+        time.sleep(0.005)
+    thread = mirror._sync_thread
+    mirror.stop_sync()
+    thread.join(2)
+    assert not thread.is_alive()
+    out = capsys.readouterr().out
+    for name in ("OSError", "ValueError", "JSONDecodeError"):
+        assert f"[WARN] Mirror sync failed: {name}" in out
+
+
+def test_file_handler_reads_through_the_mirror(input_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(file_handler, "_mirror", None)
+    monkeypatch.setitem(settings._overrides, "mirror_path", str(tmp_path / "local"))
+    settings._rebuild()
+    write_path(input_dir, "a.json", random_segments(4), vehicle="Ford350_attempt1_rev0_job1")
+
+    assert file_handler.get_read_dir() == str(input_dir)
+    assert file_handler.load_path_data("a.json")["vehicle"] == "Ford350_attempt1_rev0_job1"
+    assert os.path.exists(tmp_path / "local" / "a.json")
+
+    file_handler.save_path_data("b.json", {"vehicle": "Ford350_attempt2_rev0_job1", "segments": []})
+    assert read(input_dir, "b.json") == read(tmp_path / "local", "b.json")
+    file_handler.get_mirror().sync()
+    assert file_handler.get_read_dir() == str(tmp_path / "local")
+    assert sorted(file_handler.list_vehicle_paths()) == [
+        ("a.json", "Ford350_attempt1_rev0_job1"), ("b.json", "Ford350_attempt2_rev0_job1")]
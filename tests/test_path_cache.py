@@ -0,0 +1,100 @@
+# tests/test_path_cache.py
+import threading
+import numpy as np
+import pytest
+
+from conftest import write_path
+from benchmarks.synthetic import random_segments
+from backend.models.steering_path import SteeringPath
+from backend.services import file_handler
+from backend.services.path_cache import PathCache, estimate_size, path_cache
+
+
+def block(kb):
+    return np.zeros(kb * 128)  # kb KiB of float64
+
+
+def test_estimate_size():
+    assert estimate_size(block(4)) == 4096
+    assert estimate_size({"a": block(1), "b": [block(2)]}) > 3 * 1024
+    path = SteeringPath.from_dict({"vehicle": "X", "segments": random_segments(10)})
+    before = estimate_size(path)
+    path.points
+    assert estimate_size(path) == before + 11 * 3 * 8
+
+
+def test_evicts_least_recently_used_first():
+    cache = PathCache(budget_bytes=3 * 1024)
+    for key in "abc":
+        cache.put(key, block(1))
+    assert cache.get("a") is not None  # a is now the most recent
+    cache.put("d", block(1))
+    assert list(cache.entries) == ["c", "a", "d"]
+    assert cache.get("b") is None
+    assert cache.used_bytes == 3 * 1024
+    assert cache.stats()["evictions"] == 1
+
+
+def test_replacing_a_key_keeps_the_byte_count():
+    cache = PathCache(budget_bytes=10 * 1024)
+    cache.put("a", block(4))
+    cache.put("a", block(2))
+    assert cache.used_bytes == 2 * 1024 and len(cache.entries) == 1
+
+
+def test_oversized_values_are_returned_but_not_kept():
+    cache = PathCache(budget_bytes=1024)
+    cache.put("small", block(1))
+    value = block(2)
+    assert cache.put("big", value) is value
+    assert "big" not in cache.entries and "small" in cache.entries
+
+
+def test_get_or_compute_computes_once():
+    cache = PathCache()
+    calls = []
+    compute = lambda: calls.append(1) or block(1)
+    first = cache.get_or_compute("k", compute)
+    assert cache.get_or_compute("k", compute) is first
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_set_budget_shrinks_and_clear_empties():
+    cache = PathCache(budget_bytes=8 * 1024)
+    for key in range(8):
+        cache.put(key, block(1))
+    cache.set_budget(2 * 1024)
+    assert list(cache.entries) == [6, 7] and cache.used_bytes == 2 * 1024
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.used_bytes == 0
+
+
+def test_concurrent_use_keeps_accounting_consistent():
+    cache = PathCache(budget_bytes=20 * 1024)
+
+    def worker(seed):
+        rng = np.random.default_rng(seed)
+        for key in rng.integers(0, 50, 400):
+            cache.get_or_compute(int(key), lambda: block(1))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.used_bytes == sum(size for _, size in cache.entries.values()) <= 20 * 1024
+
+
+def test_loaded_paths_are_cached_until_the_file_changes(input_dir):
+    write_path(input_dir, "a.json", random_segments(6, seed=1))
+    first = file_handler.load_steering_path("a.json")
+    assert file_handler.load_steering_path("a.json") is first
+    assert first._points is not None
+
+    # A longer file changes the (mtime, size) key even within the mtime resolution
+    write_path(input_dir, "a.json", random_segments(9, seed=2))
+    second = file_handler.load_steering_path("a.json")
+    assert second is not first and len(second) == 9
+    assert path_cache.stats()["entries"] == 2
@@ -0,0 +1,87 @@
+# tests/test_path_canvas.py
+import numpy as np
+import pytest
+from matplotlib.colors import to_rgba
+
+from gui.widgets.path_canvas import MAX_MARKERS, PathCanvas
+
+
+@pytest.fixture
+def canvas(qapp):
+    canvas = PathCanvas(name="test.canvas")
+    yield canvas
+    canvas.deleteLater()
+
+
+def line(n, offset=0.0):
+    return np.column_stack([np.arange(n), np.zeros(n), np.full(n, offset)]).astype(float)
+
+
+def show(canvas, paths, title=""):
+    canvas.show_paths(paths, title)
+    canvas.flush()
+
+
+def test_reused_lines_take_the_full_new_style(canvas):
+    fresh = PathCanvas(name="fresh.canvas")
+    show(fresh, [(line(5), {}), (line(5, 1.0), {})])
+
+    show(canvas, [
+        (line(1000), {'color': 'red', 'linestyle': '--', 'linewidth': 4, 'marker': 'o', 'label': 'A', 'alpha': 0.5}),
+        (line(5, 1.0), {'color': 'gray', 'linestyle': ':', 'label': 'mean'}),
+    ])
+    first = list(canvas.lines)
+    assert first[0].get_markevery() == 1000 // MAX_MARKERS
+
+    # Same artists again, styled only with matplotlib's defaults
+    show(canvas, [(line(5), {}), (line(5, 1.0), {})])
+    assert canvas.lines == first
+    for reused, new in zip(canvas.lines, fresh.lines):
+        assert to_rgba(reused.get_color()) == to_rgba(new.get_color())
+        assert reused.get_linestyle() == new.get_linestyle()
+        assert reused.get_linewidth() == new.get_linewidth()
+        assert reused.get_marker() == new.get_marker()
+        assert reused.get_alpha() == new.get_alpha()
+        assert reused.get_markevery() == 1
+        assert reused.get_label().startswith("_")
+    fresh.deleteLater()
+
+
+def test_extra_lines_are_hidden_and_shown_again(canvas):
+    show(canvas, [(line(4), {'color': 'blue'}), (line(4, 2.0), {'color': 'orange'})])
+    show(canvas, [(line(3), {'color': 'green'})])
+    assert len(canvas.lines) == 2
+    assert canvas.lines[0].get_visible() and not canvas.lines[1].get_visible()
+    np.testing.assert_array_equal(np.array(canvas.lines[0].get_data_3d()).T, line(3))
+
+    show(canvas, [(line(3), {}), (line(6, 1.0), {'color': 'purple'})])
+    assert canvas.lines[1].get_visible()
+    assert to_rgba(canvas.lines[1].get_color()) == to_rgba('purple')
+
+
+def test_legend_follows_labels_and_styles(canvas):
+    show(canvas, [(line(3), {'label': "Path A", 'color': 'blue'}), (line(3, 1.0), {'label': "Path B"})])
+    legend = canvas.ax.get_legend()
+    assert [t.get_text() for t in legend.get_texts()] == ["Path A", "Path B"]
+
+    show(canvas, [(line(3), {'label': "Path A", 'color': 'red'}), (line(3, 1.0), {'label': "Path B"})])
+    legend = canvas.ax.get_legend()
+    assert to_rgba(legend.legend_handles[0].get_color()) == to_rgba('red')
+
+    show(canvas, [(line(3), {'color': 'red'})])
+    assert canvas.ax.get_legend() is None
+
+
+def test_updates_are_coalesced(canvas, qapp):
+    canvas.show_paths([(line(3), {})], "first")
+    canvas.show_paths([(line(4), {}), (line(4, 1.0), {})], "second")
+    canvas.flush()
+    assert len(canvas.lines) == 2
+    assert canvas.ax.get_title() == "second"
+
+
+def test_plot_errors_are_reported(canvas):
+    errors = []
+    canvas.plot_failed.connect(errors.append)
+    show(canvas, [(np.zeros((3, 2)), {})])
+    assert len(errors) == 1
@@ -0,0 +1,92 @@
+# tests/test_report.py
+import os
+import re
+import json
+import pytest
+
+import cli
+from conftest import write_path
+from benchmarks.synthetic import random_segments, perturbed_segments
+from backend.services.angle_diff import cumulative_angle_differences
+from backend.services.comparator import compare_paths
+from backend.services.report import generate_reports, render_report, report_basename
+
+
+@pytest.fixture
+def pair(input_dir):
+    base = random_segments(12, seed=3)
+    write_path(input_dir, "a.json", base, vehicle="GMC2500Gen4_attempt1_rev0_job1")
+    write_path(input_dir, "b.json", perturbed_segments(base)[:10], vehicle="GMC2500Gen4_attempt2_rev0_job<2>")
+    return base, perturbed_segments(base)[:10]
+
+
+def test_report_basename():
+    assert report_basename("A.json", "B.v2.json") == "A__vs__B.v2"
+
+
+def test_html_report(pair, tmp_path):
+    segments1, segments2 = pair
+    summary = render_report("a.json", "b.json", str(tmp_path / "out"))
+    expected = compare_paths(segments1, segments2)
+    assert summary["report"] == str(tmp_path / "out" / "a__vs__b.html")
+    assert summary["avg_deviation"] == pytest.approx(expected["avg_deviation"])
+    assert summary["max_deviation"] == pytest.approx(expected["max_deviation"])
+    assert os.path.getsize(tmp_path / "out" / "a__vs__b.png") > 0
+
+    with open(summary["report"]) as f:
+        page = f.read()
+    assert "<title>GMC2500Gen4_attempt1_rev0_job1 vs GMC2500Gen4_attempt2_rev0_job&lt;2&gt;</title>" in page
+    assert f"Average Deviation: {expected['avg_deviation']:.3f} units" in page
+    assert f"Maximum Deviation: {expected['max_deviation']:.3f} units" in page
+    assert '<img src="a__vs__b.png"' in page
+
+    rows = re.findall(r"<tr><td>(\d+)</td><td>([-\d.]+)</td><td>([-\d.]+)</td><td>([-\d.]+)</td></tr>", page)
+    euler1 = [s["euler"] for s in segments1]
+    euler2 = [s["euler"] for s in segments2]
+    diffs = cumulative_angle_differences(euler1, euler2)
+    assert len(rows) == len(diffs) == 10
+    for row, diff in zip(rows, diffs):
+        assert [float(v) for v in row[1:]] == pytest.approx(diff.tolist(), abs=5e-4)
+
+
+def test_pdf_report(pair, tmp_path):
+    summary = render_report("a.json", "b.json", str(tmp_path), fmt="pdf")
+    assert summary["report"].endswith("a__vs__b.pdf")
+    with open(summary["report"], "rb") as f:
+        document = f.read()
+    assert document.startswith(b"%PDF")
+    assert b"/Count 2" in document
+
+
+def test_unknown_format_is_rejected(pair, tmp_path):
+    with pytest.raises(ValueError):
+        render_report("a.json", "b.json", str(tmp_path), fmt="docx")
+
+
+def test_generate_reports_in_worker_processes(pair, tmp_path):
+    calls = []
+    results = generate_reports([("a.json", "b.json"), ("b.json", "a.json"), ("a.json", "missing.json")],
+                               str(tmp_path), jobs=2, progress=lambda *args: calls.append(args))
+    assert len(results) == 3
+    assert [done for done, _, _ in calls] == [1, 2, 3] and all(total == 3 for _, total, _ in calls)
+    by_pair = {(r["file1"], r["file2"]): r for r in results}
+    assert "error" in by_pair[("a.json", "missing.json")]
+    assert os.path.exists(by_pair[("a.json", "b.json")]["report"])
+    assert os.path.exists(by_pair[("b.json", "a.json")]["report"])
+    assert by_pair[("a.json", "b.json")]["avg_deviation"] == pytest.approx(
+        by_pair[("b.json", "a.json")]["avg_deviation"])
+
+
+def test_generate_reports_stops_when_asked(pair, tmp_path):
+    pairs = [("a.json", "b.json")] * 6
+    results = generate_reports(pairs, str(tmp_path), jobs=1, should_stop=lambda: True)
+    assert len(results) == 1
+
+
+def test_cli_report(pair, tmp_path, capsys):
+    capsys.readouterr()
+    assert cli.main(["report", "a.json", str(tmp_path), "--format", "pdf", "--jobs", "1"]) == 0
+    captured = capsys.readouterr()
+    [summary] = [json.loads(line) for line in captured.out.splitlines()]
+    assert summary["file2"] == "b.json" and summary["report"].endswith(".pdf")
+    assert "[REPORT] 1/1" in captured.err
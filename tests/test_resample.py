@@ -0,0 +1,114 @@
+# tests/test_resample.py
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import random_segments
+from backend.services.comparator import (
+    compare_paths, compare_paths_resampled, compute_path_points, resampled_deviation,
+)
+from backend.services.resample import cumulative_lengths, resample_count, sample_at
+
+
+def interp_reference(points, distances):
+    """Per-coordinate np.interp along the arc length."""
+    points = np.asarray(points, dtype=np.float64)
+    cumulative = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(points, axis=0), axis=1))))
+    return np.column_stack([np.interp(distances, cumulative, points[:, k]) for k in range(3)])
+
+
+def reference_deviation(points1, points2, step):
+    common = min(cumulative_lengths(points1)[-1], cumulative_lengths(points2)[-1])
+    distances = list(np.arange(0.0, common + step / 2, step))
+    distances = [d for d in distances if d <= common]
+    if distances[-1] < common:
+        distances.append(common)
+    deltas = np.linalg.norm(interp_reference(points1, distances) - interp_reference(points2, distances), axis=1)
+    i = int(deltas.argmax())
+    return float(deltas.mean()), float(deltas[i]), distances[i], len(distances)
+
+
+def split_segments(segments, parts):
+    """Same polyline with every segment cut into `parts` equal pieces."""
+    return [{"shaft_length": seg["shaft_length"] / parts, "euler": seg["euler"]}
+            for seg in segments for _ in range(parts)]
+
+
+def test_cumulative_lengths():
+    points = [[0, 0, 0], [3, 4, 0], [3, 4, 0], [3, 4, 2]]
+    np.testing.assert_allclose(cumulative_lengths(points), [0, 5, 5, 7])
+    np.testing.assert_allclose(cumulative_lengths([[1, 2, 3]]), [0])
+
+
+def test_sample_at_matches_interp():
+    points = compute_path_points(random_segments(25, seed=4))
+    cumulative = cumulative_lengths(points)
+    distances = np.random.default_rng(0).uniform(0, cumulative[-1], 200)
+    distances[:3] = [0.0, cumulative[-1], cumulative[7]]
+    np.testing.assert_allclose(sample_at(points, cumulative, distances), interp_reference(points, distances),
+                               atol=1e-9)
+    # Out-of-range distances clamp to the end points
+    np.testing.assert_allclose(sample_at(points, cumulative, np.array([-5.0, cumulative[-1] + 5])),
+                               points[[0, -1]])
+
+
+def test_sample_at_skips_zero_length_segments():
+    points = np.array([[0, 0, 0], [1, 0, 0], [1, 0, 0], [1, 2, 0]], dtype=float)
+    cumulative = cumulative_lengths(points)
+    np.testing.assert_allclose(sample_at(points, cumulative, np.array([0.5, 1.0, 2.0])),
+                               [[0.5, 0, 0], [1, 0, 0], [1, 1, 0]])
+
+
+def test_sample_at_single_point():
+    points = np.array([[1.0, 2.0, 3.0]])
+    np.testing.assert_allclose(sample_at(points, cumulative_lengths(points), np.zeros(3)), np.repeat(points, 3, 0))
+
+
+def test_resample_count_is_evenly_spaced():
+    points = compute_path_points(random_segments(9, seed=2))
+    resampled = resample_count(points, 50)
+    assert resampled.shape == (50, 3)
+    np.testing.assert_allclose(resampled[[0, -1]], points[[0, -1]])
+    spacing = np.linalg.norm(np.diff(resampled, axis=0), axis=1)
+    # Chords never exceed the arc-length spacing
+    assert np.all(spacing <= cumulative_lengths(points)[-1] / 49 + 1e-9)
+
+
+@pytest.mark.parametrize("step", [0.5, 3.0, 7.3, 1000.0])
+@pytest.mark.parametrize("chunk_size", [1, 16, 65536])
+def test_resampled_deviation_matches_reference(step, chunk_size):
+    points1 = compute_path_points(random_segments(12, seed=5))
+    points2 = compute_path_points(random_segments(20, seed=6))
+    got = resampled_deviation(points1, points2, step, chunk_size)
+    expected = reference_deviation(points1, points2, step)
+    assert got[3] == expected[3]
+    np.testing.assert_allclose(got[:3], expected[:3], rtol=1e-9, atol=1e-9)
+
+
+def test_resampled_compare_ignores_segment_count():
+    segments = random_segments(15, seed=8)
+    finer = split_segments(segments, 3)
+    assert compare_paths(segments, finer)['max_deviation'] > 1.0
+    result = compare_paths_resampled(segments, finer, step=0.25)
+    assert result['avg_deviation'] == pytest.approx(0.0, abs=1e-9)
+    assert result['max_deviation'] == pytest.approx(0.0, abs=1e-9)
+    assert len(result['points1']) == 16 and len(result['points2']) == 46
+
+
+def test_resampled_compare_measures_offsets():
+    points = compute_path_points(random_segments(10, seed=9))
+    avg_dev, max_dev, _, count = resampled_deviation(points, points + [0.0, 0.0, 2.0], step=1.0)
+    assert avg_dev == pytest.approx(2.0) and max_dev == pytest.approx(2.0)
+    length = cumulative_lengths(points)[-1]
+    assert count == int(np.floor(length)) + 1 + (np.floor(length) < length)
+
+
+def test_resampled_compare_of_empty_path():
+    empty = compute_path_points([])
+    other = compute_path_points(random_segments(3))
+    assert resampled_deviation(empty, other, step=1.0) == (0.0, 0.0, 0.0, 1)
+
+
+def test_step_must_be_positive():
+    points = compute_path_points(random_segments(3))
+    with pytest.raises(ValueError):
+        resampled_deviation(points, points, step=0)
@@ -0,0 +1,90 @@
+# tests/test_search.py
+import pytest
+
+from backend.services.search import (
+    COMPACT_MIN_FREE, PrefixTrie, VehicleSearchIndex, normalize_base, parse_range,
+)
+
+ITEMS = [
+    ("a.json", "GMC2500Gen4_attempt1_rev0_job12345672"),
+    ("b.json", "GMC|2500|Gen4_attempt2_rev1_job12345673"),
+    ("c.json", "Ford350_attempt1_rev2_job99"),
+    ("d.json", "Ford250Gen05_attempt3_rev0_job12345678"),
+    ("e.json", ""),
+]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", None), ("*", None), (" any ", None), ("3", 3), ("2-5", (2, 5)), ("2-", (2, None)), ("-5", (None, 5)),
+])
+def test_parse_range(text, expected):
+    assert parse_range(text) == expected
+
+
+def test_parse_range_rejects_garbage():
+    with pytest.raises(ValueError):
+        parse_range("two")
+
+
+def test_normalize_base():
+    assert normalize_base("GMC|2500 Gen4") == normalize_base("gmc_2500gen4") == "gmc2500gen4"
+    assert normalize_base(None) == ""
+
+
+def test_search_filters_in_insertion_order():
+    index = VehicleSearchIndex(ITEMS)
+    assert index.search() == [key for key, _ in ITEMS]
+    assert index.search("gmc|2500") == ["a.json", "b.json"]
+    assert index.search("ford", attempt=(2, None)) == ["d.json"]
+    assert index.search(revision=0) == ["a.json", "d.json"]
+    assert index.search(attempt=1, revision=(1, 2)) == ["c.json"]
+    assert index.search(job=" 99 ") == ["c.json"]
+    assert index.search("chevy") == []
+
+
+def test_add_replaces_existing_key():
+    index = VehicleSearchIndex(ITEMS)
+    index.add("a.json", "Ford150_attempt9_rev0_job1")
+    assert index.search("gmc") == ["b.json"]
+    assert index.search(attempt=9) == ["a.json"]
+    assert index.search()[-1] == "a.json"
+    assert len(index) == len(ITEMS)
+
+
+def test_trie_remove_prunes_empty_nodes():
+    trie = PrefixTrie()
+    trie.add("ford", 1)
+    trie.add("fox", 2)
+    trie.remove("ford", 1)
+    assert trie.lookup("for") == set()
+    assert list(trie.root["children"]["f"]["children"]["o"]["children"]) == ["x"]
+    trie.remove("fox", 2)
+    assert trie.root == {"ids": set(), "children": {}}
+
+
+def test_remove_drops_empty_buckets():
+    index = VehicleSearchIndex(ITEMS)
+    for key, _ in ITEMS:
+        index.remove(key)
+    assert len(index) == 0
+    assert index.search() == []
+    assert index.base_trie.root["children"] == {}
+    assert index.attempts.buckets == {} and index.attempts.keys == []
+    assert index.revisions.buckets == {} and index.revisions.keys == []
+    assert index.jobs == {}
+
+
+def test_churn_keeps_storage_bounded():
+    index = VehicleSearchIndex(ITEMS)
+    for i in range(20 * COMPACT_MIN_FREE):
+        key = f"tmp{i}.json"
+        index.add(key, f"Ram{i % 7}_attempt{i}_rev{i % 3}_job{i}")
+        if i % 10:
+            index.remove(key)
+    assert len(index.keys) < len(index) + 2 * COMPACT_MIN_FREE
+    assert len(index.attempts.keys) == len({fields["attempt"] for fields in index.fields if fields} - {None})
+
+    kept = [key for key, _ in ITEMS] + [f"tmp{i}.json" for i in range(0, 20 * COMPACT_MIN_FREE, 10)]
+    assert index.search() == kept
+    assert index.search("ram3", attempt=(0, 100)) == ["tmp10.json", "tmp80.json"]
+    assert index.search(job="30") == ["tmp30.json"]
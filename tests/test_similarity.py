@@ -0,0 +1,107 @@
+# tests/test_similarity.py
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import random_segments, perturbed_segments
+from backend.services import similarity
+from backend.services.comparator import compute_path_points, vertex_deviation
+from backend.services.kinematics import MODE_CHAINED
+from backend.services.settings import settings
+from backend.services.similarity import SimilarityIndex, path_features
+
+
+@pytest.fixture(scope="module")
+def families():
+    """{key: segments}: ten families of five attempts each, one base path per family."""
+    paths = {}
+    for family in range(10):
+        base = random_segments(30 + family, seed=family)
+        for attempt in range(5):
+            paths[f"f{family}_a{attempt}"] = perturbed_segments(base, scale=1.0 + attempt, seed=attempt)
+    return paths
+
+
+def brute_force(paths, query, k):
+    points = compute_path_points(query)
+    ranked = []
+    for key, segments in paths.items():
+        avg_dev, max_dev, _ = vertex_deviation(points, compute_path_points(segments))
+        ranked.append((key, avg_dev, max_dev))
+    ranked.sort(key=lambda r: r[1])
+    return ranked[:k]
+
+
+def assert_same_ranking(got, expected):
+    assert [key for key, _, _ in got] == [key for key, _, _ in expected]
+    np.testing.assert_allclose([r[1:] for r in got], [r[1:] for r in expected], atol=1e-9)
+
+
+def test_path_features_shape():
+    points = compute_path_points(random_segments(12))
+    features = path_features(points, samples=8)
+    assert features.shape == (24,)
+    np.testing.assert_allclose(features[:3], points[0])
+    np.testing.assert_allclose(features[-3:], points[-1])
+
+
+@pytest.mark.parametrize("with_tree", [True, False])
+def test_query_matches_brute_force(families, monkeypatch, with_tree):
+    if not with_tree:
+        monkeypatch.setattr(similarity, "cKDTree", None)
+    index = SimilarityIndex()
+    index.add_many(families.items())
+    assert len(index) == len(families)
+    assert (index.tree is not None) == with_tree
+    for family in (0, 4, 9):
+        query = perturbed_segments(random_segments(30 + family, seed=family), scale=1.5, seed=42)
+        assert_same_ranking(index.query(query, k=5), brute_force(families, query, 5))
+
+
+def test_stored_path_finds_itself_unless_excluded(families):
+    index = SimilarityIndex(rebuild_fraction=0.5)
+    index.add_many(families.items())
+    first = index.query(families["f3_a2"], k=1)
+    assert first[0][0] == "f3_a2" and first[0][1] == 0.0
+    ranked = index.query(families["f3_a2"], k=4, exclude="f3_a2")
+    assert [key.split("_")[0] for key, _, _ in ranked] == ["f3"] * 4
+    assert "f3_a2" not in [key for key, _, _ in ranked]
+
+
+def test_pending_paths_are_searched_before_rebuild(families):
+    index = SimilarityIndex()
+    items = list(families.items())
+    index.add_many(items[:40])
+    index.rebuild()
+    index.add_many(items[40:])
+    assert index.pending and index.tree_size == 40
+    query = families["f9_a0"]
+    assert_same_ranking(index.query(query, k=5), brute_force(families, query, 5))
+
+
+def test_adding_a_key_again_replaces_its_path(families):
+    index = SimilarityIndex()
+    index.add_many(families.items())
+    index.add("f0_a0", families["f7_a0"])
+    assert len(index) == len(families)
+    ranked = index.query(random_segments(30, seed=0), k=4)
+    assert "f0_a0" not in [key for key, _, _ in ranked]
+    assert index.query(families["f7_a0"], k=2)[1][1] == 0.0
+
+    index.rebuild()
+    assert index.replaced == 0
+    assert len(index.keys) == len(index.features) == len(families)
+    assert index.query(families["f7_a0"], k=2)[1][1] == 0.0
+
+
+def test_index_goes_stale_when_mode_changes(families):
+    index = SimilarityIndex()
+    index.add("a", families["f1_a1"])
+    assert not index.stale
+    settings.set_overrides(kinematics_mode=MODE_CHAINED)
+    try:
+        assert index.stale
+        chained = SimilarityIndex()
+        assert chained.mode == MODE_CHAINED and not chained.stale
+    finally:
+        settings.set_overrides(kinematics_mode="absolute")
+    assert not index.stale
@@ -0,0 +1,229 @@
+# tests/test_stream_parser.py
+import os
+import json
+import numpy as np
+import pytest
+
+import cli
+from conftest import sample_files, write_path
+from benchmarks.synthetic import random_segments
+from backend.services import stream_parser
+from backend.services import file_handler
+from backend.services.comparator import streaming_deviation, vertex_deviation, compare_paths
+from backend.services.kinematics import MODE_ABSOLUTE, MODE_CHAINED, forward_kinematics
+
+CHUNK_SIZES = [1, 7, 64, stream_parser.DEFAULT_CHUNK_SIZE]
+
+
+def expected_arrays(filepath):
+    with open(filepath) as f:
+        document = json.load(f)
+    return document.get("vehicle") or "", stream_parser.segments_block(document.get("segments", []))
+
+
+def assert_matches_json(filepath, chunk_size):
+    vehicle, data = stream_parser.read_path_arrays(filepath, chunk_size)
+    expected_vehicle, expected = expected_arrays(filepath)
+    assert vehicle == expected_vehicle
+    assert data.shape == expected.shape
+    np.testing.assert_array_equal(data, expected)
+
+
+def write(tmp_path, text, name="path.json"):
+    filepath = tmp_path / name
+    filepath.write_bytes(text.encode() if isinstance(text, str) else text)
+    return str(filepath)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_sample_files_match_json(chunk_size):
+    for filepath in sample_files():
+        assert_matches_json(filepath, chunk_size)
+
+
+@pytest.mark.parametrize("indent", [None, 4])
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_synthetic_file_matches_json(tmp_path, indent, chunk_size):
+    document = {"vehicle": "Synth1Gen2_attempt1_rev0_job1", "segments": random_segments(300)}
+    filepath = write(tmp_path, json.dumps(document, indent=indent))
+    assert_matches_json(filepath, chunk_size)
+
+
+@pytest.mark.parametrize("text", [
+    # Number spellings json accepts
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [-0, 1e3, -2.5E-2]}]}',
+    # Whitespace everywhere, vehicle after the array
+    '{ "segments" : [ { "shaft_length" : 1.5 , "euler" : [ 1 , 2 , 3 ] } ,\n\t{"shaft_length":2,"euler":[4,5,6]} ] ,'
+    ' "vehicle" : "V" }',
+    # No vehicle
+    '{"segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}',
+    # Empty array
+    '{"vehicle": "V", "segments": []}',
+    # Other keys, other key order, nested values: read with json instead
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3], "note": "x"}]}',
+    '{"vehicle": "V", "segments": [{"euler": [1, 2, 3], "shaft_length": 1}]}',
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]},'
+    ' {"shaft_length": 2, "euler": [4, 5, 6], "tags": [[1], {"a": 2}]}]}',
+    '{"vehicle": "V", "segments": [{"shaft_length": NaN, "euler": [1, 2, 3]}]}',
+    # A nested "segments" key before the real one
+    '{"meta": {"segments": [{"shaft_length": 9, "euler": [9, 9, 9]}]}, "vehicle": "V",'
+    ' "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}',
+    # Escapes: in key names (read with json), and in strings around the array
+    '{"vehicle": "V", "\\u0073egments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}',
+    '{"vehicle": "V", "segments": [{"shaft_\\u006cength": 1, "euler": [1, 2, 3]}]}',
+    '{"vehicle": "V\\\\", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}',
+    '{"note": "\\"segments\\": [", "vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}',
+    '{"segments": [{"shaft_length": 1, "euler": [1, 2, 3]}], "vehicle": "\\u0056 \\"q\\""}',
+    # Numbers json converts but the segment grammar does not take
+    '{"vehicle": "V", "segments": [{"shaft_length": "1.5", "euler": [1, 2, 3]}]}',
+    # Segment-like objects after the array
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}, {"shaft_length": 2, "euler": [4, 5, 6]}],'
+    ' "tail": [{"shaft_length": 1}]}',
+])
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_layouts_match_json(tmp_path, text, chunk_size):
+    assert_matches_json(write(tmp_path, text), chunk_size)
+
+
+def test_values_json_cannot_convert_are_rejected(tmp_path):
+    filepath = write(tmp_path, '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]},'
+                               ' {"shaft_length": 2, "euler": [[4], 5, 6]}]}')
+    with pytest.raises(ValueError):
+        expected_arrays(filepath)
+    for chunk_size in CHUNK_SIZES:
+        with pytest.raises(ValueError):
+            stream_parser.read_path_arrays(filepath, chunk_size)
+
+
+def test_repeated_segments_key_after_streaming(tmp_path):
+    text = ('{"segments": [{"shaft_length": 9, "euler": [9, 9, 9]}], "vehicle": "V",'
+            ' "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}')
+    filepath = write(tmp_path, text)
+    # Buffered readers start over with json, which keeps the last array
+    for chunk_size in CHUNK_SIZES:
+        assert_matches_json(filepath, chunk_size)
+        assert stream_parser.read_vehicle(filepath, chunk_size) == "V"
+    # Streamed blocks of the first array cannot be taken back
+    with pytest.raises(ValueError):
+        list(stream_parser.iter_segment_blocks(filepath))
+
+
+def test_whitespace_longer_than_a_segment_falls_back(tmp_path):
+    padding = " " * (stream_parser.MAX_SEGMENT_BYTES * 2)
+    text = ('{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]},' + padding
+            + '{"shaft_length": 2, "euler": [4, 5, 6]}]}')
+    for chunk_size in CHUNK_SIZES:
+        assert_matches_json(write(tmp_path, text), chunk_size)
+
+
+@pytest.mark.parametrize("text", [
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}',
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]',
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]},]}',
+    '{"vehicle": "V", "segments": [{"shaft_length": 01, "euler": [1, 2, 3]}]}',
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]} trailing',
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]} {"shaft_length": 2, "euler": [4, 5, 6]}]}',
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}], "vehicle": "\\x"}',
+    # Control characters must be escaped inside strings
+    '{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}], "note": "\u0001"}',
+    '{"vehicle": "V" "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}',
+    '',
+])
+def test_invalid_json_is_rejected(tmp_path, text):
+    filepath = write(tmp_path, text)
+    for chunk_size in CHUNK_SIZES:
+        with pytest.raises(ValueError):
+            stream_parser.read_path_arrays(filepath, chunk_size)
+        assert stream_parser.read_vehicle(filepath, chunk_size) is None
+
+
+def test_non_object_document_is_rejected(tmp_path):
+    filepath = write(tmp_path, '[{"segments": []}]')
+    with pytest.raises(ValueError):
+        stream_parser.read_path_arrays(filepath)
+
+
+@pytest.mark.parametrize("text, vehicle", [
+    ('{"vehicle": "V", "segments": [{"shaft_length": 1, "euler": [1, 2, 3]}]}', "V"),
+    ('{"segments": [{"shaft_length": 1, "euler": [1, 2, 3]}], "vehicle": "W"}', "W"),
+    ('{"segments": []}', None),
+    ('{"vehicle": 5, "segments": []}', None),
+])
+def test_read_vehicle(tmp_path, text, vehicle):
+    assert stream_parser.read_vehicle(write(tmp_path, text), chunk_size=5) == vehicle
+
+
+def test_missing_file_raises_oserror(tmp_path):
+    with pytest.raises(OSError):
+        stream_parser.read_path_arrays(str(tmp_path / "missing.json"))
+    assert stream_parser.read_vehicle(str(tmp_path / "missing.json")) is None
+
+
+def test_blocks_cover_every_segment_in_order(tmp_path):
+    document = {"vehicle": "V", "segments": random_segments(1000, seed=4)}
+    filepath = write(tmp_path, json.dumps(document))
+    blocks = list(stream_parser.iter_segment_blocks(filepath, chunk_size=500))
+    assert len(blocks) > 1
+    np.testing.assert_array_equal(np.hstack(blocks), expected_arrays(filepath)[1])
+
+
+@pytest.mark.parametrize("mode", [MODE_ABSOLUTE, MODE_CHAINED])
+def test_stream_points_match_forward_kinematics(tmp_path, mode):
+    document = {"vehicle": "V", "segments": random_segments(700, seed=5)}
+    filepath = write(tmp_path, json.dumps(document, indent=2))
+    points = np.concatenate(list(stream_parser.stream_points(filepath, chunk_size=333, mode=mode)))
+    data = expected_arrays(filepath)[1]
+    np.testing.assert_allclose(points, forward_kinematics(*data, mode=mode), atol=1e-9)
+
+
+def random_segments_array(n, seed):
+    return stream_parser.segments_block(random_segments(n, seed=seed))
+
+
+@pytest.mark.parametrize("n1, n2", [(0, 0), (0, 5), (5, 0), (40, 40), (40, 400), (400, 40)])
+def test_streaming_deviation_matches_vertex_deviation(n1, n2):
+    rng = np.random.default_rng(n1 * 3 + n2)
+    points1 = forward_kinematics(*np.vstack(random_segments_array(n1, 1)))
+    points2 = forward_kinematics(*np.vstack(random_segments_array(n2, 2)))
+    cuts1 = np.sort(rng.integers(0, len(points1) + 1, 5))
+    cuts2 = np.sort(rng.integers(0, len(points2) + 1, 5))
+    avg_deviation, max_deviation = streaming_deviation(np.split(points1, cuts1), np.split(points2, cuts2))
+    expected = vertex_deviation(points1, points2)
+    assert avg_deviation == pytest.approx(expected[0], abs=1e-12)
+    assert max_deviation == pytest.approx(expected[1], abs=1e-12)
+
+
+@pytest.mark.parametrize("count", [10, 6000, 9000])
+def test_cli_compare_streams_large_files(input_dir, monkeypatch, count):
+    write_path(input_dir, "ref.json", random_segments(7000, seed=1))
+    write_path(input_dir, "big.json", random_segments(count, seed=2), vehicle="Big1Gen1_attempt1_rev0_job1")
+    large = os.path.getsize(input_dir / "big.json") >= file_handler.STREAM_THRESHOLD_BYTES
+    assert file_handler.stream_source("big.json") == (str(input_dir / "big.json") if large else None)
+    expected = compare_paths(file_handler.read_steering_path("ref.json"), file_handler.read_steering_path("big.json"))
+
+    reference = file_handler.load_steering_path("ref.json")
+    real_load = file_handler.load_steering_path
+    monkeypatch.setattr(file_handler, "load_steering_path",
+                        lambda filename: pytest.fail("streamed file was loaded") if large else real_load(filename))
+    record = cli.compare_record(reference, "big.json", None)
+    assert record["vehicle"] == "Big1Gen1_attempt1_rev0_job1"
+    assert record["avg_deviation"] == pytest.approx(expected["avg_deviation"], abs=1e-9)
+    assert record["max_deviation"] == pytest.approx(expected["max_deviation"], abs=1e-9)
+
+
+def test_cli_compare_falls_back_when_streaming_cannot(input_dir):
+    write_path(input_dir, "ref.json", random_segments(50, seed=1))
+    first = json.dumps({"segments": random_segments(6000, seed=3)})[:-1]
+    # A second top-level array replaces the first: the result must be json's
+    (input_dir / "twice.json").write_text(first + ', "vehicle": "V", "segments": '
+                                          + json.dumps(random_segments(30, seed=4)) + "}")
+    assert file_handler.stream_source("twice.json")
+    reference = file_handler.load_steering_path("ref.json")
+    record = cli.compare_record(reference, "twice.json", None)
+    expected = compare_paths(reference, random_segments(30, seed=4))
+    assert record["vehicle"] == "V"
+    assert record["avg_deviation"] == pytest.approx(expected["avg_deviation"], abs=1e-9)
+
+    (input_dir / "broken.json").write_text(first)
+    with pytest.raises(ValueError):
+        cli.compare_record(reference, "broken.json", None)
@@ -0,0 +1,111 @@
+# tests/test_tracing.py
+import glob
+import json
+import shutil
+import time
+from collections import deque
+import pytest
+
+import cli
+from conftest import sample_files
+from backend.services import tracing
+
+
+@pytest.fixture
+def trace(monkeypatch, tmp_path):
+    """Tracing enabled into a fresh trace file, with the module state restored afterwards."""
+    monkeypatch.setattr(tracing, "_enabled", False)
+    monkeypatch.setattr(tracing, "_trace_path", None)
+    monkeypatch.setattr(tracing, "_events", deque(maxlen=tracing.MAX_EVENTS))
+    monkeypatch.setattr(tracing, "_latencies", {})
+    path = str(tmp_path / "trace.json")
+    tracing.enable(path)
+    yield path
+
+
+@tracing.traced("test.work")
+def work(value, fail=False):
+    if fail:
+        raise RuntimeError("boom")
+    return value * 2
+
+
+def read_events(path):
+    with open(path) as f:
+        return json.load(f)["traceEvents"]
+
+
+def test_disabled_tracing_records_nothing(monkeypatch):
+    monkeypatch.setattr(tracing, "_enabled", False)
+    monkeypatch.setattr(tracing, "_latencies", {})
+    assert tracing.span("x", a=1) is tracing._NOOP
+    assert work(3) == 6
+    assert tracing.summary() == {}
+
+
+def test_spans_and_traced_calls_are_recorded(trace):
+    with tracing.span("test.block", rows=3):
+        time.sleep(0.002)
+    assert work(2) == 4
+    with pytest.raises(RuntimeError):
+        work(1, fail=True)
+    tracing.flush()
+
+    events = read_events(trace)
+    assert [e["name"] for e in events] == ["test.block", "test.work", "test.work"]
+    assert events[0]["args"] == {"rows": "3"}
+    assert events[0]["ph"] == "X" and events[0]["dur"] >= 2000
+    assert all("args" not in e for e in events[1:])
+
+    stats = tracing.summary()
+    assert stats["test.work"]["count"] == 2
+    assert stats["test.block"]["p50"] == stats["test.block"]["max"] >= 0.002
+
+
+def test_summary_keeps_a_rolling_window(trace):
+    for i in range(tracing.ROLLING_WINDOW + 50):
+        tracing.record("op", 0.0, float(i))
+    stats = tracing.summary()["op"]
+    assert stats["count"] == tracing.ROLLING_WINDOW
+    assert stats["max"] == tracing.ROLLING_WINDOW + 49
+    assert stats["mean"] == pytest.approx(sum(range(50, tracing.ROLLING_WINDOW + 50)) / tracing.ROLLING_WINDOW)
+    assert stats["p50"] == 50 + tracing.ROLLING_WINDOW // 2
+
+
+def test_trace_file_keeps_only_the_newest_events(trace, monkeypatch):
+    monkeypatch.setattr(tracing, "_events", deque(maxlen=5))
+    for i in range(12):
+        tracing.record(f"op{i}", 0.0, 0.001)
+    tracing.flush()
+    assert [e["name"] for e in read_events(trace)] == [f"op{i}" for i in range(7, 12)]
+
+
+def test_format_summary_orders_by_mean(trace):
+    tracing.record("fast", 0.0, 0.001)
+    tracing.record("slow", 0.0, 0.5)
+    lines = tracing.format_summary().splitlines()
+    assert lines[0].split()[:2] == ["operation", "n"]
+    assert [line.split()[0] for line in lines[1:]] == ["slow", "fast"]
+    assert lines[1].split()[2] == "500.00"
+
+
+def test_worker_trace_path():
+    assert tracing.worker_trace_path("/tmp/run.json", 42) == "/tmp/run.42.json"
+    assert tracing.worker_trace_path("/tmp/run", 42) == "/tmp/run.42.json"
+
+
+def test_cli_traces_the_parent_and_each_worker(trace, input_dir, monkeypatch, capsys):
+    for filepath in sample_files():
+        shutil.copy(filepath, input_dir)
+    # configure() exports the trace path for the workers; undo that after the test
+    monkeypatch.setenv("PATHVISION_TRACE", trace)
+    reference = "GMC2500Gen4_attempt1_rev0_job12345672.json"
+    assert cli.main(["--trace", trace, "compare-all", reference, "--jobs", "2"]) == 0
+    tracing.flush()
+
+    worker_files = glob.glob(trace[:-len(".json")] + ".*.json")
+    assert 1 <= len(worker_files) <= 2
+    names = [e["name"] for path in worker_files for e in read_events(path)]
+    assert names.count("comparator.compare_paths") == len(sample_files()) - 1
+    # Worker spans stay out of the parent's trace
+    assert "comparator.compare_paths" not in [e["name"] for e in read_events(trace)]
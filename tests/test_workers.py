@@ -0,0 +1,113 @@
+# tests/test_workers.py
+import time
+import threading
+
+from gui.workers import BackgroundJob, LatestTaskRunner
+
+
+def pump(qapp, condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting for the worker"
+        qapp.processEvents()
+        time.sleep(0.005)
+
+
+def test_runner_delivers_result_on_ui_thread(qapp):
+    runner = LatestTaskRunner()
+    results = []
+    runner.submit(lambda a, b: (a + b, threading.current_thread()), 2, 3, on_result=results.append)
+    assert runner.is_busy()
+    pump(qapp, lambda: results)
+    assert results[0][0] == 5
+    assert results[0][1] is not threading.main_thread()
+    assert not runner.is_busy()
+    pump(qapp, lambda: not runner.in_flight)
+
+
+def test_runner_only_delivers_the_latest_request(qapp):
+    runner = LatestTaskRunner()
+    release = threading.Event()
+    results = []
+
+    def slow(value):
+        release.wait(5)
+        return value
+
+    runner.submit(slow, "old", on_result=results.append)
+    time.sleep(0.05)
+    runner.submit(lambda value: value, "new", on_result=results.append)
+    release.set()
+    pump(qapp, lambda: not runner.in_flight)
+    assert results == ["new"]
+
+
+def test_runner_reports_failures(qapp):
+    runner = LatestTaskRunner()
+    errors = []
+
+    def broken():
+        raise ValueError("bad path")
+
+    runner.submit(broken, on_result=lambda _: None, on_error=errors.append)
+    pump(qapp, lambda: errors)
+    assert errors == ["bad path"]
+    assert not runner.is_busy()
+
+
+def test_cancelled_runner_drops_the_result(qapp):
+    runner = LatestTaskRunner()
+    results = []
+    runner.submit(lambda: "late", on_result=results.append)
+    runner.cancel()
+    pump(qapp, lambda: not runner.in_flight)
+    qapp.processEvents()
+    assert results == []
+
+
+def test_background_job_reports_progress_and_result(qapp):
+    def batch(items, progress, should_stop):
+        for i, _ in enumerate(items, 1):
+            progress(i, len(items), None)
+        return sum(items)
+
+    job = BackgroundJob(batch, [1, 2, 3])
+    steps, results = [], []
+    job.progress.connect(lambda done, total, _: steps.append((done, total)))
+    job.finished.connect(results.append)
+    job.start()
+    pump(qapp, lambda: results)
+    assert results == [6]
+    assert steps == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_background_job_cancel_sets_should_stop(qapp):
+    started = threading.Event()
+
+    def batch(progress, should_stop):
+        started.set()
+        deadline = time.monotonic() + 5
+        while not should_stop() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        return should_stop()
+
+    job = BackgroundJob(batch)
+    results = []
+    job.finished.connect(results.append)
+    job.start()
+    assert started.wait(5)
+    job.cancel()
+    pump(qapp, lambda: results)
+    assert results == [True]
+
+
+def test_background_job_reports_failures(qapp):
+    def batch(progress, should_stop):
+        raise RuntimeError("disk gone")
+
+    job = BackgroundJob(batch)
+    errors = []
+    job.failed.connect(errors.append)
+    job.start()
+    pump(qapp, lambda: errors)
+    assert errors == ["disk gone"]